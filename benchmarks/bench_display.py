@@ -0,0 +1,295 @@
+"""
+Rendering benchmarks for the MiniDisplay display pipeline.
+
+Times the individual stages of a frame (layout, icon loading, text
+measurement, rasterization, frame encoding) and a full `run_simulation`, for
+every bundled layout at each supported panel resolution.
+
+Cases are timed in interleaved rounds, so a burst of background load slows
+one round of every case rather than every run of one case. Each round
+yields a median; a case is summarised by its best round (``best_us``) and
+by how far its typical round lies above it (``spread_us``), which `compare`
+uses as that case's noise floor.
+
+Usage:
+    python benchmarks/bench_display.py                      # print timings
+    python benchmarks/bench_display.py --save               # refresh the baseline
+    python benchmarks/bench_display.py --compare            # flag regressions
+    python benchmarks/bench_display.py --compare --threshold 0.10
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import PIL  # noqa: E402
+from font_hanken_grotesk import HankenGroteskBold  # noqa: E402
+
+from minidisplay.display.devices import Display, VirtualDisplay  # noqa: E402
+from minidisplay.display.encoders import FRAME_FORMATS, encode_frame  # noqa: E402
+from minidisplay.display.renderer import DisplayRenderer, _load_and_resize_icon  # noqa: E402
+from minidisplay.display.text import TextRasterCache  # noqa: E402
+from minidisplay.simulator import (  # noqa: E402
+    _build_layouts,
+    get_default_icon_path,
+    parse_mock_time,
+    run_simulation,
+)
+from minidisplay.utils.eventlog import configure_logging  # noqa: E402
+
+RESOLUTIONS = [(212, 104), (250, 122)]
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_THRESHOLD = 0.20
+DEFAULT_REPEAT = 100
+DEFAULT_ROUNDS = 7
+# Slowdowns within this many baseline spreads are noise, whatever the relative change.
+NOISE_SPREADS = 2.0
+SAMPLE_CONTENT = {"arrival_time": "07:42"}
+
+
+class _NullDisplay(Display):
+    """Display that discards frames, isolating rendering from output costs."""
+
+    def __init__(self, resolution):
+        self._resolution = resolution
+
+    @property
+    def resolution(self) -> tuple[int, int]:
+        return self._resolution
+
+    def set_image(self, image):
+        pass
+
+    def show(self):
+        pass
+
+
+def _round_median(func: Callable[[], object], repeat: int) -> float:
+    # Like timeit: collect first and keep the collector off, so garbage left
+    # by the previous case is not paid for by this one.
+    gc.collect()
+    gc.disable()
+    samples: List[float] = []
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - start) * 1e6)
+    finally:
+        gc.enable()
+    return statistics.median(samples)
+
+
+def _summary(round_medians: List[float], repeat: int) -> Dict[str, float]:
+    best = min(round_medians)
+    typical = statistics.median(round_medians)
+    return {
+        "best_us": round(best, 2),
+        "median_us": round(typical, 2),
+        # Median rather than slowest round: one disturbed round says nothing about the rest.
+        "spread_us": round(typical - best, 2),
+        "rounds": len(round_medians),
+        "runs": repeat,
+    }
+
+
+def _simulation_config(lock_dir: Path) -> dict:
+    return {
+        "lock_file": str(lock_dir / "bench.lock"),
+        "api_url": "https://example.invalid",
+        "api_code": "BENCH",
+        "api_ligne": "0",
+        "api_next": 3,
+        "display_start_hour": 6,
+        "display_start_minute": 0,
+        "display_end_hour": 9,
+        "display_end_minute": 0,
+    }
+
+
+def _cases(tmp_dir: Path) -> Dict[str, Callable[[], object]]:
+    """Every benchmark case, keyed by name; callables bind their loop values."""
+    icon_path = get_default_icon_path()
+    layouts = _build_layouts(icon_path)
+    mock_time = parse_mock_time("07:30")
+    config = _simulation_config(tmp_dir)
+    cases: Dict[str, Callable[[], object]] = {}
+
+    cases["icon_load"] = lambda: _load_and_resize_icon(str(icon_path), 40)
+    cases["text_measure_cold"] = lambda: TextRasterCache(atlas_alphabet=None).measure(
+        HankenGroteskBold, 32, "black", "07:42"
+    )
+
+    for width, height in RESOLUTIONS:
+        suffix = f"{width}x{height}"
+        renderer = DisplayRenderer(_NullDisplay((width, height)))
+        text_element = layouts[0].elements[1]
+
+        cases[f"text_measure[{suffix}]"] = lambda r=renderer: r._get_element_dimensions(text_element, SAMPLE_CONTENT)
+        cases[f"horizontal_positions[{suffix}]"] = lambda r=renderer: r._calculate_horizontal_positions(
+            layouts[0], SAMPLE_CONTENT
+        )
+        for layout in layouts:
+            content = SAMPLE_CONTENT if layout.arrangement == "horizontal" else {}
+            cases[f"render[{layout.name}@{suffix}]"] = lambda r=renderer, lay=layout, c=content: r.render(lay, c)
+
+        virtual = VirtualDisplay(filename=tmp_dir / f"bench-{suffix}.png", resolution=(width, height))
+        frame_renderer = DisplayRenderer(_NullDisplay((width, height)))
+        frame_renderer.render(layouts[0], SAMPLE_CONTENT)
+        virtual.set_image(frame_renderer.image)
+        frame = frame_renderer.image
+        cases[f"png_show[{suffix}]"] = virtual.show
+        for frame_format in FRAME_FORMATS:
+            cases[f"encode[{frame_format}@{suffix}]"] = lambda i=frame, f=frame_format: encode_frame(i, f)
+        cases[f"encode[png-level1@{suffix}]"] = lambda i=frame: encode_frame(i, "png", compress_level=1)
+
+        cases[f"run_simulation[{suffix}]"] = lambda sfx=suffix, size=(width, height): run_simulation(
+            config,
+            use_mock=True,
+            mock_time=mock_time,
+            display_device=VirtualDisplay(filename=tmp_dir / f"sim-{sfx}.png", resolution=size),
+            manage_lock_file=False,
+            render_standby_always=True,
+        )
+
+    return cases
+
+
+def run_benchmarks(
+    repeat: int = DEFAULT_REPEAT,
+    rounds: int = DEFAULT_ROUNDS,
+    names: Optional[Iterable[str]] = None,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Time benchmark cases and return their summaries keyed by case name.
+
+    Every round times ``repeat`` runs of each case in turn (all cases, or
+    only ``names``), so slow spells are spread over the cases instead of
+    landing on one of them.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = _cases(Path(tmp))
+        selected = list(cases) if names is None else list(names)
+        for name in selected:
+            cases[name]()  # Warm-up: first calls pay for imports, font loading and caches.
+        medians: Dict[str, List[float]] = {name: [] for name in selected}
+        for _ in range(rounds):
+            for name in selected:
+                medians[name].append(_round_median(cases[name], repeat))
+    return {name: _summary(values, repeat) for name, values in medians.items()}
+
+
+def _metadata() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "pillow": PIL.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+    }
+
+
+def save_baseline(results: Dict[str, Dict[str, float]], path: Path) -> None:
+    payload = {"meta": _metadata(), "results": results}
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def allowed_slowdown(reference: Dict[str, float], threshold: float) -> float:
+    """Microseconds a case may lose against its baseline entry before it is flagged."""
+    return max(reference["best_us"] * threshold, reference["spread_us"] * NOISE_SPREADS)
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> List[str]:
+    """Return the names of cases whose best round slowed down beyond `allowed_slowdown`."""
+    regressions = []
+    for name, current in sorted(results.items()):
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        if current["best_us"] - reference["best_us"] > allowed_slowdown(reference, threshold):
+            regressions.append(name)
+    return regressions
+
+
+def _print_table(
+    results: Dict[str, Dict[str, float]],
+    baseline: Optional[Dict[str, Dict[str, float]]] = None,
+    regressions: Optional[List[str]] = None,
+) -> None:
+    width = max(len(name) for name in results)
+    for name, timing in sorted(results.items()):
+        line = f"{name:<{width}}  {timing['best_us']:>12.1f} us  (spread {timing['spread_us']:>7.1f})"
+        if baseline and name in baseline:
+            ratio = timing["best_us"] / baseline[name]["best_us"]
+            line += f"  ({ratio:5.2f}x baseline)"
+            if regressions and name in regressions:
+                line += "  REGRESSION"
+        print(line)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the MiniDisplay rendering pipeline.")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per case and round.")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="Interleaved rounds over all cases.")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON file.")
+    parser.add_argument("--save", action="store_true", help="Write results to the baseline file.")
+    parser.add_argument("--compare", action="store_true", help="Compare results against the baseline.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown of the best round before a case is flagged (0.20 = 20%%).",
+    )
+    args = parser.parse_args(argv)
+
+    # Only warnings: per-frame info events would flood stderr and time the log writer too.
+    configure_logging(level="WARNING")
+    results = run_benchmarks(repeat=args.repeat, rounds=args.rounds)
+
+    if args.compare:
+        if not args.baseline.exists():
+            parser.error(f"Baseline file not found: {args.baseline}")
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            # Confirm before reporting: a real regression is slow in every round.
+            retimed = run_benchmarks(repeat=args.repeat, rounds=args.rounds, names=regressions)
+            for name, timing in retimed.items():
+                if timing["best_us"] < results[name]["best_us"]:
+                    results[name] = timing
+            regressions = compare(results, baseline, args.threshold)
+        _print_table(results, baseline, regressions)
+        if regressions:
+            print(
+                f"\n{len(regressions)} case(s) slower than baseline by more than {args.threshold:.0%}"
+                " and their baseline noise, twice."
+            )
+            return 1
+    else:
+        _print_table(results)
+
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f"\nBaseline written to {args.baseline}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,12 +3,20 @@
 from __future__ import annotations
 
 import argparse
+import datetime as dt
 import os
+import sys
 from pathlib import Path
 from typing import Optional
 
-from .display.devices import InkyDisplay, VirtualDisplay
-from .simulator import parse_mock_time, simulate_with_defaults
+# Keep module-level imports to the standard library: when a render server
+# is running, this module is all a cron invocation loads before delegating.
+# Pipeline modules are imported where they are used.
+
+# Mirrors display.encoders.FRAME_FORMATS without importing Pillow.
+_FRAME_FORMATS = ("png", "png1", "pbm", "pgm", "raw")
+_DEFAULT_INTERVAL = 30.0  # scheduler.DEFAULT_SCHEDULE_INTERVAL
+_DEFAULT_MIN_REFRESH = 30.0  # display.governor.DEFAULT_MIN_REFRESH_INTERVAL
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -24,6 +32,18 @@ def _build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Mock the current time in HH:MM format (requires --use-mock).",
     )
+    parser.add_argument(
+        "--mock-data",
+        type=Path,
+        default=None,
+        help="Replay a recording made with --record instead of calling the live API.",
+    )
+    parser.add_argument(
+        "--record",
+        type=Path,
+        default=None,
+        help="Append every successful live fetch to this recording file.",
+    )
     parser.add_argument(
         "--config",
         type=Path,
@@ -36,33 +56,239 @@ def _build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Override the output path for virtual renders.",
     )
+    parser.add_argument(
+        "--output-format",
+        choices=_FRAME_FORMATS,
+        default=_FRAME_FORMATS[0],
+        help="Encoding of virtual renders: PNG, 1-bit PNG, PBM, PGM or a raw pixel dump.",
+    )
+    parser.add_argument(
+        "--compress-level",
+        type=int,
+        choices=range(10),
+        default=None,
+        metavar="0-9",
+        help="zlib level for PNG virtual renders (1 is fastest, default 6).",
+    )
+    parser.add_argument(
+        "--framebuffer",
+        type=Path,
+        default=None,
+        help="Publish frames to a memory-mapped framebuffer file instead of the panel or a virtual render.",
+    )
+    parser.add_argument(
+        "--reprobe-display",
+        action="store_true",
+        help="Probe the Inky panel again instead of using the cached detection result.",
+    )
+    parser.add_argument(
+        "--loop",
+        action="store_true",
+        help="Keep running, refreshing the display only when the frame changes.",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=_DEFAULT_INTERVAL,
+        help="Seconds between frame checks in --loop mode.",
+    )
+    parser.add_argument(
+        "--min-refresh",
+        type=float,
+        default=_DEFAULT_MIN_REFRESH,
+        help="Minimum seconds between panel refreshes in --loop mode.",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run a prewarmed render server on a Unix socket for later invocations.",
+    )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        default=None,
+        help="Render server socket path (defaults to $MINIDISPLAY_SOCKET or the runtime dir).",
+    )
+    parser.add_argument(
+        "--no-server",
+        action="store_true",
+        help="Always render in this process, even if a render server is running.",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print pipeline metrics in Prometheus text format after rendering.",
+    )
     return parser
 
 
-def _select_display_device(output_override: Optional[Path]):
+def _select_display_device(
+    output_override: Optional[Path],
+    frame_format: str = _FRAME_FORMATS[0],
+    compress_level: Optional[int] = None,
+    framebuffer: Optional[Path] = None,
+    reprobe: bool = False,
+):
+    from .display.devices import InkyDisplay, VirtualDisplay
+    from .display.framebuffer import FramebufferDisplay
+
+    if framebuffer is not None:
+        return FramebufferDisplay(framebuffer)
     if os.getenv("INKY_DISPLAY_AVAILABLE", "true").lower() == "true":
-        return InkyDisplay()
-    return VirtualDisplay(filename=output_override)
+        return InkyDisplay(reprobe=reprobe)
+    return VirtualDisplay(filename=output_override, frame_format=frame_format, compress_level=compress_level)
+
+
+def _config_overrides(args: argparse.Namespace) -> dict:
+    overrides = {}
+    if args.mock_data:
+        overrides["replay_file"] = str(args.mock_data.resolve())
+    if args.record:
+        overrides["record_file"] = str(args.record.resolve())
+    return overrides
+
+
+def _render_options(args: argparse.Namespace) -> dict:
+    """JSON-friendly render arguments sent to the render server."""
+    return {
+        "use_mock": args.use_mock,
+        "mock_time": args.mock_time,
+        "config": str(args.config.resolve()) if args.config else None,
+        "output": str(args.output.resolve()) if args.output else None,
+        "output_format": args.output_format,
+        "compress_level": args.compress_level,
+        "framebuffer": str(args.framebuffer.resolve()) if args.framebuffer else None,
+        "stats": args.stats,
+    }
+
+
+def _saved_message(result) -> str:
+    """What a single render prints on stdout, whether in-process or through a server."""
+    if result.image_path is None or result.frame is None:
+        return ""
+    return f"Image saved as {result.image_path}\n"
+
+
+def _render_via_server(args: argparse.Namespace) -> Optional[int]:
+    """Delegate the render to a running server; None if there is none to ask."""
+    from .server import send_request
+
+    try:
+        reply = send_request({"command": "render", "options": _render_options(args)}, args.socket)
+    except (OSError, ValueError) as exc:
+        # The server may still be rendering: drawing in-process too would
+        # drive the panel twice, so only a missing server falls back.
+        print(f"Render server did not answer: {exc}")
+        return 1
+    if reply is None:
+        return None
+    if not reply.get("ok"):
+        print(f"Render server error: {reply.get('error')}")
+        return 1
+    # Log events go to stderr and the rest to stdout, as when rendering in-process.
+    for line in reply.get("events", []):
+        print(line, file=sys.stderr)
+    print(reply.get("output", ""), end="")
+    if args.stats:
+        print(reply.get("stats", ""), end="")
+    return 0
+
+
+def _serve(args: argparse.Namespace) -> int:
+    from .server import RenderServer
+
+    server = RenderServer(args.socket, reprobe_display=args.reprobe_display)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as exc:
+        print(str(exc))
+        return 1
+    return 0
+
+
+def _run_loop(args: argparse.Namespace, device) -> int:
+    from .config import load_config
+    from .datasources import start_push_listeners
+    from .display.governor import RefreshGovernor
+    from .display.push import AsyncPushDisplay
+    from .scheduler import FrameScheduler
+    from .utils.metrics import register_cache
+
+    # Let the next fetch and render overlap with a slow panel refresh.
+    push = AsyncPushDisplay(device)
+    governor = RefreshGovernor(push, min_interval=args.min_refresh)
+    config = load_config(args.config)
+    config.update(_config_overrides(args))
+    scheduler = FrameScheduler(
+        config,
+        use_mock=args.use_mock,
+        interval=args.interval,
+        display_device=governor,
+    )
+    register_cache("simulation", scheduler.simulation_cache)
+    push_listeners = start_push_listeners(scheduler.manager)
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for listener in push_listeners:
+            listener.stop()
+        governor.flush()
+        push.close()
+    return 0
 
 
 def main(argv: Optional[list[str]] = None) -> int:
     parser = _build_parser()
     args = parser.parse_args(argv)
 
-    try:
-        mock_time = parse_mock_time(args.mock_time)
-    except ValueError as exc:
-        parser.error(str(exc))
+    if args.mock_time:
+        # Validated here so a bad value is reported before delegating to a server.
+        try:
+            dt.datetime.strptime(args.mock_time, "%H:%M")
+        except ValueError:
+            parser.error("Invalid time format. Use HH:MM.")
+
+    if args.serve:
+        return _serve(args)
+    # Servers keep one manager per configuration file, so recording and
+    # replaying (which change the data sources) always run in-process.
+    if not args.loop and not args.no_server and not _config_overrides(args):
+        delegated = _render_via_server(args)
+        if delegated is not None:
+            return delegated
+
+    from .simulator import parse_mock_time, simulate_with_defaults
+    from .utils.metrics import get_metrics_registry
 
-    device = _select_display_device(args.output)
-    simulate_with_defaults(
+    mock_time = parse_mock_time(args.mock_time)
+
+    device = _select_display_device(
+        args.output,
+        args.output_format,
+        args.compress_level,
+        args.framebuffer,
+        reprobe=args.reprobe_display,
+    )
+    if args.loop:
+        return _run_loop(args, device)
+
+    result = simulate_with_defaults(
         config_path=args.config,
         use_mock=args.use_mock,
         mock_time=mock_time,
         display_device=device,
         manage_lock_file=True,
         render_standby_always=False,
+        config_overrides=_config_overrides(args),
     )
+    print(_saved_message(result), end="")
+
+    if args.stats:
+        print(get_metrics_registry().render_prometheus(), end="")
 
     return 0
 
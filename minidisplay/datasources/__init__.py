@@ -3,10 +3,62 @@ Core data-source abstractions for MiniDisplay.
 
 This package gathers the reusable interfaces and implementations used to
 retrieve external information feeds for the project.
+
+Implementations are imported on first attribute access (PEP 562), so
+importing the package, or the manager, does not load ``requests`` or any
+source a device does not use.
 """
 
+import importlib
+from typing import Any, List
+
 from .base import DataSource
-from .idelis import IdelisTransportSource
 from .manager import DataSourceManager
+from .registry import SourceRegistry, get_source_registry
+
+_LAZY_EXPORTS = {
+    "CircuitBreaker": ".health",
+    "IdelisTransportSource": ".idelis",
+    "PushDataSource": ".push",
+    "Recording": ".replay",
+    "ReplayDataSource": ".replay",
+    "RequestBudget": ".ratelimit",
+    "TimetableIndex": ".timetable",
+    "TimetableSource": ".timetable",
+    "TrafficRecorder": ".replay",
+    "VirtualClock": ".replay",
+    "iter_replay": ".replay",
+    "start_push_listeners": ".push",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = getattr(importlib.import_module(module_name, __name__), name)
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *_LAZY_EXPORTS})
+
 
-__all__ = ["DataSource", "DataSourceManager", "IdelisTransportSource"]
+__all__ = [
+    "CircuitBreaker",
+    "DataSource",
+    "DataSourceManager",
+    "IdelisTransportSource",
+    "PushDataSource",
+    "Recording",
+    "RequestBudget",
+    "ReplayDataSource",
+    "SourceRegistry",
+    "TimetableIndex",
+    "TimetableSource",
+    "TrafficRecorder",
+    "VirtualClock",
+    "get_source_registry",
+    "iter_replay",
+    "start_push_listeners",
+]
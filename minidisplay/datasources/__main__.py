@@ -0,0 +1,20 @@
+"""Data-source tools: ``python -m minidisplay.datasources timetable ...``."""
+
+import sys
+from typing import List, Optional
+
+from .timetable import main as build_timetable
+
+COMMANDS = {"timetable": build_timetable}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in COMMANDS:
+        print(f"usage: python -m minidisplay.datasources {{{','.join(COMMANDS)}}} ...")
+        return 2
+    return COMMANDS[argv[0]](argv[1:])
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
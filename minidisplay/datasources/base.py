@@ -9,6 +9,10 @@ from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any
 from nob import Nob
 
+from ..utils.eventlog import get_logger
+
+logger = get_logger(__name__)
+
 
 class DataSource(ABC):
     """
@@ -20,6 +24,11 @@ class DataSource(ABC):
     standardized format.
     """
 
+    # Whether successful fetches may be captured by a TrafficRecorder.
+    recordable = True
+    # Whether the source is fed through DataSourceManager.push.
+    accepts_push = False
+
     def __init__(self, name: str, config: Dict[str, Any]):
         """
         Initialize the data source.
@@ -49,7 +58,7 @@ class DataSource(ABC):
                 response = ...
                 return Nob(response.json())
             except requests.RequestException as e:
-                print(f"Error fetching data: {e}")
+                logger.warning("Error fetching data: %s", e)
                 return None
         """
         pass
@@ -64,6 +73,23 @@ class DataSource(ABC):
         """
         pass
 
+    @classmethod
+    def is_configured(cls, config: Dict[str, Any]) -> bool:
+        """
+        Check whether a source built from ``config`` could be available,
+        without building it.
+
+        Used to list sources that have not been built yet; the default
+        trusts the configuration.
+
+        Args:
+            config: Configuration the source would be constructed with
+
+        Returns:
+            True if nothing known before construction rules the source out
+        """
+        return True
+
     @abstractmethod
     def get_refresh_interval(self) -> int:
         """
@@ -74,6 +100,18 @@ class DataSource(ABC):
         """
         pass
 
+    def get_budget_key(self) -> Optional[str]:
+        """
+        Get the request-budget bucket this source draws from.
+
+        Sources calling the same API host with the same credentials should
+        return the same key (see `ratelimit.budget_key`).
+
+        Returns:
+            Bucket key, or None for sources that make no rate-limited requests
+        """
+        return None
+
     @property
     def last_error(self) -> Optional[str]:
         """
@@ -102,7 +140,7 @@ class DataSource(ABC):
             error_message: Error message to store
         """
         self._last_error = error_message
-        print(f"DataSource {self.name}: {error_message}")
+        logger.warning("DataSource %s: %s", self.name, error_message, extra={"source": self.name})
 
     def _clear_error(self) -> None:
         """Clear the last error message."""
@@ -0,0 +1,164 @@
+"""
+Data Source Health
+
+This module implements the CircuitBreaker class used by DataSourceManager
+to stop calling a source that keeps failing. After a run of failures the
+breaker opens and fetches are refused without touching the network; once
+the backoff has elapsed a single probe is let through (half-open), which
+either closes the breaker again or reopens it with twice the backoff.
+
+Each breaker also keeps a rolling window of recent outcomes and latencies,
+summarised as a health score between 0 (failing) and 1 (healthy and fast).
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_BACKOFF = 30.0
+DEFAULT_MAX_BACKOFF = 900.0
+DEFAULT_WINDOW = 20
+# Latency at which a perfectly reliable source scores 0.5.
+DEFAULT_LATENCY_TARGET = 2.0
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker with exponential backoff.
+
+    Thread-safe: one breaker is shared by every caller of a source.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        backoff: float = DEFAULT_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        window: int = DEFAULT_WINDOW,
+        latency_target: float = DEFAULT_LATENCY_TARGET,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the breaker
+            backoff: Seconds the breaker stays open after its first trip
+            max_backoff: Upper bound of the doubling backoff
+            window: Number of recent outcomes the health score covers
+            latency_target: Mean latency, in seconds, that halves the score
+            clock: Monotonic clock, replaceable in tests
+        """
+        self.failure_threshold = failure_threshold
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.latency_target = latency_target
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes: Deque[Tuple[bool, float]] = deque(maxlen=window)
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._trips = 0
+        self._open_until = 0.0
+        self._probe_in_flight = False
+        self.rejected = 0  # Calls refused while open
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self._clock() >= self._open_until:
+            return HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        """Return True if a call may go ahead; half-open lets one probe through at a time."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._state = HALF_OPEN
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def cancel(self) -> None:
+        """Forget a call granted by `allow` that was not made after all."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self, latency: float) -> None:
+        with self._lock:
+            self._outcomes.append((True, latency))
+            self._consecutive_failures = 0
+            self._trips = 0
+            self._probe_in_flight = False
+            self._state = CLOSED
+
+    def record_failure(self, latency: float) -> None:
+        with self._lock:
+            self._outcomes.append((False, latency))
+            self._consecutive_failures += 1
+            if self._state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                self._trips += 1
+                delay = min(self.max_backoff, self.backoff * 2 ** (self._trips - 1))
+                self._open_until = self._clock() + delay
+                self._state = OPEN
+            self._probe_in_flight = False
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return sum(1 for ok, _ in self._outcomes if not ok) / len(self._outcomes)
+
+    @property
+    def mean_latency(self) -> Optional[float]:
+        with self._lock:
+            if not self._outcomes:
+                return None
+            return sum(latency for _, latency in self._outcomes) / len(self._outcomes)
+
+    @property
+    def health(self) -> float:
+        """Success rate scaled down by mean latency; 1.0 before any call."""
+        latency = self.mean_latency
+        if latency is None:
+            return 1.0
+        return (1.0 - self.error_rate) * self.latency_target / (self.latency_target + latency)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Breaker state for `DataSourceManager.get_status`."""
+        with self._lock:
+            state = self._current_state()
+            retry_in = max(0.0, self._open_until - self._clock()) if state == OPEN else 0.0
+            samples = len(self._outcomes)
+        latency = self.mean_latency
+        return {
+            "state": state,
+            "health": round(self.health, 3),
+            "error_rate": round(self.error_rate, 3),
+            "mean_latency": round(latency, 4) if latency is not None else None,
+            "samples": samples,
+            "retry_in": round(retry_in, 1),
+            "rejected": self.rejected,
+        }
+
+
+__all__ = [
+    "CLOSED",
+    "CircuitBreaker",
+    "HALF_OPEN",
+    "OPEN",
+]
@@ -6,14 +6,47 @@ data from the Idelis API, refactoring the original fetch_arrival_data function
 to work with the new DataSource abstraction layer.
 """
 
+import hashlib
 import json
 import os
 import time
 import requests
-from typing import Optional, Dict, Any
+from typing import NamedTuple, Optional, Dict, Any
+from urllib.parse import urlsplit
 from nob import Nob
+from urllib3.util import make_headers
 
+from ..utils.eventlog import get_logger
+from ..utils.metrics import FETCH_BYTES_SAVED_TOTAL
+from ..utils.tracing import trace_span
 from .base import DataSource
+from .ratelimit import budget_key
+
+logger = get_logger(__name__)
+
+# Seconds to wait before retry n is `RETRY_BACKOFF * n`.
+RETRY_BACKOFF = 0.2
+# Seconds to wait for the API unless `api_timeout` says otherwise.
+DEFAULT_TIMEOUT = 10.0
+
+# Every encoding urllib3 can decode here: gzip and deflate, plus br/zstd
+# when brotli or zstandard is installed.
+ACCEPT_ENCODING = make_headers(accept_encoding=True)["accept-encoding"]
+
+
+def _api_token(config: Dict[str, Any]) -> Optional[str]:
+    # A token passed in the configuration wins over the environment.
+    return config.get("api_token") or os.getenv("IDELIS_API_TOKEN")
+
+
+class _Validators(NamedTuple):
+    """What the previous successful answer allows the next request to reuse."""
+
+    etag: Optional[str]
+    last_modified: Optional[str]
+    digest: bytes
+    size: int
+    data: Nob
 
 
 class IdelisTransportSource(DataSource):
@@ -35,17 +68,109 @@ class IdelisTransportSource(DataSource):
                 - api_code: The stop code for the bus stop
                 - api_ligne: The bus line number
                 - api_next: Number of next passages to fetch
+                - api_timeout: Optional request timeout in seconds (default
+                  DEFAULT_TIMEOUT; null waits forever)
+                - api_retries: Optional number of retries after a connection
+                  error, timeout or 5xx response (default 0)
+                - api_token: Optional API token, used instead of the
+                  IDELIS_API_TOKEN environment variable
         """
         super().__init__("Idelis Transport", config)
         self.api_url = config.get("api_url")
         self.api_code = config.get("api_code")
         self.api_ligne = config.get("api_ligne")
         self.api_next = config.get("api_next", 3)
+        self.api_timeout = config.get("api_timeout", DEFAULT_TIMEOUT)
+        self.api_retries = int(config.get("api_retries", 0))
+        self.retries = 0  # Retries performed since creation
+        self.not_modified = 0  # 304 answers to conditional requests
+        self.unchanged = 0  # 200 answers whose body matched the previous one
+        self.bytes_saved = 0
+        # Replaced as a whole so a source shared between threads never sees
+        # a validator from one answer with the data of another.
+        self._validators: Optional[_Validators] = None
+
+    def _headers(self, api_token: str) -> Dict[str, str]:
+        headers = {'X-Auth-Token': api_token, 'Accept-Encoding': ACCEPT_ENCODING}
+        previous = self._validators
+        if previous is not None:
+            if previous.etag:
+                headers['If-None-Match'] = previous.etag
+            if previous.last_modified:
+                headers['If-Modified-Since'] = previous.last_modified
+        return headers
+
+    def _save_bytes(self, amount: int, reason: str) -> None:
+        if amount > 0:
+            self.bytes_saved += amount
+            FETCH_BYTES_SAVED_TOTAL.inc(amount, source="idelis", reason=reason)
+
+    def _reuse_or_parse(self, response: requests.Response) -> Nob:
+        """Return the previous payload if the server or the body says nothing changed."""
+        previous = self._validators
+        if response.status_code == 304 and previous is not None:
+            self.not_modified += 1
+            self._save_bytes(previous.size, "not_modified")
+            return previous.data
+
+        body = response.content
+        wire_size = response.headers.get('Content-Length')
+        if response.headers.get('Content-Encoding') and wire_size and wire_size.isdigit():
+            self._save_bytes(len(body) - int(wire_size), "compression")
+
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        if previous is not None and previous.digest == digest:
+            self.unchanged += 1
+            self._save_bytes(len(body), "unchanged")
+            data = previous.data
+        else:
+            with trace_span("idelis.parse"):
+                data = Nob(response.json())
+        self._validators = _Validators(
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+            digest=digest,
+            size=len(body),
+            data=data,
+        )
+        return data
+
+    def _request(self, api_token: str) -> requests.Response:
+        attempt = 0
+        while True:
+            try:
+                with trace_span("idelis.request"):
+                    response = requests.request(
+                        method='get',
+                        url=self.api_url,
+                        data=json.dumps({
+                            "code": self.api_code,
+                            "ligne": self.api_ligne,
+                            "next": self.api_next
+                        }),
+                        headers=self._headers(api_token),
+                        timeout=self.api_timeout
+                    )
+                    response.raise_for_status()
+                return response
+            except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+                server_error = not isinstance(e, requests.HTTPError) or e.response is None or e.response.status_code >= 500
+                if attempt >= self.api_retries or not server_error:
+                    raise
+                attempt += 1
+                self.retries += 1
+                time.sleep(RETRY_BACKOFF * attempt)
 
     def fetch_data(self) -> Optional[Nob]:
         """
         Fetch arrival data from the Idelis API.
 
+        Requests are compressed and conditional (ETag / Last-Modified) when
+        the server supports it. When it answers 304 Not Modified, or with a
+        body identical to the previous one, the previous Nob is returned
+        as is: nothing is parsed, and the identical payload lets the
+        simulation cache skip the render.
+
         Returns:
             Nob object containing the fetched data, or None if fetching failed
             following the exact same error handling pattern as the original
@@ -58,14 +183,14 @@ class IdelisTransportSource(DataSource):
                 response = requests.request(...)
                 return Nob(response.json())
             except requests.RequestException as e:
-                print(f"Error fetching data from API: {e}")
+                logger.warning("Error fetching data from API: %s", e)
                 return None
         """
         # Clear previous errors
         self._clear_error()
 
         # Check for API token (same as original)
-        api_token = os.getenv("IDELIS_API_TOKEN")
+        api_token = _api_token(self.config)
         if not api_token:
             error_msg = "IDELIS_API_TOKEN environment variable not set."
             self._set_error(error_msg)
@@ -73,24 +198,13 @@ class IdelisTransportSource(DataSource):
             return None
 
         try:
-            # Exact same API call as original fetch_arrival_data function
-            response = requests.request(
-                method='get',
-                url=self.api_url,
-                data=json.dumps({
-                    "code": self.api_code,
-                    "ligne": self.api_ligne,
-                    "next": self.api_next
-                }),
-                headers={'X-Auth-Token': api_token}
-            )
-            response.raise_for_status()
+            # Same API call as the original fetch_arrival_data function
+            response = self._request(api_token)
 
             # Record successful fetch time
             self._set_last_fetch_time(time.time())
 
-            # Return Nob object (same as original)
-            return Nob(response.json())
+            return self._reuse_or_parse(response)
 
         except requests.RequestException as e:
             # Exact same error handling as original
@@ -105,10 +219,25 @@ class IdelisTransportSource(DataSource):
         Returns:
             True if API token is set and API URL is configured, False otherwise
         """
-        has_token = bool(os.getenv("IDELIS_API_TOKEN"))
+        has_token = bool(_api_token(self.config))
         has_config = bool(self.api_url and self.api_code and self.api_ligne)
         return has_token and has_config
 
+    @classmethod
+    def is_configured(cls, config: Dict[str, Any]) -> bool:
+        has_token = bool(_api_token(config))
+        has_config = bool(config.get("api_url") and config.get("api_code") and config.get("api_ligne"))
+        return has_token and has_config
+
+    def get_budget_key(self) -> Optional[str]:
+        """
+        Get the request-budget bucket for this API host and token.
+
+        Returns:
+            Bucket key shared by every source using the same host and token
+        """
+        return budget_key(urlsplit(self.api_url or "").netloc, _api_token(self.config))
+
     def get_refresh_interval(self) -> int:
         """
         Get the recommended refresh interval for Idelis data.
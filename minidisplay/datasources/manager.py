@@ -5,12 +5,20 @@ This module implements the DataSourceManager class that coordinates multiple
 data sources and provides a unified interface for the main application.
 """
 
+import threading
 import time
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from nob import Nob
 
+from ..utils.eventlog import get_logger
+from ..utils.metrics import FETCH_SECONDS, FETCH_TOTAL
+from ..utils.tracing import trace_span
 from .base import DataSource
-from .idelis import IdelisTransportSource
+from .health import DEFAULT_BACKOFF, DEFAULT_FAILURE_THRESHOLD, DEFAULT_MAX_BACKOFF, CircuitBreaker
+from .ratelimit import RequestBudget, get_default_budget_state_path
+from .registry import LazySources, get_source_registry
+
+logger = get_logger(__name__)
 
 
 class DataSourceManager:
@@ -30,23 +38,91 @@ class DataSourceManager:
             config: Configuration dictionary containing data source configurations
         """
         self.config = config
-        self.data_sources: Dict[str, DataSource] = {}
+        self.data_sources: LazySources = LazySources()
         self._last_fetch_time: Optional[float] = None
         self._last_successful_source: Optional[str] = None
+        self._cache: Dict[str, Tuple[float, Nob]] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._fallbacks: Dict[str, str] = {}
+        self._source_configs: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        # Set when pushed data changes; schedulers wake up and clear it.
+        self.dirty = threading.Event()
+        self._change_listeners: List[Callable[[], None]] = []
+        self.budget: Optional[RequestBudget] = None
+        if config.get("request_budget_per_minute"):
+            self.budget = RequestBudget(
+                float(config["request_budget_per_minute"]),
+                burst=config.get("request_budget_burst"),
+                state_path=config.get("request_budget_state", get_default_budget_state_path()),
+            )
+        self._recorder = None
+        if config.get("record_file"):
+            from .replay import TrafficRecorder
+
+            self._recorder = TrafficRecorder(config["record_file"])
+
+    def configured_sources(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Describe the configured data sources, without importing any of them.
+
+        Sources come from the ``data_sources`` configuration mapping, e.g.
+        ``{"weather": {"type": "weather", "city": "Tours"}}``, where ``type``
+        names a registered source type (see `registry.SourceRegistry`) and
+        the other keys override the device configuration for that source.
+        An entry may set ``fallback_for`` to answer when another source
+        cannot. The older top-level keys still work and describe:
+
+        - ``api_url``: the "idelis" source, or ``replay_file``: a replay
+          standing in for it,
+        - ``push_sources``: one "push" source per name,
+        - ``timetable_file``: a "timetable" source, fallback for "idelis".
+
+        Returns:
+            Mapping of source name to its options, including ``type``
+        """
+        sources: Dict[str, Dict[str, Any]] = {}
+        # A recording stands in for the live Idelis API
+        if self.config.get("replay_file"):
+            sources["idelis"] = {"type": "replay"}
+        # Idelis transport source (maintains existing functionality)
+        elif "api_url" in self.config:
+            sources["idelis"] = {"type": "idelis"}
+        # Sources fed by other processes through `push` (may replace "idelis")
+        for name in self.config.get("push_sources", []):
+            sources[name] = {"type": "push"}
+        # The published timetable answers whenever the live source cannot
+        if self.config.get("timetable_file"):
+            sources["timetable"] = {"type": "timetable", "fallback_for": "idelis"}
+        for name, options in (self.config.get("data_sources") or {}).items():
+            sources[name] = dict(options)
+        return sources
 
     def initialize_data_sources(self) -> None:
         """
-        Initialize all configured data sources.
+        Register all configured data sources.
+
+        Each source's module is imported, and the source constructed, only
+        when it is first used, so unused or rarely used sources cost
+        nothing at startup.
 
-        This method creates instances of all configured data sources.
-        Currently starts with just the Idelis transport source to maintain
-        compatibility with the existing system.
+        Raises:
+            KeyError: If a configured source has no ``type`` or an unknown one.
         """
-        # Initialize Idelis transport source (maintains existing functionality)
-        if "api_url" in self.config:
-            idelis_source = IdelisTransportSource(self.config)
-            self.data_sources["idelis"] = idelis_source
-            print(f"Initialized data source: {idelis_source.name}")
+        registry = get_source_registry()
+        for name, options in self.configured_sources().items():
+            source_type = options["type"]
+            if source_type not in registry:
+                raise KeyError(f"Data source '{name}' has unknown type {source_type!r}")
+            source_config = {**self.config, **options, "name": name}
+            self._source_configs[name] = (source_type, source_config)
+            self.data_sources.defer(name, lambda t=source_type, c=source_config: self._build_source(t, c))
+            if options.get("fallback_for"):
+                self._fallbacks[options["fallback_for"]] = name
+
+    def _build_source(self, source_type: str, config: Dict[str, Any]) -> DataSource:
+        source = get_source_registry().create(source_type, config)
+        logger.info("Initialized data source: %s (%s)", config["name"], source.name)
+        return source
 
     def get_data_source(self, name: str) -> Optional[DataSource]:
         """
@@ -60,19 +136,46 @@ class DataSourceManager:
         """
         return self.data_sources.get(name)
 
+    def get_breaker(self, name: str) -> CircuitBreaker:
+        """
+        Get the circuit breaker guarding a data source, creating it on first use.
+
+        Tuned by the optional ``breaker_failure_threshold``, ``breaker_backoff``
+        and ``breaker_max_backoff`` configuration keys.
+        """
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers.setdefault(name, CircuitBreaker(
+                failure_threshold=int(self.config.get("breaker_failure_threshold", DEFAULT_FAILURE_THRESHOLD)),
+                backoff=float(self.config.get("breaker_backoff", DEFAULT_BACKOFF)),
+                max_backoff=float(self.config.get("breaker_max_backoff", DEFAULT_MAX_BACKOFF)),
+            ))
+        return breaker
+
     def get_available_sources(self) -> List[str]:
         """
         Get list of available data sources.
 
+        Sources not built yet are not built just to be asked: their class
+        checks the configuration instead (see `DataSource.is_configured`).
+
         Returns:
             List of data source names that are currently available
         """
         available = []
-        for name, source in self.data_sources.items():
-            if source.is_available():
+        for name in self.data_sources:
+            if self._is_available(name):
                 available.append(name)
         return available
 
+    def _is_available(self, name: str) -> bool:
+        configured = self._source_configs.get(name)
+        if self.data_sources.is_loaded(name) or configured is None:
+            return self.data_sources[name].is_available()
+        source_type, config = configured
+        source_class = get_source_registry().resolve(source_type)
+        return getattr(source_class, "is_configured", DataSource.is_configured)(config)
+
     def fetch_from_source(self, source_name: str) -> Optional[Nob]:
         """
         Fetch data from a specific data source.
@@ -81,7 +184,9 @@ class DataSourceManager:
             source_name: Name of the data source to fetch from
 
         Returns:
-            Nob object containing fetched data, or None if fetching failed
+            Nob object containing fetched data, or None if fetching failed.
+            Over the request budget, the last payload fetched through
+            `fetch_cached` is returned instead (None if there is none).
 
         Note:
             This method maintains compatibility with the original fetch_arrival_data
@@ -90,55 +195,214 @@ class DataSourceManager:
         """
         source = self.get_data_source(source_name)
         if not source:
-            print(f"Data source '{source_name}' not found.")
+            logger.warning("Data source '%s' not found.", source_name)
             return None
 
         if not source.is_available():
-            print(f"Data source '{source_name}' is not available.")
+            logger.warning("Data source '%s' is not available.", source_name, extra={"source": source_name})
+            FETCH_TOTAL.inc(source=source_name, outcome="unavailable")
             return None
 
-        data = source.fetch_data()
+        breaker = self.get_breaker(source_name)
+        if not breaker.allow():
+            # Known-bad source: fail now instead of waiting for another timeout.
+            FETCH_TOTAL.inc(source=source_name, outcome="circuit_open")
+            return None
+
+        key = source.get_budget_key() if self.budget is not None else None
+        if key is not None and not self.budget.acquire(key):
+            # Over budget: serve the last payload rather than a blank frame.
+            breaker.cancel()
+            logger.warning(
+                "Request budget exhausted for '%s'; retry in %.0fs.",
+                source_name,
+                self.budget.retry_after(key),
+                extra={"source": source_name},
+            )
+            FETCH_TOTAL.inc(source=source_name, outcome="deferred")
+            cached = self._cache.get(source_name)
+            return cached[1] if cached else None
+
+        started = time.perf_counter()
+        data = None
+        try:
+            with trace_span("datasource.fetch", source=source_name):
+                data = source.fetch_data()
+        finally:
+            elapsed = time.perf_counter() - started
+            if data:
+                breaker.record_success(elapsed)
+            else:
+                breaker.record_failure(elapsed)
+        FETCH_SECONDS.observe(elapsed, source=source_name)
+        FETCH_TOTAL.inc(source=source_name, outcome="success" if data else "failure")
         if data:
             self._last_fetch_time = time.time()
             self._last_successful_source = source_name
+            if self._recorder is not None and source.recordable:
+                self._recorder.record(source_name, data)
+
+        return data
+
+    def fetch_cached(self, source_name: str, max_age: Optional[float] = None) -> Optional[Nob]:
+        """
+        Fetch data from a source, reusing a recent result when possible.
+
+        Args:
+            source_name: Name of the data source to fetch from
+            max_age: Maximum age in seconds of a reusable result; defaults to
+                the source's refresh interval
+
+        Returns:
+            Cached or freshly fetched data. When a fetch fails, the last
+            successful result is returned (however old) so callers keep
+            showing something useful; None if nothing was ever fetched.
+        """
+        source = self.get_data_source(source_name)
+        if not source:
+            return self.fetch_from_source(source_name)
 
+        if max_age is None:
+            max_age = source.get_refresh_interval()
+
+        cached = self._cache.get(source_name)
+        if cached and time.time() - cached[0] < max_age:
+            FETCH_TOTAL.inc(source=source_name, outcome="cache_hit")
+            return cached[1]
+
+        data = self.fetch_with_fallback(source_name)
+        if data and (cached is None or data is not cached[1]):  # Not the deferred cached payload
+            self._cache[source_name] = (time.time(), data)
+            return data
+
+        return cached[1] if cached else None
+
+    def fetch_with_fallback(self, source_name: str) -> Optional[Nob]:
+        """
+        Fetch data from a source, asking its fallback source if that fails.
+
+        Args:
+            source_name: Name of the data source to fetch from
+
+        Returns:
+            Data from the source or, failing that, from its fallback
+            (e.g. "timetable" for "idelis"); None if both failed
+        """
+        data = self.fetch_from_source(source_name)
+        fallback = self._fallbacks.get(source_name)
+        if not data and fallback:
+            data = self.fetch_from_source(fallback)
+            if data:
+                FETCH_TOTAL.inc(source=source_name, outcome="fallback")
         return data
 
+    def feeds_display(self, source_name: str) -> bool:
+        """
+        Check whether rendered frames read a data source.
+
+        Frames show the "idelis" source, or the source configured as its
+        fallback when it cannot answer; other sources are only fetched on
+        request.
+        """
+        return source_name == "idelis" or self._fallbacks.get("idelis") == source_name
+
+    def push(self, source_name: str, payload: Any) -> bool:
+        """
+        Hand a payload produced elsewhere to a push data source.
+
+        The payload goes straight into the cache used by `fetch_cached`, and
+        `dirty` is set (and change listeners called) so schedulers render
+        without waiting for their next tick; none of this happens when the
+        payload equals the previous one.
+
+        Args:
+            source_name: Name of a push source that feeds the display (see
+                `feeds_display`), e.g. "idelis" listed in ``push_sources``
+            payload: JSON-compatible data or a Nob
+
+        Returns:
+            True if the payload changed the source's data
+
+        Raises:
+            KeyError: If ``source_name`` is not a push data source, or is
+                one that rendered frames never read
+        """
+        source = self.get_data_source(source_name)
+        if not getattr(source, "accepts_push", False):
+            raise KeyError(f"'{source_name}' is not a push data source")
+        if not self.feeds_display(source_name):
+            # Accepting it would wake every renderer for a frame that cannot change.
+            raise KeyError(f"'{source_name}' is not shown on the display")
+        if not source.push(payload):
+            FETCH_TOTAL.inc(source=source_name, outcome="push_unchanged")
+            return False
+        FETCH_TOTAL.inc(source=source_name, outcome="pushed")
+        self._cache[source_name] = (time.time(), source.fetch_data())
+        self.dirty.set()
+        for listener in list(self._change_listeners):
+            listener()
+        return True
+
+    def add_change_listener(self, listener: Callable[[], None]) -> None:
+        """
+        Call ``listener`` whenever pushed data changes, right after `dirty` is set.
+
+        It runs on the pushing thread and must not block; an event loop
+        can hand it to ``loop.call_soon_threadsafe``.
+        """
+        self._change_listeners.append(listener)
+
+    def remove_change_listener(self, listener: Callable[[], None]) -> None:
+        if listener in self._change_listeners:
+            self._change_listeners.remove(listener)
+
     def fetch_primary_data(self) -> Optional[Nob]:
         """
         Fetch data from the primary data source.
 
         For now, this defaults to the Idelis source to maintain exact
-        compatibility with the existing system behavior.
+        compatibility with the existing system behavior, falling back to
+        the timetable source when one is configured.
 
         Returns:
             Nob object containing fetched data, or None if fetching failed
         """
         # Default to Idelis source for compatibility
-        return self.fetch_from_source("idelis")
+        return self.fetch_with_fallback("idelis")
 
     def get_status(self) -> Dict[str, Any]:
         """
         Get the status of all data sources.
 
         Returns:
-            Dictionary containing status information for all data sources
+            Dictionary containing status information for all data sources;
+            sources not built yet are reported as ``{"loaded": False}``
+            along with whether they are available
         """
         status = {
             "total_sources": len(self.data_sources),
             "available_sources": self.get_available_sources(),
             "last_fetch_time": self._last_fetch_time,
             "last_successful_source": self._last_successful_source,
+            "budget": self.budget.snapshot() if self.budget is not None else None,
             "sources": {}
         }
 
-        for name, source in self.data_sources.items():
+        loaded = dict(self.data_sources.loaded_items())
+        for name in self.data_sources:
+            source = loaded.get(name)
+            if source is None:
+                # Not built until first used
+                status["sources"][name] = {"loaded": False, "available": self._is_available(name)}
+                continue
             status["sources"][name] = {
+                "loaded": True,
                 "name": source.name,
                 "available": source.is_available(),
                 "last_error": source.last_error,
                 "last_fetch_time": source.last_fetch_time,
-                "refresh_interval": source.get_refresh_interval()
+                "refresh_interval": source.get_refresh_interval(),
+                "breaker": self.get_breaker(name).snapshot(),
             }
 
         return status
@@ -160,7 +424,8 @@ class DataSourceManager:
 
         # Currently only IdelisTransportSource supports mock data
         if hasattr(source, 'get_mock_data'):
-            return source.get_mock_data(mock_time)
+            with trace_span("datasource.mock", source=source_name):
+                return source.get_mock_data(mock_time)
 
         return None
 
@@ -0,0 +1,266 @@
+"""
+Push Data Sources
+
+This module implements the PushDataSource class for data produced by other
+processes (arrivals from a local feed, ...). Instead of being polled, such
+sources are fed through `DataSourceManager.push`, which stores the payload
+in the manager's cache and marks the frame dirty only when the payload
+actually changed, so a scheduler re-renders on change rather than on a
+timer. Only sources the frame reads can be pushed: "idelis" itself, or a
+push source configured as its fallback.
+
+Payloads reach the manager through:
+
+- ``POST /push/{source}`` on the web simulator,
+- a Unix socket (`PushSocketListener`): one JSON line per update,
+  ``{"source": "idelis", "data": {...}}``, answered with
+  ``{"ok": true, "changed": ...}``,
+- a watched JSON file (`PushFileWatcher`), through inotify when the
+  optional ``inotify_simple`` package is installed and by polling its
+  modification time otherwise.
+
+`start_push_listeners` starts the socket and file listeners described by
+the ``push_socket`` and ``push_files`` configuration keys.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import socketserver
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from nob import Nob
+
+from ..utils.eventlog import get_logger
+from .base import DataSource
+
+logger = get_logger(__name__)
+
+# Pushed data is never polled, so cached payloads stay valid until replaced.
+PUSH_REFRESH_INTERVAL = 24 * 60 * 60
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+def _digest(payload: Any) -> str:
+    plain = payload[:] if isinstance(payload, Nob) else payload
+    return hashlib.sha256(json.dumps(plain, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class PushDataSource(DataSource):
+    """
+    Data source holding the latest payload pushed to it.
+
+    `fetch_data` returns that payload (None before the first push) and never
+    blocks or touches the network.
+    """
+
+    accepts_push = True
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize the push data source.
+
+        Args:
+            config: Configuration dictionary containing:
+                - name: Source name, as used in ``push_sources`` and push
+                  requests (default "push")
+        """
+        super().__init__(config.get("name", "push"), config)
+        self._lock = threading.Lock()
+        self._data: Optional[Nob] = None
+        self._digest: Optional[str] = None
+        self.pushes = 0
+        self.changes = 0
+
+    def push(self, payload: Any) -> bool:
+        """Store ``payload``; return True if it differs from the previous one."""
+        digest = _digest(payload)
+        with self._lock:
+            self.pushes += 1
+            if digest == self._digest:
+                return False
+            self._data = payload if isinstance(payload, Nob) else Nob(payload)
+            self._digest = digest
+            self.changes += 1
+        self._set_last_fetch_time(time.time())
+        return True
+
+    def fetch_data(self) -> Optional[Nob]:
+        return self._data
+
+    def is_available(self) -> bool:
+        return self._data is not None
+
+    @classmethod
+    def is_configured(cls, config: Dict[str, Any]) -> bool:
+        return False  # Nothing can have been pushed to a source not built yet
+
+    def get_refresh_interval(self) -> int:
+        return PUSH_REFRESH_INTERVAL
+
+
+class PushSocketListener:
+    """Accept pushes as JSON lines on a Unix socket, in a background thread."""
+
+    def __init__(self, manager: Any, socket_path: Path):
+        self.manager = manager
+        self.socket_path = Path(socket_path)
+        self._server: Optional[socketserver.UnixStreamServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer one decoded push request; never raises."""
+        try:
+            changed = self.manager.push(request["source"], request["data"])
+        except (KeyError, TypeError, ValueError) as exc:
+            return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        return {"ok": True, "changed": changed}
+
+    def start(self) -> "PushSocketListener":
+        with contextlib.suppress(FileNotFoundError):
+            self.socket_path.unlink()  # Left behind by a previous run
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        listener = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for line in self.rfile:
+                    try:
+                        reply = listener.handle(json.loads(line))
+                    except ValueError:
+                        reply = {"ok": False, "error": "Malformed request"}
+                    self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+        # Only this user may push: create the socket private rather than
+        # chmod it after bind, which leaves a window where anyone may connect.
+        umask = os.umask(0o177)
+        try:
+            self._server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), Handler)
+        finally:
+            os.umask(umask)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="push-socket", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        with contextlib.suppress(FileNotFoundError):
+            self.socket_path.unlink()
+
+
+class PushFileWatcher:
+    """
+    Push the JSON content of a file to a source whenever the file changes.
+
+    Writers should replace the file atomically (write a temporary file, then
+    rename it over the watched path).
+    """
+
+    def __init__(
+        self,
+        manager: Any,
+        source_name: str,
+        path: Path,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        use_inotify: bool = True,
+    ):
+        self.manager = manager
+        self.source_name = source_name
+        self.path = Path(path)
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.backend: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_signature: Optional[tuple] = None
+
+    def check(self) -> bool:
+        """Push the file's current content; return True if it changed the source."""
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable push file %s: %s", self.path, exc)
+            return False
+        return self.manager.push(self.source_name, payload)
+
+    def start(self) -> "PushFileWatcher":
+        self.backend = "poll"
+        if self.use_inotify:
+            try:
+                import inotify_simple  # noqa: F401
+            except ImportError:
+                pass
+            else:
+                self.backend = "inotify"
+        target = self._watch if self.backend == "inotify" else self._poll
+        # Taken before the first read, so a rewrite in between is not missed.
+        self._last_signature = self._signature()
+        self.check()
+        self._thread = threading.Thread(target=target, name=f"push-file-{self.source_name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def _signature(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            current = self._signature()
+            if current != self._last_signature:
+                self._last_signature = current
+                self.check()
+
+    def _watch(self) -> None:
+        from inotify_simple import INotify, flags
+
+        with INotify() as inotify:
+            # Watch the directory: atomic replacement swaps the file's inode.
+            inotify.add_watch(self.path.parent, flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE)
+            self.check()  # Catch a rewrite that landed before the watch existed
+            while not self._stop.is_set():
+                events = inotify.read(timeout=int(self.poll_interval * 1000))
+                if any(event.name == self.path.name for event in events):
+                    self.check()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def start_push_listeners(manager: Any) -> List[Any]:
+    """
+    Start the listeners configured for ``manager``'s push sources.
+
+    Reads ``push_socket`` (a Unix socket path) and ``push_files`` (a mapping
+    of source name to JSON file) from the manager's configuration. Call
+    ``stop()`` on each returned listener at shutdown.
+    """
+    listeners: List[Any] = []
+    if manager.config.get("push_socket"):
+        listeners.append(PushSocketListener(manager, Path(manager.config["push_socket"])).start())
+    for source_name, path in (manager.config.get("push_files") or {}).items():
+        listeners.append(PushFileWatcher(manager, source_name, Path(path)).start())
+    return listeners
+
+
+__all__ = [
+    "PushDataSource",
+    "PushFileWatcher",
+    "PushSocketListener",
+    "start_push_listeners",
+]
@@ -0,0 +1,174 @@
+"""
+Request Budget
+
+This module implements the RequestBudget class, a token bucket per API host
+and token that DataSourceManager consults before every fetch. Several
+sources sharing one Idelis token draw from the same bucket, and so do
+several processes on the same device: bucket levels live in a small JSON
+state file. Each budget grants from its own copy of the levels and syncs
+it with the file (re-read, then rewritten atomically and without locks if
+it spent anything) at most every ``sync_interval`` seconds, and once more
+when the process exits, so short-lived cron runs still record their
+requests.
+
+Between syncs, and without a lock, several processes can grant the same
+requests; the budget is a guard against sustained overuse, not an exact
+quota.
+"""
+
+import atexit
+import hashlib
+import json
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..utils.eventlog import get_logger
+from ..utils.paths import get_cache_dir, write_atomic
+
+logger = get_logger(__name__)
+
+
+def budget_key(host: str, token: Optional[str]) -> str:
+    """Return the bucket key for ``host`` and ``token``; the token itself is never stored."""
+    digest = hashlib.sha256((token or "").encode("utf-8")).hexdigest()[:12]
+    return f"{host}#{digest}"
+
+
+DEFAULT_SYNC_INTERVAL = 5.0
+
+
+def get_default_budget_state_path() -> Path:
+    return get_cache_dir() / "request-budget.json"
+
+
+# Budgets holding grants not yet written to their state file.
+_unsaved: "weakref.WeakSet[RequestBudget]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_unsaved() -> None:
+    for budget in list(_unsaved):
+        budget.flush()
+
+
+class RequestBudget:
+    """
+    Token-bucket request budget shared by key.
+
+    Each key may spend ``burst`` requests at once and regains
+    ``rate_per_minute`` of them per minute.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        burst: Optional[float] = None,
+        state_path: Optional[Path] = None,
+        clock: Callable[[], float] = time.time,
+        sync_interval: float = DEFAULT_SYNC_INTERVAL,
+    ):
+        """
+        Initialize the budget.
+
+        Args:
+            rate_per_minute: Sustained requests per minute allowed per key
+            burst: Bucket capacity (defaults to one minute's worth, at least 1)
+            state_path: JSON file sharing bucket levels between processes;
+                None keeps them in memory
+            clock: Wall clock (shared between processes, unlike monotonic time)
+            sync_interval: Seconds between syncs with ``state_path``
+        """
+        self.rate = rate_per_minute / 60.0
+        self.burst = float(burst if burst is not None else max(1.0, rate_per_minute))
+        self.state_path = Path(state_path) if state_path else None
+        self._clock = clock
+        self.sync_interval = sync_interval
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._unsaved: Dict[str, int] = {}  # Requests granted since the last sync, by key
+        self._synced_at: Optional[float] = None
+        self.granted = 0
+        self.deferred = 0
+
+    def _load(self) -> Dict[str, Tuple[float, float]]:
+        try:
+            data = json.loads(self.state_path.read_text(encoding="utf-8"))
+            return {key: (float(level), float(at)) for key, (level, at) in data["buckets"].items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+
+    def _save(self, buckets: Dict[str, Tuple[float, float]]) -> None:
+        payload = {"buckets": {key: [round(level, 4), at] for key, (level, at) in buckets.items()}}
+        try:
+            write_atomic(self.state_path, json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        except OSError as exc:
+            logger.warning("Could not save request budget to %s: %s", self.state_path, exc)
+
+    def _sync(self, now: float) -> None:
+        """Replace the local levels with the file's, charged with the requests granted since the last sync."""
+        self._synced_at = now
+        if self.state_path is None:
+            return
+        buckets = self._load()
+        for key, spent in self._unsaved.items():
+            buckets[key] = (self._level(buckets.get(key), now) - spent, now)
+        if self._unsaved:
+            # Full buckets equal the default; dropping them keeps the file small.
+            buckets = {name: bucket for name, bucket in buckets.items() if self._level(bucket, now) < self.burst}
+            self._save(buckets)
+            self._unsaved.clear()
+            _unsaved.discard(self)
+        self._buckets = buckets
+
+    def _level(self, bucket: Optional[Tuple[float, float]], now: float) -> float:
+        if bucket is None:
+            return self.burst
+        level, at = bucket
+        return min(self.burst, level + max(0.0, now - at) * self.rate)
+
+    def acquire(self, key: str) -> bool:
+        """Spend one request from ``key``'s bucket; False if it is empty."""
+        with self._lock:
+            now = self._clock()
+            if self._synced_at is None or now - self._synced_at >= self.sync_interval:
+                self._sync(now)
+            level = self._level(self._buckets.get(key), now)
+            if level < 1.0:
+                self.deferred += 1
+                return False
+            self._buckets[key] = (level - 1.0, now)
+            if self.state_path is not None:
+                self._unsaved[key] = self._unsaved.get(key, 0) + 1
+                _unsaved.add(self)
+            self.granted += 1
+            return True
+
+    def flush(self) -> None:
+        """Write the requests granted since the last sync to the state file now."""
+        with self._lock:
+            if self._unsaved:
+                self._sync(self._clock())
+
+    def retry_after(self, key: str) -> float:
+        """Seconds until ``key`` can spend a request again."""
+        with self._lock:
+            level = self._level(self._buckets.get(key), self._clock())
+        if level >= 1.0:
+            return 0.0
+        return (1.0 - level) / self.rate if self.rate > 0 else float("inf")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Budget settings and counters for `DataSourceManager.get_status`."""
+        return {
+            "rate_per_minute": round(self.rate * 60.0, 3),
+            "burst": self.burst,
+            "state_path": str(self.state_path) if self.state_path else None,
+            "granted": self.granted,
+            "deferred": self.deferred,
+        }
+
+
+__all__ = ["DEFAULT_SYNC_INTERVAL", "RequestBudget", "budget_key", "get_default_budget_state_path"]
@@ -0,0 +1,168 @@
+"""
+Data Source Registry
+
+This module maps data-source type names to their implementations and builds
+configured sources lazily, so a device only imports and constructs the
+sources it actually uses, and only when they are first needed.
+
+Types come from the built-in table below and from the
+``minidisplay.datasources`` entry-point group, which lets other packages
+add sources without touching this one:
+
+    [project.entry-points."minidisplay.datasources"]
+    weather = "minidisplay_weather:WeatherSource"
+
+Implementations are imported on first use. A source class is constructed
+as ``cls(config)``, where ``config`` is the device configuration overlaid
+with the source's own options and its ``name``.
+"""
+
+import importlib
+import threading
+from importlib import metadata
+from typing import Any, Callable, Dict, Iterator, List, MutableMapping, Optional, Tuple
+
+from .base import DataSource
+
+ENTRY_POINT_GROUP = "minidisplay.datasources"
+
+BUILTIN_SOURCES: Dict[str, str] = {
+    "idelis": "minidisplay.datasources.idelis:IdelisTransportSource",
+    "push": "minidisplay.datasources.push:PushDataSource",
+    "replay": "minidisplay.datasources.replay:ReplayDataSource",
+    "timetable": "minidisplay.datasources.timetable:TimetableSource",
+}
+
+
+def _import_target(target: str) -> Any:
+    module_name, _, attribute = target.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+class SourceRegistry:
+    """Type name to data-source class, resolved on demand."""
+
+    def __init__(self, builtins: Optional[Dict[str, str]] = None):
+        self._targets: Dict[str, Any] = dict(BUILTIN_SOURCES if builtins is None else builtins)
+        self._entry_points: Optional[Dict[str, metadata.EntryPoint]] = None
+
+    def register(self, type_name: str, target: Any) -> None:
+        """Register a class, or a ``"module:Class"`` string imported on first use."""
+        self._targets[type_name] = target
+
+    def _discovered(self) -> Dict[str, metadata.EntryPoint]:
+        # Scanning installed distributions is slow; do it once, and only if needed.
+        if self._entry_points is None:
+            self._entry_points = {entry.name: entry for entry in metadata.entry_points(group=ENTRY_POINT_GROUP)}
+        return self._entry_points
+
+    def __contains__(self, type_name: object) -> bool:
+        return type_name in self._targets or type_name in self._discovered()
+
+    def types(self) -> List[str]:
+        return sorted({*self._targets, *self._discovered()})
+
+    def resolve(self, type_name: str) -> Callable[[Dict[str, Any]], DataSource]:
+        """
+        Return the class registered for ``type_name``, importing it if needed.
+
+        Raises:
+            KeyError: If no built-in, registered or installed source has that type.
+        """
+        target = self._targets.get(type_name)
+        if target is None:
+            entry = self._discovered().get(type_name)
+            if entry is None:
+                raise KeyError(f"Unknown data source type: {type_name!r}")
+            target = entry.load()
+        elif isinstance(target, str):
+            target = _import_target(target)
+        self._targets[type_name] = target
+        return target
+
+    def create(self, type_name: str, config: Dict[str, Any]) -> DataSource:
+        return self.resolve(type_name)(config)
+
+
+_registry = SourceRegistry()
+
+
+def get_source_registry() -> SourceRegistry:
+    """Return the process-wide registry used by DataSourceManager."""
+    return _registry
+
+
+class LazySources(MutableMapping):
+    """
+    Name to data source mapping that constructs each source on first access.
+
+    Membership, iteration, ``len`` and `loaded_items` only look at what
+    exists; any value access (``[]``, ``get``, ``items``, ``values``)
+    builds the sources involved. Sources are built under a lock, so
+    concurrent first lookups share one instance, and a factory that raises
+    stays registered for the next lookup.
+    """
+
+    def __init__(self) -> None:
+        self._pending: Dict[str, Callable[[], DataSource]] = {}
+        self._loaded: Dict[str, DataSource] = {}
+        self._lock = threading.RLock()  # Re-entrant: a factory may look up another source
+
+    def defer(self, name: str, factory: Callable[[], DataSource]) -> None:
+        """Register ``factory`` to build source ``name`` when it is first needed."""
+        with self._lock:
+            self._loaded.pop(name, None)
+            self._pending[name] = factory
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._loaded
+
+    def loaded_items(self) -> List[Tuple[str, DataSource]]:
+        """The sources built so far, without building the others."""
+        return list(self._loaded.items())
+
+    def __getitem__(self, name: str) -> DataSource:
+        source = self._loaded.get(name)
+        if source is not None:
+            return source
+        with self._lock:
+            if name not in self._loaded:
+                factory = self._pending[name]  # KeyError for unknown names
+                self._loaded[name] = factory()
+                # Only dropped once built, so a failed build can be retried.
+                del self._pending[name]
+            return self._loaded[name]
+
+    def __setitem__(self, name: str, source: DataSource) -> None:
+        with self._lock:
+            self._pending.pop(name, None)
+            self._loaded[name] = source
+
+    def __delitem__(self, name: str) -> None:
+        with self._lock:
+            if self._pending.pop(name, None) is None:
+                del self._loaded[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._loaded or name in self._pending
+
+    def __iter__(self) -> Iterator[str]:
+        loaded = list(self._loaded)
+        yield from loaded
+        # A source being built is briefly in both dictionaries.
+        yield from [name for name in list(self._pending) if name not in loaded]
+
+    def __len__(self) -> int:
+        return len(self._loaded.keys() | self._pending.keys())
+
+    def __repr__(self) -> str:
+        return f"LazySources(loaded={sorted(self._loaded)}, pending={sorted(self._pending)})"
+
+
+__all__ = [
+    "BUILTIN_SOURCES",
+    "ENTRY_POINT_GROUP",
+    "LazySources",
+    "SourceRegistry",
+    "get_source_registry",
+]
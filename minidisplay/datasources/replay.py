@@ -0,0 +1,374 @@
+"""
+Recorded Traffic Replay
+
+This module records real data-source payloads with their timestamps and
+plays them back through the ReplayDataSource class against a virtual clock,
+so the full pipeline can be benchmarked and regression-tested
+deterministically (a whole morning can be replayed in a fraction of a
+second).
+
+Recording format (JSON Lines): a header line, then one line per frame,
+so recording a fetch appends one line instead of rewriting the file.
+
+    {"format": "minidisplay-recording", "version": 2, "source": "idelis", "started_at": "2026-10-19T06:30:00"}
+    {"t": 0.0, "payload": {"passages": [...]}}
+    {"t": 60.0}
+    ...
+
+``t`` is the offset in seconds from ``started_at``. A frame without a
+``payload`` repeats the previous one, which keeps recordings of a mostly
+static feed small. Version 1 recordings, a single JSON document with the
+frames in a ``"frames"`` list, are still read (through
+`config.load_mock_data`) and are converted when recorded to again; the
+first line tells the two formats apart.
+"""
+
+import datetime as dt
+import json
+import os
+import time
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from nob import Nob
+
+from ..config import load_mock_data
+from ..utils.eventlog import get_logger
+from ..utils.paths import write_atomic
+from .base import DataSource
+
+logger = get_logger(__name__)
+
+RECORDING_FORMAT = "minidisplay-recording"
+RECORDING_VERSION = 2
+_READABLE_VERSIONS = (1, RECORDING_VERSION)
+_NO_PAYLOAD = object()
+
+
+def _plain(payload: Any) -> Any:
+    return payload[:] if isinstance(payload, Nob) else payload
+
+
+def _json_line(value: Dict[str, Any]) -> str:
+    return json.dumps(value, separators=(",", ":")) + "\n"
+
+
+def _frame(offset: float, payload: Any, previous: Any) -> Dict[str, Any]:
+    frame: Dict[str, Any] = {"t": round(offset, 3)}
+    if payload != previous:
+        frame["payload"] = payload
+    return frame
+
+
+def _parse_header(line: bytes) -> Optional[Dict[str, Any]]:
+    """Return ``line`` decoded if it is the header line of a JSON Lines recording."""
+    try:
+        header = json.loads(line)
+    except ValueError:
+        return None  # Also the first line of an indented version 1 document
+    if isinstance(header, dict) and header.get("format") == RECORDING_FORMAT and "frames" not in header:
+        return header
+    return None
+
+
+def _is_jsonl(path: Path) -> bool:
+    try:
+        with path.open("rb") as handle:
+            return _parse_header(handle.readline()) is not None
+    except OSError:
+        return False
+
+
+def _last_line(handle: BinaryIO, size: int, block: int = 4096) -> bytes:
+    """Return the last line of a file ending with a newline, reading backwards."""
+    end = size - 1  # Before the final newline
+    data = b""
+    while end > 0:
+        start = max(0, end - block)
+        handle.seek(start)
+        data = handle.read(end - start) + data
+        newline = data.rfind(b"\n")
+        if newline >= 0:
+            return data[newline + 1:]
+        end = start
+    return data
+
+
+def _read_ends(path: Path) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Return the header and last line of a complete version 2 recording,
+    without reading the frames in between; ``(None, None)`` for any other file.
+    """
+    try:
+        with path.open("rb") as handle:
+            header = _parse_header(handle.readline())
+            if header is None or header.get("version") != RECORDING_VERSION:
+                return None, None
+            size = handle.seek(0, os.SEEK_END)
+            handle.seek(size - 1)
+            if handle.read(1) != b"\n":  # Cut off mid-append
+                return None, None
+            return header, json.loads(_last_line(handle, size))
+    except (OSError, ValueError):
+        return None, None
+
+
+def _read_lines(path: Path) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Parse a version 2 recording into its header and frames."""
+    lines = path.read_text(encoding="utf-8").splitlines()
+    try:
+        header = json.loads(lines[0]) if lines else {}
+    except ValueError as exc:
+        raise ValueError(f"Invalid recording header in {path}: {exc}") from exc
+    frames = []
+    for number, line in enumerate(lines[1:], start=2):
+        try:
+            frames.append(json.loads(line))
+        except ValueError:
+            if number < len(lines):
+                raise ValueError(f"Invalid frame on line {number} of {path}") from None
+            # A writer killed mid-append leaves a partial last line.
+            logger.warning("Ignoring truncated last frame of %s", path)
+    return header, frames
+
+
+@dataclass
+class Recording:
+    """Timestamped payloads of one data source."""
+
+    started_at: dt.datetime
+    source: str = "idelis"
+    offsets: List[float] = field(default_factory=list)
+    payloads: List[Any] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "Recording":
+        """
+        Load a recording: JSON Lines when its first line is a version 2
+        header, otherwise a version 1 document read through `load_mock_data`.
+
+        Raises:
+            ValueError: If the file is not a recording this version understands.
+        """
+        if path is not None and _is_jsonl(Path(path)):
+            data, frames = _read_lines(Path(path))
+        else:
+            data = load_mock_data(Path(path) if path else None)
+            frames = data.get("frames", [])
+        if data.get("format") != RECORDING_FORMAT or data.get("version") not in _READABLE_VERSIONS:
+            raise ValueError(f"Not a {RECORDING_FORMAT} file of version {' or '.join(map(str, _READABLE_VERSIONS))}")
+
+        recording = cls(started_at=dt.datetime.fromisoformat(data["started_at"]), source=data.get("source", "idelis"))
+        previous = None
+        for frame in frames:
+            previous = frame.get("payload", previous)
+            recording.offsets.append(float(frame["t"]))
+            recording.payloads.append(previous)
+        return recording
+
+    def _header(self) -> Dict[str, Any]:
+        return {
+            "format": RECORDING_FORMAT,
+            "version": RECORDING_VERSION,
+            "source": self.source,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+        }
+
+    def save(self, path: Path) -> None:
+        """Write the recording compactly, eliding payloads equal to the previous one."""
+        lines = [_json_line(self._header())]
+        previous = _NO_PAYLOAD
+        for offset, payload in zip(self.offsets, self.payloads):
+            lines.append(_json_line(_frame(offset, payload, previous)))
+            previous = payload
+        write_atomic(Path(path), "".join(lines).encode("utf-8"))
+
+    def append(self, at: dt.datetime, payload: Any) -> None:
+        self.offsets.append((at - self.started_at).total_seconds())
+        self.payloads.append(_plain(payload))
+
+    @property
+    def duration(self) -> float:
+        return self.offsets[-1] if self.offsets else 0.0
+
+    @property
+    def ended_at(self) -> dt.datetime:
+        return self.started_at + dt.timedelta(seconds=self.duration)
+
+    def payload_at(self, at: dt.datetime) -> Optional[Any]:
+        """Return the payload in effect at ``at`` (the first one before the recording starts)."""
+        if not self.payloads:
+            return None
+        index = bisect_right(self.offsets, (at - self.started_at).total_seconds()) - 1
+        return self.payloads[max(index, 0)]
+
+
+class TrafficRecorder:
+    """
+    Append successful fetches to a recording file.
+
+    Each fetch appends one line, so a cron-driven device can grow one
+    recording across many short-lived processes without rewriting it.
+    Only the start time and the last payload are kept in memory.
+    """
+
+    def __init__(self, path: Union[str, Path], clock: Callable[[], dt.datetime] = dt.datetime.now):
+        self.path = Path(path)
+        self._clock = clock
+        self._started_at: Optional[dt.datetime] = None
+        self._previous: Any = _NO_PAYLOAD
+
+    def record(self, source_name: str, payload: Any) -> None:
+        now = self._clock()
+        payload = _plain(payload)
+        try:
+            if self._started_at is None:
+                self._open(source_name, now)
+            frame = _frame((now - self._started_at).total_seconds(), payload, self._previous)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(_json_line(frame))
+        except OSError as exc:
+            logger.warning("Could not write recording %s: %s", self.path, exc)
+            return
+        self._previous = payload
+
+    def _open(self, source_name: str, now: dt.datetime) -> None:
+        # A complete current file is appended to after reading its two ends.
+        header, last = _read_ends(self.path)
+        if header is not None:
+            try:
+                self._started_at = dt.datetime.fromisoformat(header["started_at"])
+            except (KeyError, TypeError, ValueError):
+                pass
+            else:
+                # A last frame without payload repeats an older one: write the next in full.
+                self._previous = last.get("payload", _NO_PAYLOAD) if isinstance(last, dict) else _NO_PAYLOAD
+                return
+
+        recording = None
+        if self.path.exists():
+            try:
+                recording = Recording.load(self.path)
+            except (ValueError, KeyError) as exc:
+                logger.warning("Ignoring unreadable recording %s: %s", self.path, exc)
+        if recording is None:
+            recording = Recording(started_at=now.replace(microsecond=0), source=source_name)
+        # Version 1 and cut-off files are rewritten once in the current format.
+        recording.save(self.path)
+        self._started_at = recording.started_at
+        self._previous = recording.payloads[-1] if recording.payloads else _NO_PAYLOAD
+
+
+class VirtualClock:
+    """
+    Clock running ``speed`` times faster than real time from ``start``.
+
+    With ``speed=0`` the clock only moves through `advance`.
+    """
+
+    def __init__(
+        self,
+        start: dt.datetime,
+        speed: float = 1.0,
+        monotonic: Callable[[], float] = time.monotonic,
+    ):
+        self.start = start
+        self.speed = speed
+        self._monotonic = monotonic
+        self._origin = monotonic()
+        self._offset = 0.0
+
+    def now(self) -> dt.datetime:
+        elapsed = (self._monotonic() - self._origin) * self.speed + self._offset
+        return self.start + dt.timedelta(seconds=elapsed)
+
+    def advance(self, seconds: float) -> dt.datetime:
+        self._offset += seconds
+        return self.now()
+
+
+def iter_replay(
+    recording: Recording,
+    step: float = 60.0,
+    speed: Optional[float] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Iterator[Tuple[dt.datetime, Any]]:
+    """
+    Yield ``(virtual time, payload)`` every ``step`` virtual seconds of ``recording``.
+
+    ``speed`` paces the iteration against real time (``speed=7200`` plays two
+    hours per real second); None yields as fast as the consumer allows.
+    """
+    offset = 0.0
+    started = time.monotonic()
+    while offset <= recording.duration:
+        if speed:
+            delay = offset / speed - (time.monotonic() - started)
+            if delay > 0:
+                sleep(delay)
+        at = recording.started_at + dt.timedelta(seconds=offset)
+        yield at, recording.payload_at(at)
+        offset += step
+
+
+class ReplayDataSource(DataSource):
+    """
+    Data source serving recorded payloads.
+
+    `fetch_data` answers with the payload in effect at the virtual clock's
+    current time; `get_mock_data` with the payload recorded at the mock
+    time's time of day, so ``--use-mock --mock-time 07:30`` shows what the
+    recording saw at 07:30.
+    """
+
+    recordable = False  # Recording a replay would only copy the recording
+
+    def __init__(self, config: Dict[str, Any], recording: Optional[Recording] = None):
+        """
+        Initialize the replay data source.
+
+        Args:
+            config: Configuration dictionary containing:
+                - replay_file: Path of the recording (unless ``recording`` is given)
+                - replay_speed: Optional virtual clock speed (default 1.0)
+            recording: Optional already-loaded recording
+        """
+        super().__init__("Replay", config)
+        self.recording = recording
+        if self.recording is None:
+            try:
+                self.recording = Recording.load(Path(config["replay_file"]))
+            except (OSError, ValueError, KeyError) as e:
+                self._set_error(f"Could not load recording: {e}")
+        start = self.recording.started_at if self.recording else dt.datetime.now()
+        self.clock = VirtualClock(start, speed=float(config.get("replay_speed", 1.0)))
+
+    def fetch_data(self) -> Optional[Nob]:
+        if not self.recording:
+            return None
+        self._clear_error()
+        payload = self.recording.payload_at(self.clock.now())
+        if payload is None:
+            return None
+        self._set_last_fetch_time(time.time())
+        return Nob(payload)
+
+    def is_available(self) -> bool:
+        return bool(self.recording and self.recording.payloads)
+
+    @classmethod
+    def is_configured(cls, config: Dict[str, Any]) -> bool:
+        return bool(config.get("replay_file")) and Path(config["replay_file"]).is_file()
+
+    def get_refresh_interval(self) -> int:
+        """Replays are cheap and time-dependent: never reuse a previous answer."""
+        return 0
+
+    def get_mock_data(self, mock_time: dt.datetime) -> Optional[Nob]:
+        if not self.recording:
+            return None
+        at = dt.datetime.combine(self.recording.started_at.date(), mock_time.time())
+        payload = self.recording.payload_at(at)
+        return Nob(payload) if payload is not None else None
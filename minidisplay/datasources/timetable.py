@@ -0,0 +1,287 @@
+"""
+Static Timetable Source
+
+This module implements the TimetableSource class, an offline fallback that
+answers from the published timetable when the live API is unavailable.
+
+Timetables are imported once, from a GTFS feed or a simple CSV file, into
+a TimetableIndex: one sorted array of departure minutes per (stop, line,
+weekday), saved as compact JSON. Next departures are then found by binary
+search, without touching the network.
+
+CSV files need a header row and one departure per line:
+
+    stop,line,days,time
+    1234,A,mon-fri,07:05
+    1234,A,sat sun,08:15
+
+``days`` accepts day abbreviations separated by spaces, ranges such as
+``mon-fri``, and ``daily``. Build an index with:
+
+    python -m minidisplay.datasources timetable gtfs.zip timetable.json --stop 1234
+"""
+
+import argparse
+import csv
+import datetime as dt
+import io
+import json
+import time
+import zipfile
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from nob import Nob
+
+from ..utils.paths import write_atomic
+from .base import DataSource
+
+TIMETABLE_FORMAT = "minidisplay-timetable"
+TIMETABLE_VERSION = 1
+DAY_NAMES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+GTFS_DAY_COLUMNS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+MINUTES_PER_DAY = 24 * 60
+
+IndexKey = Tuple[str, str, int]
+
+
+def _parse_days(value: str) -> List[int]:
+    """Return the weekdays (0 = Monday) described by ``value``."""
+    days: Set[int] = set()
+    for token in value.lower().replace(",", " ").replace("+", " ").split():
+        if token in ("daily", "all"):
+            days.update(range(7))
+        elif "-" in token:
+            first, last = (DAY_NAMES.index(part[:3]) for part in token.split("-", 1))
+            days.update(range(first, last + 1) if first <= last else [*range(first, 7), *range(last + 1)])
+        else:
+            days.add(DAY_NAMES.index(token[:3]))
+    return sorted(days)
+
+
+def _parse_minutes(value: str) -> int:
+    """Minutes after midnight of ``HH:MM`` or GTFS ``HH:MM:SS`` (hours may exceed 23)."""
+    hours, minutes = value.strip().split(":")[:2]
+    return int(hours) * 60 + int(minutes)
+
+
+class TimetableIndex:
+    """Sorted departure minutes per (stop, line, weekday)."""
+
+    def __init__(self, departures: Optional[Dict[IndexKey, Iterable[int]]] = None):
+        self._departures: Dict[IndexKey, array] = {
+            key: array("H", sorted(set(minutes))) for key, minutes in (departures or {}).items()
+        }
+
+    def __len__(self) -> int:
+        return sum(len(minutes) for minutes in self._departures.values())
+
+    def __contains__(self, stop_line: Tuple[str, str]) -> bool:
+        return any((*stop_line, day) in self._departures for day in range(7))
+
+    def departures(self, stop: str, line: str, weekday: int) -> array:
+        return self._departures.get((stop, line, weekday), array("H"))
+
+    def next_departures(self, stop: str, line: str, when: dt.datetime, count: int = 3) -> List[dt.datetime]:
+        """
+        Return the next ``count`` departures at or after ``when``.
+
+        Looks at the previous service day first, for GTFS trips running past
+        midnight (``25:10``), then today and the following days.
+        """
+        stop, line = str(stop), str(line)
+        start = when.replace(second=0, microsecond=0)
+        minute = start.hour * 60 + start.minute
+        midnight = start - dt.timedelta(minutes=minute)
+        found: List[dt.datetime] = []
+        for days_ahead in range(-1, 8):
+            service_day = midnight + dt.timedelta(days=days_ahead)
+            minutes = self.departures(stop, line, service_day.weekday())
+            position = bisect_left(minutes, max(0, minute - days_ahead * MINUTES_PER_DAY))
+            found.extend(service_day + dt.timedelta(minutes=value) for value in minutes[position:position + count])
+            if days_ahead >= 0 and len(found) >= count:
+                break
+        # Yesterday's after-midnight trips may interleave with today's first ones.
+        return sorted(found)[:count]
+
+    def save(self, path: Path) -> None:
+        document = {
+            "format": TIMETABLE_FORMAT,
+            "version": TIMETABLE_VERSION,
+            "departures": {
+                f"{stop}|{line}|{DAY_NAMES[day]}": list(minutes)
+                for (stop, line, day), minutes in sorted(self._departures.items())
+            },
+        }
+        write_atomic(Path(path), json.dumps(document, separators=(",", ":")).encode("utf-8"))
+
+    @classmethod
+    def load(cls, path: Path) -> "TimetableIndex":
+        """
+        Load an index written by `save`.
+
+        Raises:
+            ValueError: If the file is not a timetable index this version understands.
+        """
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if data.get("format") != TIMETABLE_FORMAT or data.get("version") != TIMETABLE_VERSION:
+            raise ValueError(f"Not a version {TIMETABLE_VERSION} {TIMETABLE_FORMAT} file")
+        index = cls()
+        for key, minutes in data["departures"].items():
+            stop, line, day = key.rsplit("|", 2)
+            index._departures[(stop, line, DAY_NAMES.index(day))] = array("H", minutes)
+        return index
+
+    @classmethod
+    def from_csv(cls, path: Path) -> "TimetableIndex":
+        departures: Dict[IndexKey, List[int]] = defaultdict(list)
+        with open(path, newline="", encoding="utf-8") as handle:
+            for row in csv.DictReader(handle):
+                minutes = _parse_minutes(row["time"])
+                for day in _parse_days(row["days"]):
+                    departures[(row["stop"].strip(), row["line"].strip(), day)].append(minutes)
+        return cls(departures)
+
+    @classmethod
+    def from_gtfs(cls, path: Path, stops: Optional[Iterable[str]] = None) -> "TimetableIndex":
+        """
+        Build an index from a GTFS feed (directory or zip file).
+
+        Stops are identified by ``stop_code`` when the feed has one, else by
+        ``stop_id``; lines by ``route_short_name``. Only the weekly
+        ``calendar.txt`` pattern is used: ``calendar_dates.txt`` exceptions
+        and service date ranges are ignored. Pass ``stops`` to index only
+        those stops.
+        """
+        wanted = {str(stop) for stop in stops} if stops else None
+        with _GtfsFeed(Path(path)) as feed:
+            stop_names = {row["stop_id"]: row.get("stop_code") or row["stop_id"] for row in feed.rows("stops.txt")}
+            lines = {row["route_id"]: row.get("route_short_name") or row["route_id"] for row in feed.rows("routes.txt")}
+            weekdays = {
+                row["service_id"]: [day for day, column in enumerate(GTFS_DAY_COLUMNS) if row.get(column) == "1"]
+                for row in feed.rows("calendar.txt")
+            }
+            trips = {row["trip_id"]: (lines.get(row["route_id"], row["route_id"]), row["service_id"]) for row in feed.rows("trips.txt")}
+
+            departures: Dict[IndexKey, List[int]] = defaultdict(list)
+            for row in feed.rows("stop_times.txt"):
+                stop = stop_names.get(row["stop_id"], row["stop_id"])
+                trip = trips.get(row["trip_id"])
+                clock = row.get("departure_time") or row.get("arrival_time")
+                if trip is None or not clock or (wanted is not None and stop not in wanted):
+                    continue
+                minutes = _parse_minutes(clock)
+                for day in weekdays.get(trip[1], ()):
+                    departures[(stop, trip[0], day)].append(minutes)
+        return cls(departures)
+
+
+class _GtfsFeed:
+    """Read GTFS tables from a directory or a zip file."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._zip = zipfile.ZipFile(path) if path.is_file() else None
+
+    def rows(self, name: str) -> Iterator[Dict[str, str]]:
+        if self._zip is not None:
+            if name not in self._zip.namelist():
+                return
+            with self._zip.open(name) as raw:
+                yield from csv.DictReader(io.TextIOWrapper(raw, encoding="utf-8-sig"))
+        elif (self.path / name).exists():
+            with open(self.path / name, newline="", encoding="utf-8-sig") as handle:
+                yield from csv.DictReader(handle)
+
+    def __enter__(self) -> "_GtfsFeed":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._zip is not None:
+            self._zip.close()
+
+
+class TimetableSource(DataSource):
+    """
+    Data source answering from a precomputed timetable index.
+
+    Answers look like Idelis answers (a ``passages`` list of ``arrivee``
+    times) with ``"scheduled": true`` added, so the display pipeline needs
+    no changes.
+    """
+
+    def __init__(self, config: Dict[str, Any], index: Optional[TimetableIndex] = None):
+        """
+        Initialize the timetable data source.
+
+        Args:
+            config: Configuration dictionary containing:
+                - timetable_file: Index written by `TimetableIndex.save`
+                  (unless ``index`` is given)
+                - api_code, api_ligne, api_next: Stop, line and number of
+                  departures, shared with the Idelis source
+            index: Optional already-loaded index
+        """
+        super().__init__("Timetable", config)
+        self.stop = str(config.get("api_code", ""))
+        self.line = str(config.get("api_ligne", ""))
+        self.count = int(config.get("api_next", 3))
+        self.index = index
+        if self.index is None:
+            try:
+                self.index = TimetableIndex.load(Path(config["timetable_file"]))
+            except (OSError, ValueError, KeyError) as e:
+                self._set_error(f"Could not load timetable: {e}")
+
+    def _passages(self, when: dt.datetime) -> Optional[Nob]:
+        if not self.index:
+            return None
+        departures = self.index.next_departures(self.stop, self.line, when, self.count)
+        return Nob({
+            "passages": [{"arrivee": departure.strftime("%H:%M")} for departure in departures],
+            "scheduled": True,
+        })
+
+    def fetch_data(self) -> Optional[Nob]:
+        data = self._passages(dt.datetime.now())
+        if data is not None:
+            self._set_last_fetch_time(time.time())
+        return data
+
+    def is_available(self) -> bool:
+        return self.index is not None and (self.stop, self.line) in self.index
+
+    @classmethod
+    def is_configured(cls, config: Dict[str, Any]) -> bool:
+        return bool(config.get("timetable_file")) and Path(config["timetable_file"]).is_file()
+
+    def get_refresh_interval(self) -> int:
+        return 60
+
+    def get_mock_data(self, mock_time: dt.datetime) -> Optional[Nob]:
+        return self._passages(mock_time)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m minidisplay.datasources timetable",
+        description="Build a timetable index from a GTFS feed or a CSV file.",
+    )
+    parser.add_argument("source", type=Path, help="GTFS directory or zip file, or a .csv file.")
+    parser.add_argument("output", type=Path, help="Index file to write (set it as timetable_file).")
+    parser.add_argument("--stop", action="append", default=None, help="Only index this stop (repeatable).")
+    args = parser.parse_args(argv)
+
+    if args.source.suffix.lower() == ".csv":
+        index = TimetableIndex.from_csv(args.source)
+    else:
+        index = TimetableIndex.from_gtfs(args.source, stops=args.stop)
+    index.save(args.output)
+    print(f"Indexed {len(index)} departures into {args.output}")
+    return 0
+
+
+__all__ = ["TimetableIndex", "TimetableSource"]
@@ -5,10 +5,11 @@ Contains device abstractions, layout models, and rendering helpers used to
 prepare frames for the Inky e-ink devices (or virtual outputs).
 """
 
-from .devices import Display, InkyDisplay, VirtualDisplay
+from .devices import Display, InkyDisplay, MemoryDisplay, VirtualDisplay
 from .models import (
     DisplayLayout,
     DisplayElement,
+    FrameInfo,
     DISPLAY_WIDTH,
     DISPLAY_HEIGHT,
     ICON_HEIGHT,
@@ -17,11 +18,18 @@ from .models import (
     PADDING,
     ELEMENT_SPACING,
 )
+from .encoders import FRAME_FORMATS, encode_frame
+from .framebuffer import FramebufferDisplay, FramebufferReader
+from .governor import RefreshGovernor
+from .push import AsyncPushDisplay
 from .renderer import DisplayRenderer
+from .atlas import GlyphAtlas
+from .text import TextRasterCache, get_default_text_cache
 
 __all__ = [
     "Display",
     "InkyDisplay",
+    "MemoryDisplay",
     "VirtualDisplay",
     "DisplayLayout",
     "DisplayElement",
@@ -33,4 +41,14 @@ __all__ = [
     "PADDING",
     "ELEMENT_SPACING",
     "DisplayRenderer",
+    "AsyncPushDisplay",
+    "RefreshGovernor",
+    "FrameInfo",
+    "FRAME_FORMATS",
+    "FramebufferDisplay",
+    "FramebufferReader",
+    "encode_frame",
+    "GlyphAtlas",
+    "TextRasterCache",
+    "get_default_text_cache",
 ]
@@ -0,0 +1,134 @@
+"""Glyph-atlas text rendering for strings drawn from a small alphabet."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from PIL import Image, ImageChops, ImageColor, ImageDraw
+
+from .text import DEFAULT_ATLAS_ALPHABET, RenderedText, load_font
+
+
+@dataclass(frozen=True)
+class _Glyph:
+    mask: Optional[Image.Image]  # Ink coverage cropped to its bounding box
+    ink_offset: Tuple[int, int]  # Top-left of the ink relative to the pen origin
+    box: Tuple[int, int, int, int]  # getbbox() of the glyph drawn on its own
+    advance: float
+
+
+class GlyphAtlas:
+    """
+    Pre-rasterized glyphs of one font and size, composed into strings by blitting.
+
+    Every glyph of the alphabet goes through FreeType exactly once when the
+    atlas is built; afterwards strings covered by the alphabet are assembled
+    from the stored masks using the font's advances and pair kerning, so
+    rendering a new clock value never touches FreeType. Strings whose glyphs
+    overlap are not `composable` and should be left to FreeType.
+    """
+
+    def __init__(self, font_path: str, font_size: int, alphabet: str = DEFAULT_ATLAS_ALPHABET):
+        self.font_path = font_path
+        self.font_size = font_size
+        self.alphabet = "".join(sorted(set(alphabet)))
+        self._glyphs: Dict[str, _Glyph] = {}
+        self._kerning: Dict[Tuple[str, str], float] = {}
+        self._build()
+
+    def _build(self) -> None:
+        font = load_font(self.font_path, self.font_size)
+        for char in self.alphabet:
+            box = font.getbbox(char)
+            advance = font.getlength(char)
+            # Draw on a generous canvas so overhanging ink is not clipped.
+            margin = self.font_size
+            canvas = Image.new("L", (int(advance) + 2 * margin, box[3] + margin), 0)
+            ImageDraw.Draw(canvas).text((margin, 0), char, fill=255, font=font)
+            ink = canvas.getbbox()
+            if ink is None:
+                glyph = _Glyph(mask=None, ink_offset=(0, 0), box=box, advance=advance)
+            else:
+                glyph = _Glyph(
+                    mask=canvas.crop(ink),
+                    ink_offset=(ink[0] - margin, ink[1]),
+                    box=box,
+                    advance=advance,
+                )
+            self._glyphs[char] = glyph
+
+        for left in self.alphabet:
+            for right in self.alphabet:
+                adjust = (
+                    font.getlength(left + right)
+                    - self._glyphs[left].advance
+                    - self._glyphs[right].advance
+                )
+                if adjust:
+                    self._kerning[(left, right)] = adjust
+
+    def covers(self, text: str) -> bool:
+        """Return True when every character of ``text`` is in the atlas."""
+        return bool(text) and all(char in self._glyphs for char in text)
+
+    def _layout(self, text: str):
+        pen = 0.0
+        placements = []
+        previous = None
+        for char in text:
+            if previous is not None:
+                pen += self._glyphs[previous].advance + self._kerning.get((previous, char), 0.0)
+            placements.append((int(round(pen)), self._glyphs[char]))
+            previous = char
+        return placements
+
+    def composable(self, text: str) -> bool:
+        """
+        Return True when composing ``text`` matches FreeType's rasterization.
+
+        The text must be covered, and no two glyphs' ink may overlap: where
+        kerned glyphs touch, FreeType blends their coverage differently than
+        combining the masks, so such strings are left to FreeType.
+        """
+        if not self.covers(text):
+            return False
+        reach = None
+        for x, glyph in self._layout(text):
+            if glyph.mask is None:
+                continue
+            left = x + glyph.ink_offset[0]
+            if reach is not None and left < reach:
+                return False
+            reach = max(reach or left, left + glyph.mask.width)
+        return True
+
+    def getbbox(self, text: str) -> Tuple[int, int, int, int]:
+        placements = self._layout(text)
+        right = max(x + glyph.box[2] for x, glyph in placements)
+        top = min(glyph.box[1] for _, glyph in placements)
+        bottom = max(glyph.box[3] for _, glyph in placements)
+        return (0, top, right, bottom)
+
+    def render(self, text: str, color: str) -> RenderedText:
+        """Compose ``text`` from atlas glyphs; the text must be covered."""
+        if not self.covers(text):
+            raise ValueError(f"Text {text!r} is not covered by the glyph atlas.")
+
+        placements = self._layout(text)
+        left, top, right, bottom = self.getbbox(text)
+        ink = ImageColor.getcolor(color, "RGB")
+        if right <= left or bottom <= top:
+            return RenderedText(mask=None, offset=(0, 0), size=(right, bottom), ink=ink)
+
+        # Glyph ink outside the run's bounding box is clipped, as FreeType does.
+        mask = Image.new("L", (right - left, bottom - top), 0)
+        for x, glyph in placements:
+            if glyph.mask is None:
+                continue
+            gx = x + glyph.ink_offset[0] - left
+            gy = glyph.ink_offset[1] - top
+            region = (gx, gy, gx + glyph.mask.width, gy + glyph.mask.height)
+            mask.paste(ImageChops.lighter(mask.crop(region), glyph.mask), region[:2])
+
+        return RenderedText(mask=mask, offset=(left, top), size=(right, bottom), ink=ink)
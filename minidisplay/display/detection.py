@@ -0,0 +1,125 @@
+"""
+Cached Inky panel detection.
+
+`inky.auto.auto()` probes the HAT's I2C EEPROM on every call, which is a
+noticeable share of a cron-driven render. The first successful probe is
+recorded in a small JSON state file (driver module and class, colour,
+resolution); later starts instantiate that driver directly and only probe
+again when asked to or when the cached driver cannot be loaded.
+
+Inky drivers do not touch the hardware until their first ``show()``, so a
+cached driver is only proven right by a refresh: `InkyDisplay` probes
+again if the first refresh with a cached driver fails.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+from ..utils.eventlog import get_logger
+from ..utils.paths import get_cache_dir, write_atomic
+
+logger = get_logger(__name__)
+
+INKY_STATE_ENV = "MINIDISPLAY_INKY_STATE"
+
+
+@dataclass
+class InkyPanelInfo:
+    """Driver and geometry of a detected Inky panel."""
+
+    module: str
+    driver: str
+    colour: str
+    resolution: Tuple[int, int]
+
+    @classmethod
+    def from_display(cls, display: Any) -> "InkyPanelInfo":
+        return cls(
+            module=type(display).__module__,
+            driver=type(display).__name__,
+            colour=display.colour,
+            resolution=tuple(display.resolution),
+        )
+
+
+def get_inky_state_path() -> Path:
+    """Return the state file path, honouring ``MINIDISPLAY_INKY_STATE``."""
+    configured = os.getenv(INKY_STATE_ENV)
+    return Path(configured) if configured else get_cache_dir() / "inky.json"
+
+
+def load_panel_info(path: Path) -> Optional[InkyPanelInfo]:
+    """Return the cached panel, or None if the state file is missing or unreadable."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return InkyPanelInfo(
+            module=data["module"],
+            driver=data["driver"],
+            colour=data["colour"],
+            resolution=tuple(data["resolution"]),
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_panel_info(path: Path, info: InkyPanelInfo) -> None:
+    try:
+        payload = asdict(info)
+        payload["resolution"] = list(info.resolution)
+        write_atomic(path, (json.dumps(payload, indent=2) + "\n").encode("utf-8"))
+    except OSError as exc:
+        # Caching is an optimisation; a read-only home must not stop the display.
+        logger.warning("Could not save Inky detection state to %s: %s", path, exc)
+
+
+def _open_cached(info: InkyPanelInfo) -> Any:
+    driver = getattr(importlib.import_module(info.module), info.driver)
+    display = driver(colour=info.colour)
+    if tuple(display.resolution) != tuple(info.resolution):
+        raise RuntimeError(f"Cached driver {info.driver} reports {display.resolution}, expected {info.resolution}")
+    return display
+
+
+def open_inky(reprobe: bool = False, state_path: Optional[Path] = None) -> Tuple[Any, bool]:
+    """
+    Return ``(inky_display, from_cache)``.
+
+    Uses the cached driver unless ``reprobe`` is set, falling back to
+    `inky.auto.auto()` when there is no usable cache entry or the cached
+    driver cannot be loaded; a fresh probe rewrites the state file.
+    ``from_cache`` displays are unverified until their first ``show()``.
+
+    Raises:
+        ImportError: If the inky library is not installed.
+        RuntimeError: If no panel is detected.
+    """
+    path = state_path or get_inky_state_path()
+    if not reprobe:
+        info = load_panel_info(path)
+        if info is not None:
+            try:
+                return _open_cached(info), True
+            except Exception as exc:  # Any driver failure means the cache is stale
+                logger.warning("Cached Inky driver %s.%s failed (%s); probing again.", info.module, info.driver, exc)
+
+    from inky.auto import auto
+
+    display = auto()
+    save_panel_info(path, InkyPanelInfo.from_display(display))
+    return display, False
+
+
+__all__ = [
+    "INKY_STATE_ENV",
+    "InkyPanelInfo",
+    "get_inky_state_path",
+    "load_panel_info",
+    "open_inky",
+    "save_panel_info",
+]
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import io
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Optional, Union
 
 from PIL import Image
 
-from .models import DISPLAY_WIDTH, DISPLAY_HEIGHT
-from ..utils.paths import get_generated_output_dir
+from .encoders import DEFAULT_FRAME_FORMAT, FRAME_EXTENSIONS, FRAME_FORMATS, encode_frame
+from .models import DISPLAY_WIDTH, DISPLAY_HEIGHT, FrameInfo
+from ..utils.eventlog import get_logger
+from ..utils.paths import get_generated_output_dir, write_atomic
+from ..utils.metrics import DISPLAY_REFRESH_TOTAL
+from ..utils.tracing import trace_span
+
+logger = get_logger(__name__)
+
 
 class Display(ABC):
     """Abstract base class for display devices."""
@@ -25,24 +33,41 @@ class Display(ABC):
     def show(self):
         pass
 
+    def set_frame_info(self, info: Optional[FrameInfo]):
+        """Describe the next frame; devices that don't care ignore it."""
+
+    def poll(self) -> bool:
+        """Give deferred work a chance to run; return True if a frame was pushed."""
+        return False
+
 class InkyDisplay(Display):
     """Concrete implementation for the physical Inky display."""
 
-    def __init__(self):
+    def __init__(self, reprobe: bool = False, state_path: Optional[Path] = None):
+        self._state_path = state_path
+        self._image: Optional[Image.Image] = None
+        # Inky drivers only talk to the panel when first shown, so a driver
+        # taken from the detection cache is unverified until then.
+        self._unverified = False
         try:
-            from inky.auto import auto
-            self._inky_display = auto()
-            if self._inky_display.resolution not in ((212, 104), (250, 122)):
-                w, h = self._inky_display.resolution
-                raise RuntimeError(f"This example does not support {w}x{h}")
-
-            self._inky_display.set_border(self._inky_display.BLACK)
-            self._inky_display.h_flip = True
-            self._inky_display.v_flip = True
+            self._inky_display, self._unverified = self._open(reprobe)
         except (ImportError, RuntimeError):
-            print("Inky display not available or not detected, running in simulation mode.")
+            logger.info("Inky display not available or not detected, running in simulation mode.")
             self._inky_display = None
 
+    def _open(self, reprobe: bool):
+        from .detection import open_inky
+
+        inky_display, from_cache = open_inky(reprobe=reprobe, state_path=self._state_path)
+        if inky_display.resolution not in ((212, 104), (250, 122)):
+            w, h = inky_display.resolution
+            raise RuntimeError(f"This example does not support {w}x{h}")
+
+        inky_display.set_border(inky_display.BLACK)
+        inky_display.h_flip = True
+        inky_display.v_flip = True
+        return inky_display, from_cache
+
     @property
     def resolution(self) -> tuple[int, int]:
         if self._inky_display:
@@ -51,24 +76,53 @@ class InkyDisplay(Display):
 
     def set_image(self, image: Image.Image):
         if self._inky_display:
+            self._image = image
             self._inky_display.set_image(image)
 
     def show(self):
         if self._inky_display:
-            self._inky_display.show()
+            with trace_span("display.show", device="inky"):
+                try:
+                    self._inky_display.show()
+                except Exception as exc:  # A cached driver failing means the cache is stale
+                    if not self._unverified:
+                        raise
+                    self._show_reprobed(exc)
+            self._unverified = False
+            DISPLAY_REFRESH_TOTAL.inc(device="inky")
+
+    def _show_reprobed(self, exc: Exception) -> None:
+        logger.warning("Cached Inky driver failed its first refresh (%s); probing again.", exc)
+        self._unverified = False
+        self._inky_display, _ = self._open(reprobe=True)
+        if self._image is not None:
+            self._inky_display.set_image(self._image)
+        self._inky_display.show()
 
 class VirtualDisplay(Display):
-    """Concrete implementation for a virtual (file-based) display."""
+    """
+    Concrete implementation for a virtual (file-based) display.
+
+    Frames are encoded as ``frame_format`` (see `encode_frame`: ``png``,
+    ``png1``, ``pbm``, ``pgm`` or ``raw``) and written through a temporary
+    file renamed over the output, so readers never see a partial frame.
+    """
 
     def __init__(
         self,
         filename: Optional[Union[str, Path]] = None,
         resolution=(DISPLAY_WIDTH, DISPLAY_HEIGHT),
+        frame_format: str = DEFAULT_FRAME_FORMAT,
+        compress_level: Optional[int] = None,
     ):
-        default_path = get_generated_output_dir() / "output.png"
+        if frame_format not in FRAME_FORMATS:
+            raise ValueError(f"Unknown frame format {frame_format!r}; expected one of {', '.join(FRAME_FORMATS)}.")
+        default_path = get_generated_output_dir() / f"output{FRAME_EXTENSIONS[frame_format]}"
         self._filename = Path(filename) if filename else default_path
         self._image = None
         self._resolution = resolution
+        self._format = frame_format
+        self._compress_level = compress_level
 
     @property
     def resolution(self) -> tuple[int, int]:
@@ -79,12 +133,50 @@ class VirtualDisplay(Display):
 
     def show(self):
         if self._image:
-            self._filename.parent.mkdir(parents=True, exist_ok=True)
-            self._image.save(self._filename)
-            print(f"Image saved as {self._filename}")
+            with trace_span("display.show", device="virtual"):
+                data = encode_frame(self._image, self._format, self._compress_level)
+                write_atomic(self._filename, data)
+            DISPLAY_REFRESH_TOTAL.inc(device="virtual")
+            logger.debug("Image saved as %s", self._filename)  # The CLI reports it on stdout
         else:
-            print("No image set to display.")
+            logger.warning("No image set to display.")
 
     @property
     def output_path(self) -> Path:
         return self._filename
+
+class MemoryDisplay(Display):
+    """Concrete implementation keeping the last frame as encoded bytes in memory."""
+
+    def __init__(self, resolution=(DISPLAY_WIDTH, DISPLAY_HEIGHT), image_format: str = "PNG"):
+        self._image = None
+        self._resolution = resolution
+        self._format = image_format
+        self._frame: Optional[bytes] = None
+
+    @property
+    def resolution(self) -> tuple[int, int]:
+        return self._resolution
+
+    def set_image(self, image: Image.Image):
+        self._image = image
+
+    def show(self):
+        if self._image:
+            with trace_span("display.show", device="memory"):
+                buffer = io.BytesIO()
+                self._image.save(buffer, format=self._format)
+                self._frame = buffer.getvalue()
+            DISPLAY_REFRESH_TOTAL.inc(device="memory")
+        else:
+            logger.warning("No image set to display.")
+
+    @property
+    def image(self) -> Optional[Image.Image]:
+        """The last image handed to the display."""
+        return self._image
+
+    @property
+    def frame(self) -> Optional[bytes]:
+        """Encoded bytes of the last shown frame, or None before the first show."""
+        return self._frame
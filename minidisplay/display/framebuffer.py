@@ -0,0 +1,275 @@
+"""
+Memory-mapped framebuffer display for sharing frames with local processes.
+
+`FramebufferDisplay` writes every frame's raw pixels into a file-backed
+shared mapping; `FramebufferReader` maps the same file so a kiosk viewer or
+screenshot daemon can pick frames up without decoding or touching the
+filesystem again.
+
+File layout (little-endian), 32-byte header followed by the pixel buffer:
+
+    offset  size  field
+    0       4     magic  b"MDFB"
+    4       2     version
+    6       1     mode code (1 = "1", 2 = "L", 3 = "RGB")
+    7       1     reserved
+    8       2     width
+    10      2     height
+    12      4     frame size in bytes
+    16      8     sequence number
+    24      8     reserved
+
+The sequence number doubles as a seqlock: the writer makes it odd while the
+pixels are being replaced and even once the frame is complete, so readers
+retry instead of returning a torn frame. Sequence 0 means no frame yet.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from PIL import Image
+
+from .devices import Display
+from .models import DISPLAY_HEIGHT, DISPLAY_WIDTH
+from ..utils.eventlog import get_logger
+from ..utils.metrics import DISPLAY_REFRESH_TOTAL
+from ..utils.paths import replacement_mode
+from ..utils.tracing import trace_span
+
+logger = get_logger(__name__)
+
+FRAMEBUFFER_MAGIC = b"MDFB"
+FRAMEBUFFER_VERSION = 1
+HEADER_SIZE = 32
+_HEADER = struct.Struct("<4sHBxHHI")
+_SEQUENCE = struct.Struct("<Q")
+_SEQUENCE_OFFSET = 16
+
+_MODE_CODES = {"1": 1, "L": 2, "RGB": 3}
+_CODE_MODES = {code: mode for mode, code in _MODE_CODES.items()}
+
+DEFAULT_READ_RETRIES = 100
+DEFAULT_POLL_INTERVAL = 0.01
+
+
+def _frame_size(mode: str, resolution: Tuple[int, int]) -> int:
+    width, height = resolution
+    if mode == "1":
+        return (width + 7) // 8 * height
+    return width * height * len(mode)
+
+
+class FramebufferDisplay(Display):
+    """Concrete implementation writing raw frames into a memory-mapped file."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        resolution=(DISPLAY_WIDTH, DISPLAY_HEIGHT),
+        mode: str = "RGB",
+    ):
+        if mode not in _MODE_CODES:
+            raise ValueError(f"Unsupported framebuffer mode {mode!r}; expected one of {', '.join(_MODE_CODES)}.")
+        self._path = Path(path)
+        self._resolution = tuple(resolution)
+        self._mode = mode
+        self._frame_size = _frame_size(mode, self._resolution)
+        self._image: Optional[Image.Image] = None
+        self._sequence = 0
+
+        width, height = self._resolution
+        header = (FRAMEBUFFER_MAGIC, FRAMEBUFFER_VERSION, _MODE_CODES[mode], width, height, self._frame_size)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        existing = self._map_existing(header)
+        if existing is not None:
+            # Reopening the same framebuffer: keep counting so readers waiting
+            # on a later sequence don't miss the next frame.
+            self._map = existing
+            previous = _SEQUENCE.unpack_from(self._map, _SEQUENCE_OFFSET)[0]
+            self._sequence = previous + previous % 2
+            _SEQUENCE.pack_into(self._map, _SEQUENCE_OFFSET, self._sequence)
+        else:
+            self._map = self._map_new(header)
+
+    def _map_existing(self, header: tuple) -> Optional[mmap.mmap]:
+        """Map the current file if it already holds a framebuffer of this exact layout."""
+        try:
+            fd = os.open(self._path, os.O_RDWR)
+        except FileNotFoundError:
+            return None
+        try:
+            if os.fstat(fd).st_size != HEADER_SIZE + self._frame_size:
+                return None
+            mapping = mmap.mmap(fd, HEADER_SIZE + self._frame_size)
+        finally:
+            os.close(fd)
+        if _HEADER.unpack_from(mapping, 0) != header:
+            mapping.close()
+            return None
+        return mapping
+
+    def _map_new(self, header: tuple) -> mmap.mmap:
+        """
+        Create the framebuffer in a new file and rename it over the old one.
+
+        Resizing the old file in place would make readers that still map it
+        fault (SIGBUS) on the pages past its new end; renaming leaves them
+        with the old, intact file until they reopen the path. The new file
+        gets the same mode as one written by `write_atomic`.
+        """
+        mode = replacement_mode(self._path)
+        fd, tmp_name = tempfile.mkstemp(dir=self._path.parent, prefix=f".{self._path.name}.", suffix=".tmp")
+        try:
+            os.fchmod(fd, mode)
+            os.ftruncate(fd, HEADER_SIZE + self._frame_size)
+            mapping = mmap.mmap(fd, HEADER_SIZE + self._frame_size)
+            _HEADER.pack_into(mapping, 0, *header)
+            _SEQUENCE.pack_into(mapping, _SEQUENCE_OFFSET, 0)
+            os.replace(tmp_name, self._path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+        finally:
+            os.close(fd)
+        return mapping
+
+    @property
+    def resolution(self) -> tuple[int, int]:
+        return self._resolution
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def sequence(self) -> int:
+        """Sequence number of the last published frame (0 before the first)."""
+        return self._sequence
+
+    def set_image(self, image: Image.Image):
+        self._image = image
+
+    def show(self):
+        if not self._image:
+            logger.warning("No image set to display.")
+            return
+        if self._image.size != self._resolution:
+            raise ValueError(f"Frame is {self._image.size}, framebuffer expects {self._resolution}.")
+
+        with trace_span("display.show", device="framebuffer"):
+            image = self._image if self._image.mode == self._mode else self._image.convert(self._mode)
+            pixels = image.tobytes()
+            _SEQUENCE.pack_into(self._map, _SEQUENCE_OFFSET, self._sequence + 1)  # Odd: write in progress
+            self._map[HEADER_SIZE:HEADER_SIZE + self._frame_size] = pixels
+            self._sequence += 2
+            _SEQUENCE.pack_into(self._map, _SEQUENCE_OFFSET, self._sequence)
+        DISPLAY_REFRESH_TOTAL.inc(device="framebuffer")
+
+    def close(self) -> None:
+        if not self._map.closed:
+            self._map.close()
+
+
+class FramebufferReader:
+    """
+    Read frames published by a `FramebufferDisplay`, possibly in another process.
+
+    Raises:
+        ValueError: If the file is not a framebuffer this version understands.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self._path = Path(path)
+        with self._path.open("rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._map) < HEADER_SIZE:
+            self._map.close()
+            raise ValueError(f"{self._path} is too small to be a framebuffer.")
+        magic, version, mode_code, width, height, frame_size = _HEADER.unpack_from(self._map, 0)
+        if magic != FRAMEBUFFER_MAGIC or version != FRAMEBUFFER_VERSION or mode_code not in _CODE_MODES:
+            self._map.close()
+            raise ValueError(f"{self._path} is not a version {FRAMEBUFFER_VERSION} framebuffer.")
+
+        self.mode = _CODE_MODES[mode_code]
+        self.resolution = (width, height)
+        self._frame_size = frame_size
+
+    @property
+    def sequence(self) -> int:
+        """Current sequence number; odd while the writer is mid-frame."""
+        return _SEQUENCE.unpack_from(self._map, _SEQUENCE_OFFSET)[0]
+
+    def view(self) -> memoryview:
+        """
+        Zero-copy view of the pixel buffer.
+
+        The writer may replace it at any time; compare `sequence` before and
+        after using the view, or call `read` for a consistent copy.
+        """
+        return memoryview(self._map)[HEADER_SIZE:HEADER_SIZE + self._frame_size]
+
+    def read(self, retries: int = DEFAULT_READ_RETRIES) -> Optional[Tuple[int, Image.Image]]:
+        """
+        Return ``(sequence, image)`` for the latest complete frame.
+
+        Returns None before the first frame, or if the writer kept the
+        buffer busy for ``retries`` attempts.
+        """
+        for _ in range(retries):
+            before = self.sequence
+            if before == 0:
+                return None
+            if before % 2:
+                time.sleep(0)
+                continue
+            pixels = self._map[HEADER_SIZE:HEADER_SIZE + self._frame_size]
+            if self.sequence == before:
+                return before, Image.frombytes(self.mode, self.resolution, pixels)
+        return None
+
+    def wait(
+        self,
+        after: int = 0,
+        timeout: Optional[float] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> Optional[Tuple[int, Image.Image]]:
+        """
+        Block until a frame newer than sequence ``after`` is published.
+
+        Only the shared header is polled, so waiting costs no filesystem
+        calls. Returns None if ``timeout`` seconds pass first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            sequence = self.sequence
+            if sequence > after and sequence % 2 == 0:
+                frame = self.read()
+                if frame is not None:
+                    return frame
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(poll_interval)
+
+    def close(self) -> None:
+        if not self._map.closed:
+            self._map.close()
+
+    def __enter__(self) -> "FramebufferReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+__all__ = ["FramebufferDisplay", "FramebufferReader"]
@@ -0,0 +1,169 @@
+"""Refresh-rate governor protecting e-ink panels from over-frequent updates."""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Callable, Dict, Optional
+
+from PIL import Image
+
+from .devices import Display
+from .models import FrameInfo
+from ..utils.eventlog import get_logger
+from ..utils.metrics import FRAMES_SKIPPED_TOTAL, GOVERNOR_DECISIONS_TOTAL
+
+logger = get_logger(__name__)
+
+DEFAULT_MIN_REFRESH_INTERVAL = 30.0
+DEFAULT_COSMETIC_REFRESH_INTERVAL = 300.0
+
+PUSHED = "pushed"
+DEFERRED = "deferred"
+DUPLICATE = "duplicate"
+
+
+class RefreshGovernor(Display):
+    """
+    Rate-limit refreshes of a wrapped `Display`.
+
+    Each shown frame is compared with the last one pushed to the device:
+
+    - duplicate: identical pixels, dropped;
+    - major: a different layout or different content (e.g. another arrival
+      minute, or an active/standby switch), pushed once ``min_interval``
+      seconds have passed since the last refresh;
+    - cosmetic: same layout and content but different pixels, pushed only
+      once ``cosmetic_interval`` seconds have passed.
+
+    A frame that isn't due yet is held back; a newer frame replaces it
+    (keeping the higher priority of the two) and `poll()` pushes it once it
+    becomes due. Frames without `FrameInfo` are treated as major.
+    """
+
+    def __init__(
+        self,
+        device: Display,
+        min_interval: float = DEFAULT_MIN_REFRESH_INTERVAL,
+        cosmetic_interval: float = DEFAULT_COSMETIC_REFRESH_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.device = device
+        self.min_interval = min_interval
+        self.cosmetic_interval = max(cosmetic_interval, min_interval)
+        self._clock = clock
+        self._image: Optional[Image.Image] = None
+        self._info: Optional[FrameInfo] = None
+        self._last_push: Optional[float] = None
+        self._last_digest: Optional[str] = None
+        self._last_info: Optional[FrameInfo] = None
+        self._pending: Optional[tuple] = None  # (image, info, digest, major)
+        self.counters: Dict[str, int] = {
+            "pushed": 0,
+            "major": 0,
+            "cosmetic": 0,
+            "duplicate": 0,
+            "deferred": 0,
+            "coalesced": 0,
+        }
+
+    @property
+    def resolution(self) -> tuple[int, int]:
+        return self.device.resolution
+
+    @property
+    def output_path(self):
+        return getattr(self.device, "output_path", None)
+
+    @property
+    def has_pending(self) -> bool:
+        return self._pending is not None
+
+    def set_frame_info(self, info: Optional[FrameInfo]):
+        self._info = info
+
+    def set_image(self, image: Image.Image):
+        self._image = image
+
+    def _is_major(self, info: Optional[FrameInfo]) -> bool:
+        last = self._last_info
+        if info is None or last is None:
+            return True
+        return info.layout != last.layout or info.content != last.content
+
+    def _due_at(self, major: bool) -> float:
+        if self._last_push is None:
+            return float("-inf")
+        return self._last_push + (self.min_interval if major else self.cosmetic_interval)
+
+    def next_due(self) -> Optional[float]:
+        """Clock time at which the held-back frame may be pushed, if any."""
+        if self._pending is None:
+            return None
+        return self._due_at(self._pending[3])
+
+    def show(self) -> str:
+        """Push, defer or drop the current frame; return the decision."""
+        if not self._image:
+            logger.warning("No image set to display.")
+            return DUPLICATE
+
+        digest = hashlib.sha1(self._image.tobytes()).hexdigest()
+        if digest == self._last_digest:
+            # Back to what the panel already shows: a held-back frame is moot.
+            if self._pending is not None:
+                self._pending = None
+                self._count("coalesced")
+            self._count("duplicate")
+            FRAMES_SKIPPED_TOTAL.inc(reason="governor_duplicate")
+            return DUPLICATE
+
+        major = self._is_major(self._info)
+        if self._pending is not None:
+            major = major or self._pending[3]
+            self._count("coalesced")
+            FRAMES_SKIPPED_TOTAL.inc(reason="governor_coalesced")
+        self._pending = (self._image, self._info, digest, major)
+
+        if self._clock() >= self._due_at(major):
+            self._push()
+            return PUSHED
+        self._count("deferred")
+        return DEFERRED
+
+    def poll(self) -> bool:
+        """Push the held-back frame if it is due."""
+        if self._pending is None or self._clock() < self._due_at(self._pending[3]):
+            return False
+        self._push()
+        return True
+
+    def flush(self) -> bool:
+        """Push the held-back frame now, ignoring the interval."""
+        if self._pending is None:
+            return False
+        self._push()
+        return True
+
+    def _push(self) -> None:
+        image, info, digest, major = self._pending
+        self._pending = None
+        self.device.set_frame_info(info)
+        self.device.set_image(image)
+        self.device.show()
+        self._last_push = self._clock()
+        self._last_digest = digest
+        self._last_info = info
+        self._count("pushed")
+        self._count("major" if major else "cosmetic")
+
+    def _count(self, decision: str) -> None:
+        self.counters[decision] += 1
+        GOVERNOR_DECISIONS_TOTAL.inc(decision=decision)
+
+
+__all__ = [
+    "DEFAULT_COSMETIC_REFRESH_INTERVAL",
+    "DEFAULT_MIN_REFRESH_INTERVAL",
+    "RefreshGovernor",
+]
@@ -89,3 +89,11 @@ class DisplayLayout:
         # Add more inter-element validation rules here as needed
         # For instance, check for overlapping elements if explicit coordinates are used,
         # or ensure content_keys are unique if they represent distinct data points.
+
+
+@dataclass
+class FrameInfo:
+    """What a frame shows: the layout name and the dynamic content it was rendered with."""
+
+    layout: str
+    content: Dict[str, Any] = field(default_factory=dict)
@@ -0,0 +1,126 @@
+"""Background frame pushing so slow panel refreshes don't block rendering."""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Optional, Tuple
+
+from PIL import Image
+
+from .devices import Display
+from .models import FrameInfo
+from ..utils.eventlog import get_logger
+from ..utils.metrics import FRAMES_SKIPPED_TOTAL
+
+logger = get_logger(__name__)
+
+
+class AsyncPushDisplay(Display):
+    """
+    Wrap a `Display` so `show()` hands the frame to a background thread.
+
+    Only the newest frame waits for the device: a frame shown while another
+    is still pending replaces it, and the superseded frame's future is
+    cancelled. The frame being pushed when a new one arrives always
+    completes. `show()` returns a `concurrent.futures.Future` that resolves
+    once the wrapped device's own `show()` returns (or raises).
+    """
+
+    def __init__(self, device: Display, name: str = "display-push"):
+        self.device = device
+        self._name = name
+        self._image: Optional[Image.Image] = None
+        self._info: Optional[FrameInfo] = None
+        self._pending: Optional[Tuple[Image.Image, Optional[FrameInfo], Future]] = None
+        self._busy = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self.pushed = 0
+        self.superseded = 0
+        self.failed = 0
+
+    @property
+    def resolution(self) -> tuple[int, int]:
+        return self.device.resolution
+
+    @property
+    def output_path(self) -> Optional[Path]:
+        return getattr(self.device, "output_path", None)
+
+    def set_frame_info(self, info: Optional[FrameInfo]):
+        self._info = info
+
+    def set_image(self, image: Image.Image):
+        self._image = image
+
+    def show(self) -> Future:
+        future: Future = Future()
+        if not self._image:
+            logger.warning("No image set to display.")
+            future.set_result(False)
+            return future
+
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("AsyncPushDisplay is closed.")
+            if self._pending is not None:
+                self._pending[2].cancel()
+                self.superseded += 1
+                FRAMES_SKIPPED_TOTAL.inc(reason="superseded")
+            self._pending = (self._image, self._info, future)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+        return future
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+                image, info, future = self._pending
+                self._pending = None
+                self._busy = True
+
+            if future.set_running_or_notify_cancel():
+                try:
+                    self.device.set_frame_info(info)
+                    self.device.set_image(image)
+                    self.device.show()
+                except BaseException as exc:  # Reported through the future
+                    self.failed += 1
+                    future.set_exception(exc)
+                else:
+                    self.pushed += 1
+                    future.set_result(True)
+
+            with self._condition:
+                self._busy = False
+                self._condition.notify_all()
+
+    @property
+    def idle(self) -> bool:
+        with self._condition:
+            return self._pending is None and not self._busy
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the pending frame, if any, has been pushed."""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending is None and not self._busy, timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Push the pending frame, then stop the background thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+__all__ = ["AsyncPushDisplay"]
@@ -1,10 +1,14 @@
-from PIL import Image, ImageDraw, ImageFont
+import time
+from typing import Optional
+
+from PIL import Image, ImageDraw
 from font_hanken_grotesk import HankenGroteskBold
 
 from .devices import Display
 from .models import (
     DisplayLayout,
     DisplayElement,
+    FrameInfo,
     DISPLAY_WIDTH,
     DISPLAY_HEIGHT,
     ICON_HEIGHT,
@@ -13,6 +17,12 @@ from .models import (
     PADDING,
     ELEMENT_SPACING,
 )
+from .text import RenderedText, TextRasterCache, get_default_text_cache
+from ..utils.eventlog import get_logger
+from ..utils.metrics import RENDER_SECONDS
+from ..utils.tracing import trace_span
+
+logger = get_logger(__name__)
 
 
 def getsize(font, text):
@@ -27,20 +37,25 @@ def _load_and_resize_icon(path: str, target_height: int) -> Image.Image | None:
         white_background = Image.new("RGBA", icon_image.size, (255, 255, 255, 255))
         return Image.alpha_composite(white_background, icon_image).convert("RGB")
     except FileNotFoundError:
-        print(f"Icon file not found: {path}")
+        logger.warning("Icon file not found: %s", path)
         return None
 
 class DisplayRenderer:
-    def __init__(self, display_device: Display):
+    def __init__(self, display_device: Display, text_cache: Optional[TextRasterCache] = None):
         self.display_device = display_device
+        self.text_cache = text_cache if text_cache is not None else get_default_text_cache()
         self.image = Image.new("RGB", self.display_device.resolution, (255, 255, 255))
         self.draw = ImageDraw.Draw(self.image)
+        self.frame_info: Optional[FrameInfo] = None
+
+    def _get_rendered_text(self, element: DisplayElement, dynamic_content: dict) -> RenderedText:
+        text_content = element.content or dynamic_content.get(element.content_key, "")
+        font_size = element.size.get("font_size", FONT_SIZE)
+        return self.text_cache.get(HankenGroteskBold, font_size, element.color, text_content)
 
     def _get_element_dimensions(self, element: DisplayElement, dynamic_content: dict):
         if element.type == "text":
-            text_content = element.content or dynamic_content.get(element.content_key, "")
-            font = ImageFont.truetype(HankenGroteskBold, element.size.get("font_size", FONT_SIZE))
-            return getsize(font, text_content)
+            return self._get_rendered_text(element, dynamic_content).size
         elif element.type == "icon":
             target_height = element.size.get("height", ICON_HEIGHT)
             icon_image = _load_and_resize_icon(element.content, target_height)
@@ -108,14 +123,12 @@ class DisplayRenderer:
         return positioned_elements
 
     def _draw_text(self, element: DisplayElement, dynamic_content: dict, x: int, y: int):
-        text_content = element.content or dynamic_content.get(element.content_key, "")
-        font = ImageFont.truetype(HankenGroteskBold, element.size.get("font_size", FONT_SIZE))
-        self.draw.text((x, y), text_content, fill=element.color, font=font)
+        self._get_rendered_text(element, dynamic_content).paste_into(self.image, x, y)
 
     def _draw_icon(self, element: DisplayElement, x: int, y: int):
         icon_path = element.content
         if not icon_path:
-            print(f"Warning: Icon element {{element.name}} has no content (path).")
+            logger.warning("Icon element %s has no content (path).", element.name)
             return
 
         target_height = element.size.get("height", ICON_HEIGHT)
@@ -125,36 +138,44 @@ class DisplayRenderer:
             self.image.paste(icon_image, (x, y))
 
     def render(self, layout: DisplayLayout, dynamic_content: dict):
+        started = time.perf_counter()
         # Clear the image for each render
         self.image = Image.new("RGB", self.display_device.resolution, (255, 255, 255))
         self.draw = ImageDraw.Draw(self.image)
 
         if layout.arrangement == "horizontal":
-            positioned_elements = self._calculate_horizontal_positions(layout, dynamic_content)
-            for element, x, y in positioned_elements:
-                if element.type == "text":
-                    self._draw_text(element, dynamic_content, x, y)
-                elif element.type == "icon":
-                    self._draw_icon(element, x, y)
-        else:  # Default rendering for non-horizontal arrangements (e.g., single element centered)
-            for element in layout.elements:
-                if element.type == "text":
-                    # Recalculate x,y for single element centering
-                    text_content = element.content or dynamic_content.get(element.content_key, "")
-                    font = ImageFont.truetype(HankenGroteskBold, element.size.get("font_size", FONT_SIZE))
-                    text_w, text_h = getsize(font, text_content)
-                    x = (self.display_device.resolution[0] - text_w) // 2
-                    y = (self.display_device.resolution[1] - text_h) // 2
-                    self._draw_text(element, dynamic_content, x, y)
-                elif element.type == "icon":
-                    # Recalculate x,y for single element centering
-                    target_height = element.size.get("height", ICON_HEIGHT)
-                    icon_image = _load_and_resize_icon(element.content, target_height)
-                    if icon_image:
-                        icon_w, icon_h = icon_image.size
-                        x = (self.display_device.resolution[0] - icon_w) // 2
-                        y = (self.display_device.resolution[1] - icon_h) // 2
+            with trace_span("render.layout", layout=layout.name):
+                positioned_elements = self._calculate_horizontal_positions(layout, dynamic_content)
+            with trace_span("render.rasterize", layout=layout.name):
+                for element, x, y in positioned_elements:
+                    if element.type == "text":
+                        self._draw_text(element, dynamic_content, x, y)
+                    elif element.type == "icon":
                         self._draw_icon(element, x, y)
+        else:  # Default rendering for non-horizontal arrangements (e.g., single element centered)
+            with trace_span("render.rasterize", layout=layout.name):
+                self._render_centered(layout, dynamic_content)
+        RENDER_SECONDS.observe(time.perf_counter() - started, layout=layout.name)
 
+        self.frame_info = FrameInfo(layout.name, dict(dynamic_content))
+        self.display_device.set_frame_info(self.frame_info)
         self.display_device.set_image(self.image)
         self.display_device.show()
+
+    def _render_centered(self, layout: DisplayLayout, dynamic_content: dict):
+        for element in layout.elements:
+            if element.type == "text":
+                # Recalculate x,y for single element centering
+                text_w, text_h = self._get_rendered_text(element, dynamic_content).size
+                x = (self.display_device.resolution[0] - text_w) // 2
+                y = (self.display_device.resolution[1] - text_h) // 2
+                self._draw_text(element, dynamic_content, x, y)
+            elif element.type == "icon":
+                # Recalculate x,y for single element centering
+                target_height = element.size.get("height", ICON_HEIGHT)
+                icon_image = _load_and_resize_icon(element.content, target_height)
+                if icon_image:
+                    icon_w, icon_h = icon_image.size
+                    x = (self.display_device.resolution[0] - icon_w) // 2
+                    y = (self.display_device.resolution[1] - icon_h) // 2
+                    self._draw_icon(element, x, y)
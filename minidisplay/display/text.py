@@ -0,0 +1,152 @@
+"""Text rasterization helpers backed by an LRU cache of pre-rendered strings."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+
+from ..utils.metrics import register_cache
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle guard
+    from .atlas import GlyphAtlas
+
+DEFAULT_TEXT_CACHE_SIZE = 128
+# Clock and countdown strings ("07:42", "12 min") only need these characters.
+DEFAULT_ATLAS_ALPHABET = "0123456789: -hmin"
+
+
+@lru_cache(maxsize=32)
+def load_font(font_path: str, font_size: int) -> ImageFont.FreeTypeFont:
+    """Return a (shared) FreeType font instance for the given path and size."""
+    return ImageFont.truetype(font_path, font_size)
+
+
+@dataclass(frozen=True)
+class RenderedText:
+    """A rasterized string ready to be pasted onto a frame."""
+
+    mask: Optional[Image.Image]  # "L" coverage mask cropped to the ink bounding box
+    offset: Tuple[int, int]  # Top-left corner of the mask relative to the draw origin
+    size: Tuple[int, int]  # (right, bottom) extent, as returned by ``getsize``
+    ink: Tuple[int, ...]  # Fill colour resolved for RGB frames
+
+    def paste_into(self, image: Image.Image, x: int, y: int) -> None:
+        if self.mask is None:
+            return
+        left = x + self.offset[0]
+        top = y + self.offset[1]
+        box = (left, top, left + self.mask.width, top + self.mask.height)
+        image.paste(self.ink, box, self.mask)
+
+
+def rasterize_text(font: ImageFont.FreeTypeFont, text: str, color: str) -> RenderedText:
+    """Rasterize ``text`` through FreeType into a cropped coverage mask."""
+    left, top, right, bottom = font.getbbox(text)
+    ink = ImageColor.getcolor(color, "RGB")
+    if right <= left or bottom <= top:
+        return RenderedText(mask=None, offset=(0, 0), size=(right, bottom), ink=ink)
+
+    mask = Image.new("L", (right - left, bottom - top), 0)
+    ImageDraw.Draw(mask).text((-left, -top), text, fill=255, font=font)
+    return RenderedText(mask=mask, offset=(left, top), size=(right, bottom), ink=ink)
+
+
+class TextRasterCache:
+    """
+    LRU cache of rasterized strings keyed by (font, size, color, text).
+
+    Frames repeat the same handful of strings ("07:42", "Aucun passage", ...),
+    so a hit turns text drawing into a single masked paste and makes text
+    measurement free. Misses on strings covered by the glyph atlas alphabet,
+    and whose glyphs do not overlap, are composed from pre-rasterized glyphs
+    instead of going through FreeType; pass ``atlas_alphabet=None`` to
+    disable that path.
+
+    The cache is shared by render threads; lookups, inserts and evictions
+    hold a lock, while rasterization itself runs outside it.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_TEXT_CACHE_SIZE,
+        atlas_alphabet: Optional[str] = DEFAULT_ATLAS_ALPHABET,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        self.max_entries = max_entries
+        self.atlas_alphabet = atlas_alphabet
+        self._entries: "OrderedDict[Tuple[str, int, str, str], RenderedText]" = OrderedDict()
+        self._atlases: Dict[Tuple[str, int], "GlyphAtlas"] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.atlas_renders = 0
+
+    def _get_atlas(self, font_path: str, font_size: int) -> Optional["GlyphAtlas"]:
+        if not self.atlas_alphabet:
+            return None
+        key = (font_path, font_size)
+        with self._lock:
+            atlas = self._atlases.get(key)
+        if atlas is None:
+            from .atlas import GlyphAtlas  # Deferred: atlas builds on this module
+
+            atlas = GlyphAtlas(font_path, font_size, self.atlas_alphabet)
+            with self._lock:
+                atlas = self._atlases.setdefault(key, atlas)
+        return atlas
+
+    def get(self, font_path: str, font_size: int, color: str, text: str) -> RenderedText:
+        key = (font_path, font_size, color, text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        atlas = self._get_atlas(font_path, font_size)
+        from_atlas = atlas is not None and atlas.composable(text)
+        if from_atlas:
+            entry = atlas.render(text, color)
+        else:
+            entry = rasterize_text(load_font(font_path, font_size), text, color)
+        with self._lock:
+            self.atlas_renders += from_atlas
+            # Another thread may have rendered the same string meanwhile; keep one.
+            entry = self._entries.setdefault(key, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def measure(self, font_path: str, font_size: int, color: str, text: str) -> Tuple[int, int]:
+        return self.get(font_path, font_size, color, text).size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.atlas_renders = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+
+_default_text_cache = TextRasterCache()
+register_cache("text", _default_text_cache)
+
+
+def get_default_text_cache() -> TextRasterCache:
+    """Return the process-wide text cache shared by renderers."""
+    return _default_text_cache
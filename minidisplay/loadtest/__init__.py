@@ -0,0 +1,12 @@
+"""
+Offline load and latency testing for the data-source fetch path.
+
+`IdelisStubServer` stands in for the Idelis API; `run_load` drives
+`IdelisTransportSource` or `DataSourceManager` against it. Run
+`python -m minidisplay.loadtest --help` for the command-line driver.
+"""
+
+from .driver import LoadReport, run_load
+from .stub import IdelisStubServer, StubBehaviour
+
+__all__ = ["IdelisStubServer", "LoadReport", "StubBehaviour", "run_load"]
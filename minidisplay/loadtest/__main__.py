@@ -0,0 +1,93 @@
+"""Command-line load driver: `python -m minidisplay.loadtest`."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from typing import List, Optional
+
+from .driver import run_load
+from .stub import IdelisStubServer, StubBehaviour
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Load-test the Idelis fetch path against a local stub.")
+    stub = parser.add_argument_group("stub server")
+    stub.add_argument("--latency", type=float, default=0.0, help="Seconds before each response.")
+    stub.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra seconds per response.")
+    stub.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with HTTP 500.")
+    stub.add_argument("--slow-body", type=float, default=0.0, help="Seconds over which each body is streamed.")
+    stub.add_argument("--passages", type=int, default=None, help="Passages per answer (default: request's 'next').")
+    stub.add_argument("--padding", type=int, default=0, help="Extra payload bytes per answer.")
+    stub.add_argument("--gzip", action="store_true", help="Compress bodies for clients that accept gzip.")
+    stub.add_argument("--etag", action="store_true", help="Send ETags and answer matching If-None-Match with 304.")
+    stub.add_argument("--port", type=int, default=0, help="Port for the stub (default: any free port).")
+    stub.add_argument("--seed", type=int, default=None, help="Seed for jitter and error injection.")
+    stub.add_argument(
+        "--stub-only",
+        action="store_true",
+        help="Only run the stub, e.g. to point a device's api_url at it.",
+    )
+
+    load = parser.add_argument_group("load driver")
+    load.add_argument("--url", default=None, help="Target this endpoint instead of starting a stub.")
+    load.add_argument("--mode", choices=("source", "manager"), default="source", help="Code path to drive.")
+    load.add_argument("--requests", type=int, default=500, help="Total fetches.")
+    load.add_argument("--concurrency", type=int, default=32, help="Concurrent worker threads.")
+    load.add_argument("--timeout", type=float, default=2.0, help="api_timeout for each request, in seconds.")
+    load.add_argument("--retries", type=int, default=0, help="api_retries for each fetch.")
+    load.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    behaviour = StubBehaviour(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        slow_body=args.slow_body,
+        passages=args.passages,
+        padding=args.padding,
+        gzip=args.gzip,
+        etag=args.etag,
+    )
+
+    if args.stub_only:
+        stub = IdelisStubServer(port=args.port, behaviour=behaviour, seed=args.seed)
+        print(f"Idelis stub listening on {stub.url}")
+        try:
+            stub.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    def drive(url: str) -> dict:
+        report = run_load(
+            url,
+            mode=args.mode,
+            requests=args.requests,
+            concurrency=args.concurrency,
+            timeout=args.timeout,
+            retries=args.retries,
+        )
+        return report.summary()
+
+    if args.url:
+        summary = drive(args.url)
+    else:
+        with IdelisStubServer(port=args.port, behaviour=behaviour, seed=args.seed) as stub:
+            summary = drive(stub.url)
+            summary["stub"] = stub.stats()
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        width = max(len(key) for key in summary)
+        for key, value in summary.items():
+            print(f"{key:<{width}}  {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
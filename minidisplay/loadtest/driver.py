@@ -0,0 +1,158 @@
+"""
+Concurrent load driver for the Idelis fetch path.
+
+Runs `IdelisTransportSource.fetch_data` (one source per worker thread) or
+`DataSourceManager.fetch_from_source` (one manager shared by every worker)
+against an endpoint, usually `IdelisStubServer`, and reports throughput,
+latency percentiles, failures, timeouts, retries and bytes saved by
+conditional or compressed requests.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Literal, Optional
+
+from ..datasources import DataSourceManager, IdelisTransportSource
+from ..utils.eventlog import LOGGER_NAME, get_logger
+
+LoadMode = Literal["source", "manager"]
+
+
+@dataclass
+class LoadReport:
+    """Outcome of a load run; latencies are in milliseconds."""
+
+    mode: str
+    requests: int
+    concurrency: int
+    ok: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    retries: int = 0
+    bytes_saved: int = 0
+    elapsed_s: float = 0.0
+    latencies_ms: List[float] = field(default_factory=list, repr=False)
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.elapsed_s if self.elapsed_s else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def summary(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop("latencies_ms")
+        data.update(
+            {
+                "throughput_rps": round(self.throughput, 1),
+                "p50_ms": round(self.percentile(0.50), 2),
+                "p95_ms": round(self.percentile(0.95), 2),
+                "p99_ms": round(self.percentile(0.99), 2),
+                "mean_ms": round(statistics.fmean(self.latencies_ms), 2) if self.latencies_ms else 0.0,
+                "elapsed_s": round(self.elapsed_s, 3),
+            }
+        )
+        return data
+
+
+def _config(url: str, timeout: Optional[float], retries: int) -> Dict[str, Any]:
+    return {
+        # The stub accepts any token; a dummy one spares setting the environment.
+        "api_token": os.getenv("IDELIS_API_TOKEN") or "loadtest",
+        "api_url": url,
+        "api_code": "LOADTEST",
+        "api_ligne": "0",
+        "api_next": 3,
+        "api_timeout": timeout,
+        "api_retries": retries,
+    }
+
+
+def run_load(
+    url: str,
+    *,
+    mode: LoadMode = "source",
+    requests: int = 200,
+    concurrency: int = 16,
+    timeout: Optional[float] = 2.0,
+    retries: int = 0,
+    quiet: bool = True,
+) -> LoadReport:
+    """
+    Issue ``requests`` fetches from ``concurrency`` threads and report the results.
+
+    A dummy API token is passed to the sources when ``IDELIS_API_TOKEN`` is
+    not set. With ``quiet``, the per-failure warnings logged by the data
+    sources are dropped for the duration of the run. In manager mode every worker shares one source, so timeouts
+    are classified from its last error and are approximate.
+    """
+    config = _config(url, timeout, retries)
+    report = LoadReport(mode=mode, requests=requests, concurrency=concurrency)
+    lock = threading.Lock()
+    local = threading.local()
+
+    manager: Optional[DataSourceManager] = None
+    sources: List[IdelisTransportSource] = []
+    if mode == "manager":
+        manager = DataSourceManager(config)
+        manager.initialize_data_sources()
+        sources.append(manager.get_data_source("idelis"))
+
+    def source_for_thread() -> IdelisTransportSource:
+        source = getattr(local, "source", None)
+        if source is None:
+            source = local.source = IdelisTransportSource(config)
+            with lock:
+                sources.append(source)
+        return source
+
+    def one_fetch(_: int) -> None:
+        started = time.perf_counter()
+        if manager is not None:
+            data = manager.fetch_from_source("idelis")
+            error = manager.get_data_source("idelis").last_error
+        else:
+            source = source_for_thread()
+            data = source.fetch_data()
+            error = source.last_error
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        with lock:
+            report.latencies_ms.append(elapsed_ms)
+            if data:
+                report.ok += 1
+            else:
+                report.failures += 1
+                if error and "timed out" in error.lower():
+                    report.timeouts += 1
+
+    # Only this package's events are dropped: redirecting stdout instead
+    # would also hide whatever other threads print during the run.
+    package_logger = get_logger(LOGGER_NAME)
+    previous_level = package_logger.level
+    if quiet:
+        package_logger.setLevel(logging.CRITICAL)
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="loadtest") as pool:
+            list(pool.map(one_fetch, range(requests)))
+        report.elapsed_s = time.perf_counter() - started
+    finally:
+        package_logger.setLevel(previous_level)
+
+    report.retries = sum(source.retries for source in sources)
+    report.bytes_saved = sum(source.bytes_saved for source in sources)
+    return report
+
+
+__all__ = ["LoadReport", "run_load"]
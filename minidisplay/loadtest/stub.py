@@ -0,0 +1,201 @@
+"""
+Local stand-in for the Idelis GetStopMonitoring endpoint.
+
+Answers like the real API (a ``passages`` list of ``arrivee`` times) with
+configurable latency, jitter, error rate, payload size and a slow,
+chunked body, so the fetch path can be exercised offline and under load.
+Any non-empty ``X-Auth-Token`` is accepted.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import gzip
+import hashlib
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+SLOW_BODY_CHUNKS = 10
+
+
+@dataclass
+class StubBehaviour:
+    """How the stub answers; see `IdelisStubServer`."""
+
+    latency: float = 0.0  # Seconds before the response starts
+    jitter: float = 0.0  # Up to this many extra seconds, uniformly drawn
+    error_rate: float = 0.0  # Share of requests answered with HTTP 500
+    slow_body: float = 0.0  # Seconds over which the body is trickled out
+    passages: Optional[int] = None  # Passages per answer; defaults to the request's "next"
+    padding: int = 0  # Extra bytes of filler in each payload
+    gzip: bool = False  # Compress bodies when the client accepts gzip
+    etag: bool = False  # Send an ETag and answer a matching If-None-Match with 304
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    server: "_StubHTTPServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+        pass  # Load tests would otherwise flood stderr
+
+    def do_GET(self) -> None:  # noqa: N802 - stdlib naming
+        self._answer()
+
+    do_POST = do_GET
+
+    def _answer(self) -> None:
+        stub = self.server.stub
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        try:
+            request = json.loads(body) if body else {}
+        except ValueError:
+            request = {}
+
+        behaviour = stub.behaviour
+        delay = behaviour.latency + (stub.random() * behaviour.jitter if behaviour.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+
+        if not self.headers.get("X-Auth-Token"):
+            stub.count("unauthorized")
+            self._send(401, {"error": "missing token"})
+            return
+        if behaviour.error_rate and stub.random() < behaviour.error_rate:
+            stub.count("errors")
+            self._send(500, {"error": "injected failure"})
+            return
+
+        data = json.dumps(stub.payload(request)).encode("utf-8")
+        headers: Dict[str, str] = {}
+        if behaviour.etag:
+            headers["ETag"] = '"%s"' % hashlib.blake2b(data, digest_size=8).hexdigest()
+            if self.headers.get("If-None-Match") == headers["ETag"]:
+                stub.count("not_modified")
+                self.send_response(304)
+                self.send_header("ETag", headers["ETag"])
+                self.end_headers()
+                return
+        if behaviour.gzip and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            data = gzip.compress(data, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+
+        stub.count("ok")
+        self._send(200, data, slow=behaviour.slow_body, headers=headers)
+
+    def _send(
+        self,
+        status: int,
+        payload: Any,
+        slow: float = 0.0,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            if not slow:
+                self.wfile.write(data)
+                return
+            step = max(1, -(-len(data) // SLOW_BODY_CHUNKS))
+            for start in range(0, len(data), step):
+                self.wfile.write(data[start:start + step])
+                self.wfile.flush()
+                time.sleep(slow / SLOW_BODY_CHUNKS)
+        except (BrokenPipeError, ConnectionResetError):
+            self.server.stub.count("client_aborts")
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+    stub: "IdelisStubServer"
+
+
+class IdelisStubServer:
+    """
+    Threaded HTTP server imitating GetStopMonitoring.
+
+    Use as a context manager, or call `start`/`stop`; `url` is the endpoint
+    to put in ``api_url``. Counters (``ok``, ``not_modified``, ``errors``,
+    ``unauthorized``, ``client_aborts``) are available through `stats`.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        behaviour: Optional[StubBehaviour] = None,
+        seed: Optional[int] = None,
+    ):
+        self.behaviour = behaviour or StubBehaviour()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {"ok": 0, "not_modified": 0, "errors": 0, "unauthorized": 0, "client_aborts": 0}
+        self._httpd = _StubHTTPServer((host, port), _StubHandler)
+        self._httpd.stub = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/GetStopMonitoring"
+
+    def random(self) -> float:
+        with self._lock:
+            return self._random.random()
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def payload(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        count = self.behaviour.passages
+        if count is None:
+            count = int(request.get("next", 3))
+        now = dt.datetime.now()
+        passages = [
+            {"arrivee": (now + dt.timedelta(minutes=7 * (index + 1))).strftime("%H:%M")}
+            for index in range(count)
+        ]
+        payload: Dict[str, Any] = {"passages": passages}
+        if self.behaviour.padding:
+            payload["padding"] = "x" * self.behaviour.padding
+        return payload
+
+    def start(self) -> "IdelisStubServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="idelis-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "IdelisStubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+__all__ = ["IdelisStubServer", "StubBehaviour"]
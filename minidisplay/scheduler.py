@@ -0,0 +1,140 @@
+"""Periodic frame scheduling shared by long-running devices and live previews."""
+
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from PIL import Image
+
+from .datasources import DataSourceManager
+from .display.devices import Display, MemoryDisplay
+from .display.models import DISPLAY_HEIGHT, DISPLAY_WIDTH
+from .simulator import SimulationCache, SimulationResult, run_simulation
+
+DEFAULT_SCHEDULE_INTERVAL = 30.0
+
+
+@dataclass
+class ScheduledFrame:
+    """A rendered frame that differs from the one before it."""
+
+    sequence: int
+    digest: str
+    data: bytes  # Encoded PNG
+    image: Image.Image
+    result: SimulationResult
+
+
+class FrameScheduler:
+    """
+    Render frames on a cadence and publish only the ones that changed.
+
+    A single scheduler owns one `DataSourceManager`, so its cache (honouring
+    each source's refresh interval) is shared by every consumer: the
+    physical panel and any number of live-preview viewers trigger at most
+    one fetch and one render per tick.
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        *,
+        use_mock: bool = False,
+        interval: float = DEFAULT_SCHEDULE_INTERVAL,
+        resolution: tuple[int, int] = (DISPLAY_WIDTH, DISPLAY_HEIGHT),
+        display_device: Optional[Display] = None,
+        icon_path: Optional[Path] = None,
+        clock: Optional[Callable[[], dt.datetime]] = None,
+        simulation_cache: Optional[SimulationCache] = None,
+    ):
+        self.config = config
+        self.use_mock = use_mock
+        self.interval = interval
+        self.resolution = display_device.resolution if display_device else resolution
+        self.display_device = display_device
+        self.icon_path = icon_path
+        self._clock = clock
+        self.manager = DataSourceManager(config)
+        self.manager.initialize_data_sources()
+        self.simulation_cache = simulation_cache or SimulationCache()
+        self._latest: Optional[ScheduledFrame] = None
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    @property
+    def latest(self) -> Optional[ScheduledFrame]:
+        return self._latest
+
+    def tick(self) -> Optional[ScheduledFrame]:
+        """Render the current frame; return it only if it changed."""
+        with self._lock:
+            # Cleared first, so data pushed during the render schedules another tick.
+            self.manager.dirty.clear()
+            device = MemoryDisplay(resolution=self.resolution)
+            result = run_simulation(
+                self.config,
+                use_mock=self.use_mock,
+                mock_time=self._clock() if self._clock else None,
+                display_device=device,
+                icon_path=self.icon_path,
+                manage_lock_file=False,
+                render_standby_always=True,
+                manager=self.manager,
+                cache=self.simulation_cache,
+            )
+            if device.frame is None or device.image is None:
+                return None
+
+            digest = hashlib.sha256(device.frame).hexdigest()[:32]
+            changed = self._latest is None or self._latest.digest != digest
+            if changed:
+                self._sequence += 1
+                frame = ScheduledFrame(
+                    sequence=self._sequence,
+                    digest=digest,
+                    data=device.frame,
+                    image=device.image,
+                    result=result,
+                )
+                self._latest = frame
+
+        if self.display_device is None:
+            return frame if changed else None
+        if not changed:
+            # Devices may be holding back a deferred frame (see RefreshGovernor).
+            self.display_device.poll()
+            return None
+        self.display_device.set_frame_info(result.frame_info)
+        self.display_device.set_image(frame.image)
+        self.display_device.show()
+        return frame
+
+    def wait_for_change(self, timeout: Optional[float] = None) -> bool:
+        """Wait up to ``timeout`` (default ``interval``) seconds for pushed data; True if some arrived."""
+        return self.manager.dirty.wait(self.interval if timeout is None else timeout)
+
+    def stop(self) -> None:
+        """Make `run` return after the current tick."""
+        self._stopped.set()
+        self.manager.dirty.set()
+
+    def run(self, stop_event: Optional[threading.Event] = None) -> None:
+        """
+        Tick every ``interval`` seconds, and as soon as pushed data changes.
+
+        Runs until `stop` is called or ``stop_event`` is set; the latter is
+        only noticed at the next tick.
+        """
+        stop_event = stop_event or self._stopped
+        while not stop_event.is_set() and not self._stopped.is_set():
+            self.tick()
+            self.wait_for_change()
+
+
+__all__ = ["DEFAULT_SCHEDULE_INTERVAL", "FrameScheduler", "ScheduledFrame"]
@@ -0,0 +1,231 @@
+"""
+Prewarmed render server and its thin client.
+
+`python -m minidisplay --serve` keeps data-source managers, display devices
+(including a detected Inky panel), font and icon caches warm and listens on
+a Unix socket. A plain `python -m minidisplay` then only parses its
+arguments, sends them to the server and prints the reply, falling back to
+rendering in-process when no server is listening, so existing cron and
+systemd units keep working unchanged.
+
+Protocol: the client sends one JSON object per line and reads one JSON
+object back.
+
+    {"command": "render", "options": {...}}  -> {"ok": true, "mode": ..., "output": ..., "events": [...]}
+    {"command": "ping"}                      -> {"ok": true}
+
+Failures are answered as ``{"ok": false, "error": "..."}``.
+
+Only the standard library is imported at module level: the client path
+must not pay for Pillow, requests or the display stack.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+SOCKET_ENV = "MINIDISPLAY_SOCKET"
+DEFAULT_CLIENT_TIMEOUT = 60.0
+
+
+def get_default_socket_path() -> Path:
+    """Return the server socket path, honouring ``MINIDISPLAY_SOCKET``."""
+    configured = os.getenv(SOCKET_ENV)
+    if configured:
+        return Path(configured)
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return Path(runtime_dir) / f"minidisplay-{os.getuid()}.sock"
+
+
+def send_request(
+    request: Dict[str, Any],
+    socket_path: Optional[Path] = None,
+    timeout: float = DEFAULT_CLIENT_TIMEOUT,
+) -> Optional[Dict[str, Any]]:
+    """
+    Send one request to the render server and return its reply.
+
+    Returns None only when no server is listening (no socket, or the
+    connection is refused), so callers can fall back to rendering
+    in-process. Any later failure, such as a timeout while the server is
+    still rendering, raises `OSError` or `ValueError`.
+    """
+    path = socket_path or get_default_socket_path()
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(timeout)
+    try:
+        try:
+            client.connect(str(path))
+        except (FileNotFoundError, ConnectionRefusedError):
+            return None
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with client.makefile("rb") as reader:
+            line = reader.readline()
+    finally:
+        client.close()
+    if not line:
+        raise ConnectionError(f"Render server on {path} closed the connection without replying")
+    return json.loads(line)
+
+
+class RenderServer:
+    """
+    Render requests against long-lived managers and devices.
+
+    Managers are kept per configuration file (and rebuilt when it is
+    modified) and devices per output settings, so every request after the first skips imports, configuration
+    parsing, Inky detection and font loading. Requests are served one at a
+    time: there is a single panel to draw on.
+    """
+
+    def __init__(self, socket_path: Optional[Path] = None, reprobe_display: bool = False):
+        from .simulator import SimulationCache, prewarm
+
+        self.socket_path = Path(socket_path or get_default_socket_path())
+        self.reprobe_display = reprobe_display
+        self.simulation_cache = SimulationCache()
+        self._managers: Dict[Optional[str], Tuple[Optional[int], Dict[str, Any], Any]] = {}
+        self._devices: Dict[Tuple, Any] = {}
+        self._server: Optional[socketserver.UnixStreamServer] = None
+        self.requests_served = 0
+        prewarm()
+
+    def _manager(self, config_path: Optional[str]):
+        mtime = os.stat(config_path).st_mtime_ns if config_path else None
+        entry = self._managers.get(config_path)
+        if entry is None or entry[0] != mtime:
+            from .config import load_config
+            from .datasources import DataSourceManager
+
+            config = load_config(Path(config_path) if config_path else None)
+            manager = DataSourceManager(config)
+            manager.initialize_data_sources()
+            # Replaces the manager built from an older version of the file.
+            entry = self._managers[config_path] = (mtime, config, manager)
+        return entry[1], entry[2]
+
+    def _device(self, options: Dict[str, Any]):
+        key = (
+            options.get("output"),
+            options.get("output_format"),
+            options.get("compress_level"),
+            options.get("framebuffer"),
+        )
+        device = self._devices.get(key)
+        if device is None:
+            from .cli import _select_display_device
+            from .display.encoders import DEFAULT_FRAME_FORMAT
+
+            device = self._devices[key] = _select_display_device(
+                Path(options["output"]) if options.get("output") else None,
+                options.get("output_format") or DEFAULT_FRAME_FORMAT,
+                options.get("compress_level"),
+                Path(options["framebuffer"]) if options.get("framebuffer") else None,
+                reprobe=self.reprobe_display,
+            )
+        return device
+
+    def render(self, options: Dict[str, Any]) -> Dict[str, Any]:
+        from .cli import _saved_message
+        from .simulator import parse_mock_time, run_simulation
+        from .utils.eventlog import EventLog, get_event_log
+        from .utils.metrics import get_metrics_registry
+
+        started = time.perf_counter()
+        config, manager = self._manager(options.get("config"))
+        device = self._device(options)
+        output = io.StringIO()
+        # The client prints what this render printed and logged, on its own stdout and stderr.
+        with contextlib.redirect_stdout(output), get_event_log().capture() as events:
+            result = run_simulation(
+                config,
+                use_mock=bool(options.get("use_mock")),
+                mock_time=parse_mock_time(options.get("mock_time")),
+                display_device=device,
+                manage_lock_file=True,
+                render_standby_always=False,
+                manager=manager,
+                cache=self.simulation_cache,
+            )
+        reply: Dict[str, Any] = {
+            "ok": True,
+            "mode": result.mode,
+            "arrival_text": result.arrival_text,
+            "image_path": str(result.image_path) if result.image_path else None,
+            "from_cache": result.from_cache,
+            "timings": result.timings,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 3),
+            "output": output.getvalue() + _saved_message(result),
+            "events": [EventLog.format_event(event) for event in events],
+        }
+        if options.get("stats"):
+            reply["stats"] = get_metrics_registry().render_prometheus()
+        return reply
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer one decoded request; never raises."""
+        command = request.get("command")
+        try:
+            if command == "ping":
+                return {"ok": True, "pid": os.getpid(), "requests_served": self.requests_served}
+            if command == "render":
+                reply = self.render(request.get("options") or {})
+                self.requests_served += 1
+                return reply
+            return {"ok": False, "error": f"Unknown command: {command!r}"}
+        except Exception as exc:  # Reported to the client; the server keeps running
+            return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+
+    def serve_forever(self) -> None:
+        """Listen on the socket until `shutdown` is called or the process is interrupted."""
+        if self.socket_path.exists():
+            try:
+                listening = send_request({"command": "ping"}, self.socket_path, timeout=1.0) is not None
+            except socket.timeout:
+                listening = True  # Accepted the connection, but busy rendering
+            except (OSError, ValueError) as exc:
+                raise RuntimeError(f"Cannot tell whether {self.socket_path} is in use: {exc}") from exc
+            if listening:
+                raise RuntimeError(f"A render server is already listening on {self.socket_path}")
+            self.socket_path.unlink()  # Left behind by a server that died
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                line = self.rfile.readline()
+                if not line:
+                    return
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    reply = {"ok": False, "error": "Malformed request"}
+                else:
+                    reply = server.handle_request(request)
+                self.wfile.write(json.dumps(reply, default=str).encode("utf-8") + b"\n")
+
+        self._server = socketserver.UnixStreamServer(str(self.socket_path), Handler)
+        print(f"Render server listening on {self.socket_path}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            with contextlib.suppress(FileNotFoundError):
+                self.socket_path.unlink()
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+
+
+__all__ = ["RenderServer", "SOCKET_ENV", "get_default_socket_path", "send_request"]
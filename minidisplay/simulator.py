@@ -3,14 +3,23 @@
 from __future__ import annotations
 
 import datetime as dt
-from dataclasses import dataclass
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Any, Dict, Literal, Optional
+from typing import Any, Dict, Literal, Optional, Tuple
+
+from nob import Nob
+from PIL import Image
 
 from .config import load_config
 from .datasources import DataSourceManager
 from .display import DisplayElement, DisplayLayout, DisplayRenderer
+from .display.models import FrameInfo
 from .display.devices import Display, VirtualDisplay
+from .utils.metrics import FRAMES_SKIPPED_TOTAL
+from .utils.tracing import get_tracer
 
 
 @dataclass
@@ -21,6 +30,93 @@ class SimulationResult:
     mode: Literal["active", "standby"]
     arrival_text: Optional[str]
     generated_at: dt.datetime
+    timings: Dict[str, float] = field(default_factory=dict)  # Stage name -> milliseconds
+    frame: Optional[Image.Image] = None  # Rendered image, None when nothing was rendered
+    frame_info: Optional[FrameInfo] = None
+    from_cache: bool = False
+
+
+# Bump whenever layouts or rendering change what a given input looks like.
+LAYOUT_VERSION = 1
+DEFAULT_SIMULATION_CACHE_SIZE = 32
+# Configuration keys that influence the rendered frame.
+_FINGERPRINT_CONFIG_KEYS = (
+    "display_start_hour",
+    "display_start_minute",
+    "display_end_hour",
+    "display_end_minute",
+)
+
+
+def _payload_hash(payload: Optional[Any]) -> str:
+    raw = payload[:] if isinstance(payload, Nob) else payload
+    encoded = json.dumps(raw, sort_keys=True, default=repr).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def simulation_fingerprint(
+    config: Dict[str, Any],
+    now: dt.datetime,
+    payload: Optional[Any],
+    *,
+    resolution: Tuple[int, int],
+    icon_path: Path,
+) -> Tuple:
+    """Return the memoization key of a frame's observable inputs."""
+    return (
+        LAYOUT_VERSION,
+        tuple(config.get(key) for key in _FINGERPRINT_CONFIG_KEYS),
+        now.replace(second=0, microsecond=0),  # The display shows minute granularity
+        _payload_hash(payload),
+        tuple(resolution),
+        str(icon_path),
+    )
+
+
+class SimulationCache:
+    """
+    Bounded LRU of rendered `SimulationResult`s keyed by `simulation_fingerprint`.
+
+    A hit skips layout and rasterization entirely; the cached frame is pushed
+    to the display as-is.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_SIMULATION_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, SimulationResult]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple) -> Optional[SimulationResult]:
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key: Tuple, result: SimulationResult) -> None:
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hit_ratio, 3),
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
 
 
 def get_default_icon_path() -> Path:
@@ -104,11 +200,50 @@ def run_simulation(
     icon_path: Optional[Path] = None,
     manage_lock_file: bool = True,
     render_standby_always: bool = False,
+    manager: Optional[DataSourceManager] = None,
+    cache: Optional[SimulationCache] = None,
 ) -> SimulationResult:
-    """Render a frame based on current configuration."""
-
-    manager = DataSourceManager(config)
-    manager.initialize_data_sources()
+    """
+    Render a frame based on current configuration.
+
+    Pass a long-lived, initialized ``manager`` to share its data-source cache
+    across frames; by default a fresh manager fetches live data every call.
+    With a ``cache``, frames whose inputs match a previous render (same
+    config subset, minute and payload) are reused instead of re-rendered.
+    """
+
+    with get_tracer().collect() as timings:
+        result = _run_simulation(
+            config,
+            use_mock=use_mock,
+            mock_time=mock_time,
+            display_device=display_device,
+            icon_path=icon_path,
+            manage_lock_file=manage_lock_file,
+            render_standby_always=render_standby_always,
+            manager=manager,
+            cache=cache,
+        )
+    result.timings = dict(timings)
+    return result
+
+
+def _run_simulation(
+    config: Dict[str, Any],
+    *,
+    use_mock: bool,
+    mock_time: Optional[dt.datetime],
+    display_device: Optional[Display],
+    icon_path: Optional[Path],
+    manage_lock_file: bool,
+    render_standby_always: bool,
+    manager: Optional[DataSourceManager],
+    cache: Optional[SimulationCache],
+) -> SimulationResult:
+    shared_manager = manager is not None
+    if manager is None:
+        manager = DataSourceManager(config)
+        manager.initialize_data_sources()
 
     now = mock_time or dt.datetime.now()
     start_time = now.replace(
@@ -127,34 +262,102 @@ def run_simulation(
     if display_device is None:
         display_device = VirtualDisplay()
 
-    layouts = _build_layouts(icon_path or get_default_icon_path())
+    icon_path = icon_path or get_default_icon_path()
+    layouts = _build_layouts(icon_path)
     renderer = DisplayRenderer(display_device)
 
     if use_mock:
         arrival_data = manager.get_mock_data("idelis", now)
+    elif shared_manager:
+        arrival_data = manager.fetch_cached("idelis")
     else:
         arrival_data = manager.fetch_primary_data()
 
     lock_file = Path(config["lock_file"])
+    image_path = getattr(display_device, "output_path", None)
+
+    cached: Optional[SimulationResult] = None
+    cache_key: Optional[Tuple] = None
+    if cache is not None:
+        cache_key = simulation_fingerprint(
+            config,
+            now,
+            arrival_data,
+            resolution=display_device.resolution,
+            icon_path=icon_path,
+        )
+        cached = cache.get(cache_key)
 
     if start_time <= now < end_time:
         if manage_lock_file and lock_file.exists():
             lock_file.unlink()
 
+        if cached is not None:
+            return _replay_cached(cached, display_device, image_path, now)
+
         arrival_text = _get_arrival_time(arrival_data)
         renderer.render(layouts[0], {"arrival_time": arrival_text})
+        frame: Optional[Image.Image] = renderer.image
         mode: Literal["active", "standby"] = "active"
     else:
+        needs_lock = manage_lock_file and not lock_file.exists()
+        should_render = render_standby_always or needs_lock
+        if should_render and cached is not None:
+            replayed = _replay_cached(cached, display_device, image_path, now)
+            if needs_lock:
+                lock_file.touch()
+            return replayed
+
         arrival_text = None
-        should_render = render_standby_always or (manage_lock_file and not lock_file.exists())
+        frame = None
         if should_render:
             renderer.render(layouts[1], {})
+            frame = renderer.image
+        else:
+            FRAMES_SKIPPED_TOTAL.inc(reason="standby_unchanged")
         mode = "standby"
-        if manage_lock_file and not lock_file.exists():
+        # Only once the standby frame is on screen: a failed render is retried next run.
+        if needs_lock:
             lock_file.touch()
 
-    image_path = getattr(display_device, "output_path", None)
-    return SimulationResult(image_path=image_path, mode=mode, arrival_text=arrival_text, generated_at=now)
+    result = SimulationResult(
+        image_path=image_path,
+        mode=mode,
+        arrival_text=arrival_text,
+        generated_at=now,
+        frame=frame,
+        frame_info=renderer.frame_info,
+    )
+    if cache is not None and cache_key is not None and frame is not None:
+        cache.put(cache_key, result)
+    return result
+
+
+def _replay_cached(
+    cached: SimulationResult,
+    display_device: Display,
+    image_path: Optional[Path],
+    now: dt.datetime,
+) -> SimulationResult:
+    if cached.frame is not None:
+        display_device.set_frame_info(cached.frame_info)
+        display_device.set_image(cached.frame)
+        display_device.show()
+    return replace(cached, image_path=image_path, generated_at=now, from_cache=True)
+
+
+def prewarm(icon_path: Optional[Path] = None) -> None:
+    """Preload fonts, glyph atlases and the bus icon so the next frame renders warm."""
+    from font_hanken_grotesk import HankenGroteskBold
+
+    from .display.renderer import _load_and_resize_icon
+    from .display.text import get_default_text_cache
+
+    cache = get_default_text_cache()
+    for font_size in (24, 32):
+        for text in ("00:00", "Aucun passage", "A l'arrêt", "En veille"):
+            cache.get(HankenGroteskBold, font_size, "black", text)
+    _load_and_resize_icon(str(icon_path or get_default_icon_path()), 40)
 
 
 def simulate_with_defaults(
@@ -166,10 +369,12 @@ def simulate_with_defaults(
     icon_path: Optional[Path] = None,
     manage_lock_file: bool = True,
     render_standby_always: bool = False,
+    config_overrides: Optional[Dict[str, Any]] = None,
 ) -> SimulationResult:
-    """Load configuration and run a simulation."""
+    """Load configuration, apply ``config_overrides`` and run a simulation."""
 
     config = load_config(config_path)
+    config.update(config_overrides or {})
     return run_simulation(
         config,
         use_mock=use_mock,
@@ -182,9 +387,13 @@ def simulate_with_defaults(
 
 
 __all__ = [
+    "LAYOUT_VERSION",
+    "SimulationCache",
     "SimulationResult",
+    "simulation_fingerprint",
     "get_default_icon_path",
     "parse_mock_time",
+    "prewarm",
     "run_simulation",
     "simulate_with_defaults",
 ]
@@ -1,5 +1,23 @@
 """Utility helpers for MiniDisplay."""
 
-from .paths import get_project_root, get_generated_output_dir
+from .paths import get_cache_dir, get_project_root, get_generated_output_dir, write_atomic
+from .metrics import MetricsRegistry, get_metrics_registry
+from .eventlog import EventLog, configure_logging, get_event_log, get_logger
+from .tracing import Tracer, configure_tracing, get_tracer, trace_span
 
-__all__ = ["get_project_root", "get_generated_output_dir"]
+__all__ = [
+    "get_project_root",
+    "get_generated_output_dir",
+    "get_cache_dir",
+    "write_atomic",
+    "MetricsRegistry",
+    "get_metrics_registry",
+    "EventLog",
+    "configure_logging",
+    "get_event_log",
+    "get_logger",
+    "Tracer",
+    "configure_tracing",
+    "get_tracer",
+    "trace_span",
+]
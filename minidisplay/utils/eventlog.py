@@ -0,0 +1,304 @@
+"""
+Buffered structured event log for the ``minidisplay`` loggers.
+
+Code logs through the standard library (``get_logger(__name__)``), but the
+``minidisplay`` logger has a single handler, `EventLog`, that never blocks
+the caller:
+
+- each record becomes an event dict (time, level, logger, message and any
+  ``extra=`` fields) appended to a bounded ring buffer, which the web
+  simulator shows at ``/events``;
+- a background thread drains a bounded queue and writes events to stderr
+  (and, when configured, to a JSONL file) in batches, with one flush per
+  batch; when the queue is full new events are dropped and counted instead
+  of waiting;
+- repeats of the same warning or error from the same logger within the
+  sampling window are counted rather than written, and the next event that
+  gets through reports how many were suppressed as ``repeated``.
+
+Configure it with `MINIDISPLAY_LOG_LEVEL` (default INFO) and
+`MINIDISPLAY_LOG_FILE`, or programmatically through `configure_logging`.
+`EventLog.capture()` gathers the events logged by the current thread, so a
+render server can hand a client the messages its request produced.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, TextIO, Tuple, Union
+
+from .metrics import LOG_EVENTS_TOTAL
+
+LOGGER_NAME = "minidisplay"
+DEFAULT_EVENT_CAPACITY = 512
+DEFAULT_QUEUE_SIZE = 1024
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_FLUSH_INTERVAL = 0.5
+DEFAULT_SAMPLE_WINDOW = 60.0
+
+# Attributes every LogRecord has; anything else came from ``extra=``.
+_RECORD_ATTRIBUTES = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime"}
+_MAX_SAMPLE_KEYS = 1024
+
+SampleKey = Tuple[str, int, str]
+
+_UNCHANGED: Any = object()
+
+
+class EventLog(logging.Handler):
+    """Logging handler keeping recent events in memory and writing them in batches."""
+
+    def __init__(
+        self,
+        level: int = logging.INFO,
+        capacity: int = DEFAULT_EVENT_CAPACITY,
+        stream: Optional[TextIO] = None,
+        jsonl_path: Optional[Union[str, Path]] = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        sample_level: int = logging.WARNING,
+        sample_window: float = DEFAULT_SAMPLE_WINDOW,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(level)
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self._stream = stream
+        self._jsonl_path = Path(jsonl_path) if jsonl_path else None
+        self._jsonl_handle: Optional[TextIO] = None
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sample_level = sample_level
+        self.sample_window = sample_window
+        self._clock = clock
+        self._samples: Dict[SampleKey, List[float]] = {}
+        self._sample_lock = threading.Lock()
+        self._local = threading.local()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self.dropped = 0
+        self.suppressed = 0
+
+    # -- Producer side: called on the logging thread, must not block ---------
+
+    def _sample(self, record: logging.LogRecord, message: str) -> Optional[int]:
+        """Return how many repeats were suppressed before ``record``, or None to suppress it."""
+        if record.levelno < self.sample_level or self.sample_window <= 0:
+            return 0
+        key = (record.name, record.levelno, message)
+        now = self._clock()
+        with self._sample_lock:
+            state = self._samples.get(key)
+            if state is not None and now - state[0] < self.sample_window:
+                state[1] += 1
+                self.suppressed += 1
+                return None
+            if state is None and len(self._samples) >= _MAX_SAMPLE_KEYS:
+                self._samples.clear()
+            self._samples[key] = [now, 0]
+            return int(state[1]) if state is not None else 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            message = record.getMessage()
+        except Exception:  # A bad format string must not break the caller
+            self.handleError(record)
+            return
+        level = record.levelname.lower()
+        repeated = self._sample(record, message)
+        if repeated is None:
+            LOG_EVENTS_TOTAL.inc(level=level, outcome="sampled")
+            return
+        event: Dict[str, Any] = {
+            "time": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": message,
+        }
+        fields = {key: value for key, value in record.__dict__.items() if key not in _RECORD_ATTRIBUTES}
+        if fields:
+            event["fields"] = fields
+        if repeated:
+            event["repeated"] = repeated
+        if record.exc_info and record.exc_info[1] is not None:
+            event["error"] = f"{type(record.exc_info[1]).__name__}: {record.exc_info[1]}"
+
+        self._events.append(event)
+        for events in getattr(self._local, "collectors", ()):
+            events.append(event)
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            LOG_EVENTS_TOTAL.inc(level=level, outcome="dropped")
+            return
+        LOG_EVENTS_TOTAL.inc(level=level, outcome="logged")
+        if self._writer is None:
+            self._start_writer()
+
+    @contextmanager
+    def capture(self) -> Iterator[List[Dict[str, Any]]]:
+        """Collect the events logged by the current thread in this block."""
+        collectors = getattr(self._local, "collectors", None)
+        if collectors is None:
+            collectors = self._local.collectors = []
+        events: List[Dict[str, Any]] = []
+        collectors.append(events)
+        try:
+            yield events
+        finally:
+            collectors.remove(events)
+
+    def events(self, min_level: int = logging.NOTSET, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return buffered events at or above ``min_level``, oldest first."""
+        selected = [event for event in list(self._events) if logging.getLevelName(event["level"]) >= min_level]
+        return selected[-limit:] if limit else selected
+
+    def clear(self) -> None:
+        self._events.clear()
+        with self._sample_lock:
+            self._samples.clear()
+
+    def set_capacity(self, capacity: int) -> None:
+        self._events = deque(self._events, maxlen=capacity)
+
+    def set_jsonl_path(self, jsonl_path: Optional[Union[str, Path]]) -> None:
+        self.flush()
+        with self._writer_lock:
+            if self._jsonl_handle is not None:
+                self._jsonl_handle.close()
+                self._jsonl_handle = None
+            self._jsonl_path = Path(jsonl_path) if jsonl_path else None
+
+    # -- Consumer side: the writer thread ------------------------------------
+
+    def _start_writer(self) -> None:
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._drain, name="minidisplay-eventlog", daemon=True)
+                self._writer.start()
+
+    def _drain(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write([item for item in batch if isinstance(item, dict)])
+            for item in batch:
+                if isinstance(item, threading.Event):  # flush() marker
+                    item.set()
+            # Let a burst accumulate into the next batch instead of one write per event.
+            time.sleep(self.flush_interval)
+
+    def _write(self, events: List[Dict[str, Any]]) -> None:
+        if not events:
+            return
+        stream = self._stream or sys.stderr
+        try:
+            stream.write("".join(self.format_event(event) + "\n" for event in events))
+            stream.flush()
+        except (OSError, ValueError):
+            pass  # A closed stderr must not kill the writer
+        if self._jsonl_path is None:
+            return
+        with self._writer_lock:
+            try:
+                if self._jsonl_handle is None:
+                    self._jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+                    self._jsonl_handle = self._jsonl_path.open("a", encoding="utf-8")
+                self._jsonl_handle.write("".join(json.dumps(event, default=str) + "\n" for event in events))
+                self._jsonl_handle.flush()
+            except OSError:
+                # Logging must never break the render loop; drop the file sink.
+                self._jsonl_path = None
+
+    @staticmethod
+    def format_event(event: Dict[str, Any]) -> str:
+        """Render ``event`` as the one-line text written to stderr."""
+        line = f"{event['level']} {event['logger']}: {event['message']}"
+        if event.get("error"):
+            line += f" ({event['error']})"
+        if event.get("repeated"):
+            line += f" [repeated {event['repeated']} more times]"
+        return line
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wait until every event queued so far has been written."""
+        if self._writer is None:
+            return
+        marker = threading.Event()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return
+        marker.wait(timeout + self.flush_interval)
+
+
+_event_log = EventLog(
+    level=logging.getLevelName(os.getenv("MINIDISPLAY_LOG_LEVEL", "INFO").upper()),
+    jsonl_path=os.getenv("MINIDISPLAY_LOG_FILE") or None,
+)
+
+
+def _install(handler: EventLog) -> None:
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.addHandler(handler)
+    logger.setLevel(handler.level)
+    logger.propagate = False
+
+
+_install(_event_log)
+
+
+def get_event_log() -> EventLog:
+    """Return the process-wide event log behind the ``minidisplay`` loggers."""
+    return _event_log
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Return the logger for module ``name``, under the ``minidisplay`` hierarchy."""
+    if name != LOGGER_NAME and not name.startswith(LOGGER_NAME + "."):
+        name = f"{LOGGER_NAME}.{name}"
+    return logging.getLogger(name)
+
+
+def configure_logging(
+    level: Optional[Union[int, str]] = None,
+    jsonl_path: Optional[Union[str, Path]] = _UNCHANGED,
+    capacity: Optional[int] = None,
+) -> EventLog:
+    """
+    Set the level, JSONL file and ring-buffer size of the process-wide event log.
+
+    Settings left out are kept; pass ``jsonl_path=None`` to stop writing a
+    JSONL file.
+    """
+    if level is not None:
+        _event_log.setLevel(level)
+        logging.getLogger(LOGGER_NAME).setLevel(level)
+    if jsonl_path is not _UNCHANGED:
+        _event_log.set_jsonl_path(jsonl_path)
+    if capacity is not None:
+        _event_log.set_capacity(capacity)
+    return _event_log
+
+
+__all__ = [
+    "EventLog",
+    "configure_logging",
+    "get_event_log",
+    "get_logger",
+]
@@ -0,0 +1,372 @@
+"""
+In-process metrics: counters and latency histograms for the display pipeline.
+
+Metrics are recorded by the data-source manager, the renderer and the display
+devices, and exported in the Prometheus text exposition format by the web
+app (`/metrics`) and the CLI (`--stats`). Recording takes one uncontended
+lock per metric, so it stays cheap on the render path; values that already
+live elsewhere (e.g. text-cache hit counts) are read through callbacks at
+export time and cost nothing while rendering.
+
+Work done in other processes (the web simulator's render pool) is brought
+back as a `MetricsRegistry.diff` of two snapshots taken around it, and
+added to this process's metrics with `MetricsRegistry.merge`.
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+LabelValues = Tuple[str, ...]
+# Per metric name, per label set: a counter value, or a histogram's bucket
+# counts followed by its sum and count.
+MetricsSnapshot = Dict[str, Dict[LabelValues, Union[float, List[float]]]]
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> Iterable[str]:  # pragma: no cover - abstract
+        return []
+
+    def reset(self) -> None:  # pragma: no cover - abstract
+        pass
+
+    def snapshot(self) -> Dict[LabelValues, Union[float, List[float]]]:
+        return {}
+
+    def merge(self, delta: Dict[LabelValues, Union[float, List[float]]]) -> None:
+        pass
+
+
+class Counter(_Metric):
+    """Monotonic counter, optionally split by labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> Iterable[str]:
+        for key, value in sorted(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def snapshot(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def merge(self, delta: Dict[LabelValues, float]) -> None:
+        with self._lock:
+            for key, amount in delta.items():
+                self._values[key] = self._values.get(key, 0) + amount
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram (seconds by convention)."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    def _samples(self) -> Iterable[str]:
+        for key, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {count}"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def snapshot(self) -> Dict[LabelValues, List[float]]:
+        with self._lock:
+            return {key: [*counts, total, count] for key, (counts, total, count) in self._series.items()}
+
+    def merge(self, delta: Dict[LabelValues, List[float]]) -> None:
+        with self._lock:
+            for key, values in delta.items():
+                series = self._series.get(key)
+                if series is None:
+                    series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                counts = series[0]
+                for index, amount in enumerate(values[: len(counts)]):
+                    counts[index] += int(amount)
+                series[1] += values[-2]
+                series[2] += int(values[-1])
+
+
+class CallbackMetric(_Metric):
+    """Metric whose samples are read from a callback at export time."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        kind: str,
+        callback: Callable[[], Dict[LabelValues, float]],
+        labelnames: Sequence[str] = (),
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+        self._callback = callback
+        # Merged from other processes, on top of what the callback reads here.
+        self._merged: Dict[LabelValues, float] = {}
+
+    def snapshot(self) -> Dict[LabelValues, float]:
+        values = dict(self._callback())
+        with self._lock:
+            for key, amount in self._merged.items():
+                values[key] = values.get(key, 0) + amount
+        return values
+
+    def _samples(self) -> Iterable[str]:
+        for key, value in sorted(self.snapshot().items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._merged.clear()
+
+    def merge(self, delta: Dict[LabelValues, float]) -> None:
+        with self._lock:
+            for key, amount in delta.items():
+                self._merged[key] = self._merged.get(key, 0) + amount
+
+
+class MetricsRegistry:
+    """Collection of metrics exported together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))  # type: ignore[return-value]
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render_prometheus(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        for metric in self._metrics.values():
+            metric.reset()
+
+    def snapshot(self) -> MetricsSnapshot:
+        """Return the current value of every metric, as plain picklable data."""
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    @staticmethod
+    def diff(before: MetricsSnapshot, after: MetricsSnapshot) -> MetricsSnapshot:
+        """Return what was recorded between two snapshots, omitting unchanged series."""
+        delta: MetricsSnapshot = {}
+        for name, series in after.items():
+            previous = before.get(name, {})
+            changes = {}
+            for key, value in series.items():
+                old = previous.get(key)
+                if isinstance(value, list):
+                    change = [new - prior for new, prior in zip(value, old or [0] * len(value))]
+                    if any(change):
+                        changes[key] = change
+                elif value != (old or 0):
+                    changes[key] = value - (old or 0)
+            if changes:
+                delta[name] = changes
+        return delta
+
+    def merge(self, delta: MetricsSnapshot) -> None:
+        """Add a `diff` recorded elsewhere, typically in a worker process."""
+        for name, changes in delta.items():
+            metric = self._metrics.get(name)
+            if metric is not None:
+                metric.merge(changes)
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Return the process-wide registry used by the pipeline."""
+    return _registry
+
+
+FETCH_TOTAL = _registry.counter(
+    "minidisplay_fetch_total",
+    "Data-source fetch attempts by outcome (success, failure, unavailable, cache_hit, circuit_open, deferred, fallback, pushed, push_unchanged).",
+    ("source", "outcome"),
+)
+FETCH_SECONDS = _registry.histogram(
+    "minidisplay_fetch_seconds",
+    "Data-source fetch latency in seconds.",
+    ("source",),
+)
+RENDER_SECONDS = _registry.histogram(
+    "minidisplay_render_seconds",
+    "Time spent laying out and rasterizing a frame, in seconds.",
+    ("layout",),
+)
+DISPLAY_REFRESH_TOTAL = _registry.counter(
+    "minidisplay_display_refresh_total",
+    "Frames pushed to a display device.",
+    ("device",),
+)
+FRAMES_SKIPPED_TOTAL = _registry.counter(
+    "minidisplay_frames_skipped_total",
+    "Frames not rendered or not pushed, by reason.",
+    ("reason",),
+)
+FETCH_BYTES_SAVED_TOTAL = _registry.counter(
+    "minidisplay_fetch_bytes_saved_total",
+    "Response bytes not downloaded or not parsed, by reason (not_modified, unchanged, compression).",
+    ("source", "reason"),
+)
+
+GOVERNOR_DECISIONS_TOTAL = _registry.counter(
+    "minidisplay_governor_decisions_total",
+    "Refresh-governor decisions (pushed, major, cosmetic, duplicate, deferred, coalesced).",
+    ("decision",),
+)
+
+LOG_EVENTS_TOTAL = _registry.counter(
+    "minidisplay_log_events_total",
+    "Log events by level and outcome (logged, sampled, dropped).",
+    ("level", "outcome"),
+)
+
+
+_cache_sources: Dict[str, object] = {}
+
+
+def register_cache(name: str, cache: object) -> None:
+    """Export the ``hits``/``misses`` attributes of ``cache`` under ``name``."""
+    _cache_sources[name] = cache
+
+
+def _cache_counts(attribute: str) -> Callable[[], Dict[LabelValues, float]]:
+    def read() -> Dict[LabelValues, float]:
+        return {(name,): getattr(cache, attribute) for name, cache in _cache_sources.items()}
+
+    return read
+
+
+_registry.register(
+    CallbackMetric(
+        "minidisplay_cache_hits_total",
+        "Cache lookups served from cache.",
+        "counter",
+        _cache_counts("hits"),
+        ("cache",),
+    )
+)
+_registry.register(
+    CallbackMetric(
+        "minidisplay_cache_misses_total",
+        "Cache lookups that had to compute the value.",
+        "counter",
+        _cache_counts("misses"),
+        ("cache",),
+    )
+)
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import os
+import tempfile
 from pathlib import Path
 
 
@@ -30,3 +32,59 @@ def get_generated_output_dir() -> Path:
     output_dir = get_project_root() / "resources" / "generated"
     output_dir.mkdir(parents=True, exist_ok=True)
     return output_dir
+
+
+def get_cache_dir() -> Path:
+    """
+    Per-user cache directory for small runtime state (``$XDG_CACHE_HOME/minidisplay``).
+
+    The directory is not created here; writers create it when they need it.
+    """
+    base = os.getenv("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "minidisplay"
+
+
+def _read_umask() -> int:
+    # The umask can only be read by setting it; do it once, before any thread starts.
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+_UMASK = _read_umask()
+
+
+def replacement_mode(path: Path) -> int:
+    """
+    Mode for a file about to be renamed over ``path``.
+
+    That is the mode of the file it replaces, or the usual mode for a new
+    file under the process umask (``mkstemp`` alone would make it
+    owner-only).
+    """
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except OSError:
+        return 0o666 & ~_UMASK
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """
+    Write ``data`` to ``path`` through a temporary file and an atomic rename.
+
+    The file gets its `replacement_mode`.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    mode = replacement_mode(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            os.fchmod(handle.fileno(), mode)
+            handle.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
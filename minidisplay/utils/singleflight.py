@@ -0,0 +1,84 @@
+"""Single-flight execution with short-lived result memoization for asyncio code."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+DEFAULT_SINGLEFLIGHT_TTL = 10.0
+DEFAULT_SINGLEFLIGHT_ENTRIES = 128
+
+
+class SingleFlight:
+    """
+    Share one in-flight call per key and remember its result for ``ttl`` seconds.
+
+    Concurrent callers with the same key await the same task instead of
+    starting their own; once it succeeds, callers within ``ttl`` get the
+    memoized result immediately. Failures are shared with the callers that
+    were waiting but never memoized.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_SINGLEFLIGHT_TTL,
+        max_entries: int = DEFAULT_SINGLEFLIGHT_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._results: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0  # Served from the memo
+        self.shared = 0  # Joined an in-flight call
+        self.misses = 0  # Started a new call
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    def _fresh(self, key: Hashable):
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= self._clock():
+            del self._results[key]
+            return None
+        return entry
+
+    def has(self, key: Hashable) -> bool:
+        """Return True when ``key`` would be served without a new call."""
+        return key in self._inflight or self._fresh(key) is not None
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._fresh(key)
+        if entry is not None:
+            self._results.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.shared += 1
+            return await asyncio.shield(future)
+
+        self.misses += 1
+        future = asyncio.ensure_future(func())
+        self._inflight[key] = future
+        future.add_done_callback(lambda done: self._complete(key, done))
+        return await asyncio.shield(future)
+
+    def _complete(self, key: Hashable, future: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if future.cancelled() or future.exception() is not None or self.ttl <= 0:
+            return
+        self._results[key] = (self._clock() + self.ttl, future.result())
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    def clear(self) -> None:
+        self._results.clear()
@@ -0,0 +1,178 @@
+"""
+Lightweight stage tracing for the fetch → parse → layout → render → push pipeline.
+
+Tracing is off by default and a disabled span is a shared no-op context
+manager, so instrumented code pays one attribute check per span. Enable it
+with `MINIDISPLAY_TRACE=1` (and optionally `MINIDISPLAY_TRACE_FILE=path.jsonl`)
+or programmatically through `configure_tracing`. Finished spans go to a
+bounded in-memory ring buffer and, when configured, to a JSONL file.
+
+`Tracer.collect()` gathers the spans finished by the current thread into a
+per-frame `{name: milliseconds}` mapping; it measures even while global
+tracing is disabled so every frame can report its own stage timings.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Union
+
+DEFAULT_TRACE_CAPACITY = 512
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("_tracer", "name", "attrs", "_start", "_wall")
+
+    def __init__(self, tracer: "Tracer", name: str, attrs: Dict[str, Any]):
+        self._tracer = tracer
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self) -> "_Span":
+        self._wall = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        duration_ms = (time.perf_counter() - self._start) * 1000.0
+        self._tracer._finish(self, duration_ms, failed=exc_type is not None)
+
+
+class Tracer:
+    """Records named, timed spans into a ring buffer and an optional JSONL file."""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        capacity: int = DEFAULT_TRACE_CAPACITY,
+        jsonl_path: Optional[Union[str, Path]] = None,
+    ):
+        self.enabled = enabled
+        self._records: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self._local = threading.local()
+        self._file_lock = threading.Lock()
+        self._jsonl_path: Optional[Path] = None
+        self._jsonl_handle = None
+        self.set_jsonl_path(jsonl_path)
+
+    def set_jsonl_path(self, jsonl_path: Optional[Union[str, Path]]) -> None:
+        with self._file_lock:
+            if self._jsonl_handle is not None:
+                self._jsonl_handle.close()
+                self._jsonl_handle = None
+            self._jsonl_path = Path(jsonl_path) if jsonl_path else None
+
+    def set_capacity(self, capacity: int) -> None:
+        self._records = deque(self._records, maxlen=capacity)
+
+    def _collectors(self) -> List[Dict[str, float]]:
+        collectors = getattr(self._local, "collectors", None)
+        if collectors is None:
+            collectors = self._local.collectors = []
+        return collectors
+
+    def span(self, name: str, **attrs: Any):
+        """Return a context manager timing the enclosed block as ``name``."""
+        if not self.enabled and not getattr(self._local, "collectors", None):
+            return _NOOP_SPAN
+        return _Span(self, name, attrs)
+
+    @contextmanager
+    def collect(self) -> Iterator[Dict[str, float]]:
+        """Collect ``{span name: total ms}`` for spans finished in this block."""
+        timings: Dict[str, float] = {}
+        collectors = self._collectors()
+        collectors.append(timings)
+        try:
+            yield timings
+        finally:
+            collectors.remove(timings)
+
+    def _finish(self, span: _Span, duration_ms: float, failed: bool) -> None:
+        for timings in getattr(self._local, "collectors", ()):
+            timings[span.name] = round(timings.get(span.name, 0.0) + duration_ms, 3)
+
+        if not self.enabled:
+            return
+
+        record: Dict[str, Any] = {
+            "name": span.name,
+            "start": span._wall,
+            "duration_ms": round(duration_ms, 3),
+            "thread": threading.current_thread().name,
+        }
+        if span.attrs:
+            record["attrs"] = span.attrs
+        if failed:
+            record["error"] = True
+        self._records.append(record)
+
+        if self._jsonl_path is not None:
+            self._write_jsonl(record)
+
+    def _write_jsonl(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, default=str)
+        with self._file_lock:
+            try:
+                if self._jsonl_handle is None:
+                    self._jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+                    self._jsonl_handle = self._jsonl_path.open("a", encoding="utf-8", buffering=1)
+                self._jsonl_handle.write(line + "\n")
+            except OSError:
+                # Tracing must never break the render loop; drop the file sink.
+                self._jsonl_path = None
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Return the spans currently held in the ring buffer, oldest first."""
+        return list(self._records)
+
+    def clear(self) -> None:
+        self._records.clear()
+
+
+_tracer = Tracer(
+    enabled=os.getenv("MINIDISPLAY_TRACE", "").lower() in ("1", "true", "yes"),
+    jsonl_path=os.getenv("MINIDISPLAY_TRACE_FILE") or None,
+)
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer used by the pipeline."""
+    return _tracer
+
+
+def configure_tracing(
+    enabled: bool = True,
+    jsonl_path: Optional[Union[str, Path]] = None,
+    capacity: Optional[int] = None,
+) -> Tracer:
+    """Enable or disable the process-wide tracer and set its sinks."""
+    _tracer.enabled = enabled
+    _tracer.set_jsonl_path(jsonl_path)
+    if capacity is not None:
+        _tracer.set_capacity(capacity)
+    return _tracer
+
+
+def trace_span(name: str, **attrs: Any):
+    """Shorthand for ``get_tracer().span(name, **attrs)``."""
+    return _tracer.span(name, **attrs)
@@ -2,24 +2,37 @@
 
 from __future__ import annotations
 
-import time
+import asyncio
+import hmac
+import json
+import logging
+import os
+from contextlib import asynccontextmanager
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from fastapi import FastAPI, Form, Request
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Form, Header, HTTPException, Request
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
 from ..config import load_config
-from ..display.devices import VirtualDisplay
-from ..simulator import (
-    SimulationResult,
-    get_default_icon_path,
-    parse_mock_time,
-    run_simulation,
-)
+from ..datasources import start_push_listeners
+from ..scheduler import DEFAULT_SCHEDULE_INTERVAL, FrameScheduler
+from ..simulator import SimulationCache, get_default_icon_path
+from ..utils.eventlog import get_event_log
+from ..utils.metrics import get_metrics_registry, register_cache
 from ..utils.paths import get_generated_output_dir
+from .executor import (
+    RenderExecutor,
+    RenderQueueFull,
+    normalize_preview_params,
+    preview_key,
+    render_preview,
+)
+from .frames import FrameStore
+from .live import LivePreview
 
 
 APP_ROOT = Path(__file__).resolve().parent
@@ -29,7 +42,46 @@ generated_dir = get_generated_output_dir()
 assets_dir = APP_ROOT / "static"
 assets_dir.mkdir(parents=True, exist_ok=True)
 
-app = FastAPI(title="MiniDisplay Simulator", version="0.1.0")
+FRAME_CACHE_CONTROL = "public, max-age=31536000, immutable"
+PUSH_TOKEN_ENV = "MINIDISPLAY_PUSH_TOKEN"
+STREAM_KEEPALIVE_SECONDS = 15.0
+EVENTS_LIMIT = 100
+frame_store = FrameStore()
+register_cache("frames", frame_store)
+
+
+live_simulation_cache = SimulationCache()
+register_cache("simulation", live_simulation_cache)
+
+
+def _build_live_scheduler() -> FrameScheduler:
+    return FrameScheduler(
+        load_config(),
+        use_mock=os.getenv("MINIDISPLAY_LIVE_USE_MOCK", "false").lower() == "true",
+        interval=float(os.getenv("MINIDISPLAY_LIVE_INTERVAL", DEFAULT_SCHEDULE_INTERVAL)),
+        icon_path=get_default_icon_path(),
+        simulation_cache=live_simulation_cache,
+    )
+
+
+live_preview = LivePreview(_build_live_scheduler, frame_store)
+render_executor = RenderExecutor()
+register_cache("simulate", render_executor.flight)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    push_listeners = []
+    if load_config().get("push_sources"):
+        push_listeners = start_push_listeners(live_preview.scheduler.manager)
+    yield
+    for listener in push_listeners:
+        listener.stop()
+    live_preview.close()
+    render_executor.shutdown()
+
+
+app = FastAPI(title="MiniDisplay Simulator", version="0.1.0", lifespan=lifespan)
 
 app.mount(
     "/static/generated",
@@ -47,48 +99,14 @@ app.mount(
 async def index(request: Request):
     config = load_config()
     return TEMPLATES.TemplateResponse(
+        request,
         "index.html",
         {
-            "request": request,
             "config": config,
         },
     )
 
 
-def _simulate(
-    *,
-    mock_time: Optional[str],
-    use_mock: bool,
-    start_hour: int,
-    start_minute: int,
-    end_hour: int,
-    end_minute: int,
-) -> SimulationResult:
-    config = load_config()
-    config.update(
-        {
-            "display_start_hour": start_hour,
-            "display_start_minute": start_minute,
-            "display_end_hour": end_hour,
-            "display_end_minute": end_minute,
-        }
-    )
-
-    mock_dt = parse_mock_time(mock_time)
-    output_path = generated_dir / "web-preview.png"
-    device = VirtualDisplay(filename=output_path)
-
-    return run_simulation(
-        config,
-        use_mock=use_mock,
-        mock_time=mock_dt,
-        display_device=device,
-        icon_path=get_default_icon_path(),
-        manage_lock_file=False,
-        render_standby_always=True,
-    )
-
-
 @app.post("/simulate", response_class=HTMLResponse)
 async def simulate(
     request: Request,
@@ -99,27 +117,132 @@ async def simulate(
     end_hour: int = Form(...),
     end_minute: int = Form(...),
 ):
-    result = _simulate(
-        mock_time=mock_time or None,
-        use_mock=bool(use_mock),
-        start_hour=start_hour,
-        start_minute=start_minute,
-        end_hour=end_hour,
-        end_minute=end_minute,
-    )
+    try:
+        params = normalize_preview_params(
+            mock_time=mock_time,
+            use_mock=use_mock,
+            start_hour=start_hour,
+            start_minute=start_minute,
+            end_hour=end_hour,
+            end_minute=end_minute,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    try:
+        result, frame = await render_executor.submit(preview_key(params), render_preview, **params)
+    except RenderQueueFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Renderer busy, try again shortly.",
+            headers={"Retry-After": "1"},
+        )
 
     image_url = None
-    if result.image_path:
-        image_url = f"/static/generated/{result.image_path.name}?t={int(time.time())}"
+    if frame:
+        image_url = f"/frames/{frame_store.put(frame)}.png"
 
     return TEMPLATES.TemplateResponse(
+        request,
         "partials/preview.html",
         {
-            "request": request,
             "result": result,
             "image_url": image_url,
         },
     )
 
 
+@app.get("/frames/{digest}.png")
+async def frame(digest: str, if_none_match: Optional[str] = Header(default=None)):
+    etag = f'"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": FRAME_CACHE_CONTROL}
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    data = frame_store.get(digest)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Frame expired or unknown.")
+    return Response(content=data, media_type="image/png", headers=headers)
+
+
+@app.get("/stream")
+async def stream():
+    """Server-sent events announcing each new live frame."""
+    queue = live_preview.subscribe()
+
+    async def events():
+        try:
+            while True:
+                try:
+                    frame = await asyncio.wait_for(queue.get(), STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                payload = {
+                    "url": live_preview.frame_url(frame),
+                    "mode": frame.result.mode,
+                    "arrival_text": frame.result.arrival_text,
+                    "generated_at": frame.result.generated_at.isoformat(timespec="seconds"),
+                }
+                yield f"event: frame\nid: {frame.sequence}\ndata: {json.dumps(payload)}\n\n"
+        finally:
+            live_preview.unsubscribe(queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/push/{source}")
+async def push(source: str, request: Request, x_push_token: Optional[str] = Header(default=None)):
+    """Feed a push data source; the live frame re-renders only if the data changed."""
+    token = os.getenv(PUSH_TOKEN_ENV)
+    if not token:
+        raise HTTPException(
+            status_code=403,
+            detail=f"Pushing over HTTP is disabled; set {PUSH_TOKEN_ENV} to enable it.",
+        )
+    if not hmac.compare_digest(x_push_token or "", token):
+        raise HTTPException(status_code=401, detail="Invalid push token.")
+    try:
+        payload = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be JSON.")
+    try:
+        changed = live_preview.scheduler.manager.push(source, payload)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=f"Cannot push to {source!r}: {exc.args[0]}.")
+    return {"changed": changed}
+
+
+@app.get("/events")
+async def events(request: Request, level: str = "INFO", limit: int = EVENTS_LIMIT):
+    """Recent log events, newest first: an HTML partial, or JSON when asked for."""
+    min_level = logging.getLevelName(level.upper())
+    if not isinstance(min_level, int):
+        raise HTTPException(status_code=400, detail=f"Unknown log level {level!r}.")
+    recent = get_event_log().events(min_level, limit=max(1, min(limit, EVENTS_LIMIT)))[::-1]
+    if "application/json" in request.headers.get("accept", ""):
+        return {"events": recent}
+    return TEMPLATES.TemplateResponse(
+        request,
+        "partials/events.html",
+        {"events": recent, "format_time": _format_event_time},
+    )
+
+
+def _format_event_time(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp).strftime("%H:%M:%S")
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(
+        get_metrics_registry().render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 __all__ = ["app"]
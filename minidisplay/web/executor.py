@@ -0,0 +1,202 @@
+"""Process-pool render offloading for the web simulator."""
+
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import multiprocessing
+import os
+from dataclasses import replace
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from ..config import load_config
+from ..display.devices import MemoryDisplay
+from ..simulator import (
+    SimulationCache,
+    SimulationResult,
+    get_default_icon_path,
+    parse_mock_time,
+    prewarm,
+    run_simulation,
+)
+from ..utils.metrics import get_metrics_registry, register_cache
+from ..utils.singleflight import DEFAULT_SINGLEFLIGHT_TTL, SingleFlight
+
+DEFAULT_MAX_PENDING = 8
+
+# Per-process: each worker keeps the frames it rendered for identical inputs.
+_worker_simulation_cache = SimulationCache()
+register_cache("render_simulation", _worker_simulation_cache)
+
+
+class RenderQueueFull(RuntimeError):
+    """Raised when the render queue cannot accept more work."""
+
+
+def _default_worker_count() -> int:
+    configured = os.getenv("MINIDISPLAY_RENDER_WORKERS")
+    if configured:
+        return max(1, int(configured))
+    return max(1, min(2, os.cpu_count() or 1))
+
+
+def warm_worker() -> None:
+    """Preload fonts, glyph atlases and the bus icon in a fresh worker."""
+    prewarm()
+
+
+def normalize_preview_params(
+    *,
+    mock_time: Optional[str],
+    use_mock: Any,
+    start_hour: Any,
+    start_minute: Any,
+    end_hour: Any,
+    end_minute: Any,
+) -> Dict[str, Any]:
+    """
+    Canonicalize preview parameters so equivalent requests compare equal.
+
+    Raises:
+        ValueError: If ``mock_time`` is not a valid HH:MM time.
+    """
+    parsed = parse_mock_time(mock_time or None)
+    return {
+        "mock_time": parsed.strftime("%H:%M") if parsed else None,
+        "use_mock": bool(use_mock),
+        "start_hour": int(start_hour),
+        "start_minute": int(start_minute),
+        "end_hour": int(end_hour),
+        "end_minute": int(end_minute),
+    }
+
+
+def preview_key(params: Dict[str, Any], now: Optional[dt.datetime] = None) -> Tuple:
+    """
+    Return the single-flight key of normalized preview parameters.
+
+    Without a mock time the frame depends on the wall clock, so the current
+    minute becomes part of the key.
+    """
+    key = tuple(sorted(params.items()))
+    if params["mock_time"] is None:
+        key += (("minute", (now or dt.datetime.now()).strftime("%Y-%m-%dT%H:%M")),)
+    return key
+
+
+def render_preview(
+    *,
+    mock_time: Optional[str],
+    use_mock: bool,
+    start_hour: int,
+    start_minute: int,
+    end_hour: int,
+    end_minute: int,
+) -> Tuple[SimulationResult, Optional[bytes]]:
+    """Render one preview frame; runs inside a worker process."""
+    config = load_config()
+    config.update(
+        {
+            "display_start_hour": start_hour,
+            "display_start_minute": start_minute,
+            "display_end_hour": end_hour,
+            "display_end_minute": end_minute,
+        }
+    )
+
+    device = MemoryDisplay()
+    result = run_simulation(
+        config,
+        use_mock=use_mock,
+        mock_time=parse_mock_time(mock_time),
+        display_device=device,
+        icon_path=get_default_icon_path(),
+        manage_lock_file=False,
+        render_standby_always=True,
+        cache=_worker_simulation_cache,
+    )
+    # The encoded frame is all the caller needs; don't pickle the image back.
+    return replace(result, frame=None), device.frame
+
+
+class RenderExecutor:
+    """
+    Bounded pool of warm render workers with request coalescing.
+
+    Submissions go through a `SingleFlight`: identical keys share the
+    in-flight render and reuse its result for ``result_ttl`` seconds. Once
+    ``max_pending`` distinct renders are queued or running, further new
+    submissions raise `RenderQueueFull` so the web layer can answer 503
+    instead of piling up work.
+
+    Metrics recorded by a worker process while running a submission (fetch
+    and render latency, cache hits...) are sent back with its result and
+    merged into this process's registry, so `/metrics` includes them.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        pool_factory: Optional[Callable[[int], Executor]] = None,
+        result_ttl: float = DEFAULT_SINGLEFLIGHT_TTL,
+    ):
+        self.max_workers = max_workers or _default_worker_count()
+        self.max_pending = max_pending
+        self._pool_factory = pool_factory or self._process_pool
+        self._pool: Optional[Executor] = None
+        self.flight = SingleFlight(ttl=result_ttl)
+        self.rejected = 0
+
+    @staticmethod
+    def _process_pool(max_workers: int) -> Executor:
+        # Spawned workers avoid inheriting the server's threads and sockets.
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=warm_worker,
+        )
+
+    @property
+    def pending(self) -> int:
+        return self.flight.inflight
+
+    @property
+    def coalesced(self) -> int:
+        return self.flight.shared
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            self._pool = self._pool_factory(self.max_workers)
+        return self._pool
+
+    async def submit(self, key: Hashable, func: Callable[..., Any], **kwargs: Any) -> Any:
+        """Run ``func(**kwargs)`` in the pool, sharing in-flight work for ``key``."""
+        if not self.flight.has(key) and self.flight.inflight >= self.max_pending:
+            self.rejected += 1
+            raise RenderQueueFull(f"{self.max_pending} renders already pending.")
+
+        loop = asyncio.get_running_loop()
+        return await self.flight.do(key, lambda: self._run(loop, func, kwargs))
+
+    async def _run(self, loop: asyncio.AbstractEventLoop, func: Callable[..., Any], kwargs: Dict[str, Any]) -> Any:
+        result, metrics = await loop.run_in_executor(self._get_pool(), _call, func, kwargs, os.getpid())
+        if metrics:
+            get_metrics_registry().merge(metrics)
+        return result
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+def _call(func: Callable[..., Any], kwargs: Dict[str, Any], caller_pid: int) -> Tuple[Any, Dict[str, Any]]:
+    """Run ``func`` and, in a worker process, return the metrics it recorded."""
+    if os.getpid() == caller_pid:  # Thread pool: metrics are already shared
+        return func(**kwargs), {}
+    registry = get_metrics_registry()
+    before = registry.snapshot()
+    result = func(**kwargs)
+    return result, registry.diff(before, registry.snapshot())
@@ -0,0 +1,71 @@
+"""In-memory, content-addressed store for rendered preview frames."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+DEFAULT_MAX_FRAME_BYTES = 4 * 1024 * 1024
+DEFAULT_MAX_FRAMES = 64
+
+
+class FrameStore:
+    """
+    Bounded LRU store of encoded frames keyed by the hash of their content.
+
+    Identical frames share one entry and one URL, so browsers can cache them
+    forever; concurrent users never overwrite each other's preview.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_FRAME_BYTES, max_frames: int = DEFAULT_MAX_FRAMES):
+        self.max_bytes = max_bytes
+        self.max_frames = max_frames
+        self._frames: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()[:32]
+
+    def put(self, data: bytes) -> str:
+        """Store ``data`` and return its content digest."""
+        key = self.digest(data)
+        with self._lock:
+            if key in self._frames:
+                self._frames.move_to_end(key)
+                return key
+            self._frames[key] = data
+            self._size += len(data)
+            # The newest frame always stays, even alone over ``max_bytes``:
+            # its URL is about to be handed out.
+            while len(self._frames) > 1 and (
+                self._size > self.max_bytes or len(self._frames) > self.max_frames
+            ):
+                _, evicted = self._frames.popitem(last=False)
+                self._size -= len(evicted)
+        return key
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._frames.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._frames.move_to_end(key)
+            self.hits += 1
+            return data
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._frames
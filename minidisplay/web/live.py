@@ -0,0 +1,95 @@
+"""Shared live-preview broadcasting for the web simulator."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import Callable, Optional, Set
+
+from ..scheduler import FrameScheduler, ScheduledFrame
+from .frames import FrameStore
+
+
+class LivePreview:
+    """
+    Fan out frames from one `FrameScheduler` to every connected viewer.
+
+    The scheduler only ticks while at least one viewer is subscribed, and
+    each tick is shared: viewers never trigger renders or API calls of
+    their own. Every subscriber holds at most the newest unseen frame.
+    """
+
+    def __init__(self, scheduler_factory: Callable[[], FrameScheduler], frame_store: FrameStore):
+        self._scheduler_factory = scheduler_factory
+        self._scheduler: Optional[FrameScheduler] = None
+        self.frame_store = frame_store
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def scheduler(self) -> FrameScheduler:
+        if self._scheduler is None:
+            self._scheduler = self._scheduler_factory()
+        return self._scheduler
+
+    @property
+    def viewer_count(self) -> int:
+        return len(self._subscribers)
+
+    def frame_url(self, frame: ScheduledFrame) -> str:
+        return f"/frames/{self.frame_store.put(frame.data)}.png"
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        latest = self.scheduler.latest
+        if latest is not None:
+            queue.put_nowait(latest)
+        self._subscribers.add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def close(self) -> None:
+        """Stop the tick loop, e.g. at shutdown."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._scheduler is not None:
+            self._scheduler.stop()
+
+    def _publish(self, frame: ScheduledFrame) -> None:
+        self.frame_store.put(frame.data)
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()  # Drop the superseded frame
+            queue.put_nowait(frame)
+
+    async def _run(self) -> None:
+        scheduler = self.scheduler
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+
+        def wake() -> None:  # Called on the pushing thread
+            loop.call_soon_threadsafe(changed.set)
+
+        # Waiting on the loop rather than in a worker thread, so cancelling
+        # this task (the last viewer left) leaves no thread blocked behind.
+        scheduler.manager.add_change_listener(wake)
+        try:
+            while self._subscribers:
+                changed.clear()
+                frame = await asyncio.to_thread(scheduler.tick)
+                if frame is not None:
+                    self._publish(frame)
+                # Wakes early when pushed data changes (see DataSourceManager.push).
+                if not scheduler.manager.dirty.is_set():
+                    with contextlib.suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(changed.wait(), scheduler.interval)
+        finally:
+            scheduler.manager.remove_change_listener(wake)
@@ -0,0 +1,71 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from minidisplay.datasources import health
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _breaker(clock):
+    return health.CircuitBreaker(failure_threshold=2, backoff=10, max_backoff=25, clock=clock)
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = _breaker(FakeClock())
+    breaker.record_failure(0.1)
+    breaker.record_success(0.1)
+    breaker.record_failure(0.1)
+    assert breaker.state == health.CLOSED
+
+    breaker.record_failure(0.1)
+    assert breaker.state == health.OPEN
+    assert not breaker.allow()
+    assert breaker.rejected == 1
+
+
+def test_half_open_allows_a_single_probe_and_backs_off_exponentially():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    breaker.record_failure(1.0)
+    breaker.record_failure(1.0)
+
+    clock.now = 10.0
+    assert breaker.state == health.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_failure(1.0)
+    assert breaker.snapshot()["retry_in"] == 20.0
+
+    clock.now = 30.0
+    assert breaker.allow()
+    breaker.record_failure(1.0)
+    assert breaker.snapshot()["retry_in"] == 25.0  # Capped by max_backoff
+
+    clock.now = 55.0
+    assert breaker.allow()
+    breaker.record_success(0.5)
+    assert breaker.state == health.CLOSED
+    assert breaker.allow()
+
+
+def test_health_combines_error_rate_and_latency():
+    breaker = health.CircuitBreaker(latency_target=1.0)
+    assert breaker.health == 1.0
+    breaker.record_success(1.0)
+    breaker.record_failure(1.0)
+    assert breaker.error_rate == 0.5
+    assert breaker.health == 0.25
+    assert breaker.snapshot()["samples"] == 2
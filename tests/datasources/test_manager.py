@@ -2,6 +2,7 @@
 Unit tests for the data-source abstraction layer.
 """
 
+import json
 import os
 import unittest
 from datetime import datetime
@@ -118,21 +119,63 @@ class TestIdelisTransportSource(unittest.TestCase):
         mock_data = self.source.get_mock_data(mock_time)
 
         self.assertIsNotNone(mock_data)
-        self.assertIsInstance(mock_data, MockNob)
+        self.assertIsInstance(mock_data, sys.modules["nob"].Nob)
 
-    @patch("requests.request")
-    def test_idelis_source_successful_fetch(self, mock_request):
+    @staticmethod
+    def _response(payload=None, status_code=200, headers=None):
         mock_response = Mock()
-        mock_response.json.return_value = {"passages": [{"arrivee": "14:30"}]}
+        mock_response.status_code = status_code
+        mock_response.headers = headers or {}
+        mock_response.content = json.dumps(payload).encode() if payload is not None else b""
+        mock_response.json.return_value = payload
         mock_response.raise_for_status.return_value = None
-        mock_request.return_value = mock_response
+        return mock_response
+
+    @patch("requests.request")
+    def test_idelis_source_successful_fetch(self, mock_request):
+        mock_request.return_value = self._response({"passages": [{"arrivee": "14:30"}]})
 
         with patch.dict(os.environ, {"IDELIS_API_TOKEN": "test_token"}):
             result = self.source.fetch_data()
 
         self.assertIsNotNone(result)
-        self.assertIsInstance(result, MockNob)
+        self.assertIsInstance(result, sys.modules["nob"].Nob)
         self.assertIsNone(self.source.last_error)
+        self.assertIn("gzip", mock_request.call_args.kwargs["headers"]["Accept-Encoding"])
+
+    @patch("requests.request")
+    def test_idelis_source_reuses_payload_on_not_modified(self, mock_request):
+        payload = {"passages": [{"arrivee": "14:30"}]}
+        mock_request.side_effect = [
+            self._response(payload, headers={"ETag": '"v1"', "Last-Modified": "Mon, 19 Oct 2026 07:00:00 GMT"}),
+            self._response(status_code=304),
+        ]
+
+        with patch.dict(os.environ, {"IDELIS_API_TOKEN": "test_token"}):
+            first = self.source.fetch_data()
+            second = self.source.fetch_data()
+
+        headers = mock_request.call_args.kwargs["headers"]
+        self.assertEqual(headers["If-None-Match"], '"v1"')
+        self.assertEqual(headers["If-Modified-Since"], "Mon, 19 Oct 2026 07:00:00 GMT")
+        self.assertIs(second, first)
+        self.assertEqual(self.source.not_modified, 1)
+        self.assertEqual(self.source.bytes_saved, len(json.dumps(payload)))
+
+    @patch("requests.request")
+    def test_idelis_source_skips_parse_of_identical_body(self, mock_request):
+        payload = {"passages": [{"arrivee": "14:30"}]}
+        repeated = self._response(payload)
+        mock_request.side_effect = [self._response(payload), repeated]
+
+        with patch.dict(os.environ, {"IDELIS_API_TOKEN": "test_token"}):
+            first = self.source.fetch_data()
+            second = self.source.fetch_data()
+
+        self.assertIs(second, first)
+        self.assertEqual(self.source.unchanged, 1)
+        repeated.json.assert_not_called()
+        self.assertNotIn("If-None-Match", mock_request.call_args.kwargs["headers"])
 
     def test_idelis_source_error_handling(self):
         self.source._set_error("Test error")
@@ -179,13 +222,43 @@ class TestDataSourceManager(unittest.TestCase):
             available = self.manager.get_available_sources()
             self.assertIn("idelis", available)
 
+    def test_manager_get_available_sources_builds_nothing(self):
+        self.manager.initialize_data_sources()
+
+        with patch.dict(os.environ, {"IDELIS_API_TOKEN": "test_token"}):
+            self.assertEqual(self.manager.get_available_sources(), ["idelis"])
+        with patch.dict(os.environ, {"IDELIS_API_TOKEN": ""}):
+            self.assertEqual(self.manager.get_available_sources(), [])
+        self.assertFalse(self.manager.data_sources.is_loaded("idelis"))
+
     def test_manager_get_status(self):
         self.manager.initialize_data_sources()
         with patch.dict(os.environ, {"IDELIS_API_TOKEN": "test_token"}):
+            self.assertEqual(
+                self.manager.get_status()["sources"], {"idelis": {"loaded": False, "available": True}}
+            )
+            self.manager.get_data_source("idelis")
             status = self.manager.get_status()
 
         self.assertEqual(status["total_sources"], 1)
-        self.assertIn("idelis", status["sources"])
+        self.assertTrue(status["sources"]["idelis"]["loaded"])
+        self.assertTrue(status["sources"]["idelis"]["available"])
+
+    def test_manager_breaker_skips_failing_source(self):
+        self.manager.config["breaker_failure_threshold"] = 2
+        self.manager.initialize_data_sources()
+        with patch.object(IdelisTransportSource, "is_available", return_value=True), patch.object(
+            IdelisTransportSource, "fetch_data", return_value=None
+        ) as fetch:
+            for _ in range(4):
+                self.assertIsNone(self.manager.fetch_from_source("idelis"))
+
+        self.assertEqual(fetch.call_count, 2)
+        with patch.dict(os.environ, {"IDELIS_API_TOKEN": "test_token"}):
+            breaker = self.manager.get_status()["sources"]["idelis"]["breaker"]
+        self.assertEqual(breaker["state"], "open")
+        self.assertEqual(breaker["rejected"], 2)
+        self.assertEqual(breaker["error_rate"], 1.0)
 
     def test_manager_fetch_from_source(self):
         self.manager.initialize_data_sources()
@@ -227,3 +300,31 @@ class TestDataSourceManager(unittest.TestCase):
         ):
             data = self.manager.get_mock_data("idelis", mock_time)
             self.assertIsNotNone(data)
+
+    def test_manager_fetch_cached_reuses_recent_data(self):
+        self.manager.initialize_data_sources()
+
+        with patch.object(
+            IdelisTransportSource,
+            "is_available",
+            return_value=True,
+        ), patch.object(
+            IdelisTransportSource,
+            "fetch_data",
+            return_value=MockNob({"passages": []}),
+        ) as fetch:
+            first = self.manager.fetch_cached("idelis")
+            second = self.manager.fetch_cached("idelis")
+
+        self.assertIs(first, second)
+        self.assertEqual(fetch.call_count, 1)
+
+    def test_manager_fetch_cached_serves_stale_data_on_failure(self):
+        self.manager.initialize_data_sources()
+        payload = MockNob({"passages": []})
+
+        with patch.object(IdelisTransportSource, "is_available", return_value=True):
+            with patch.object(IdelisTransportSource, "fetch_data", return_value=payload):
+                self.manager.fetch_cached("idelis")
+            with patch.object(IdelisTransportSource, "fetch_data", return_value=None):
+                self.assertIs(self.manager.fetch_cached("idelis", max_age=0), payload)
@@ -0,0 +1,95 @@
+import json
+import stat
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from minidisplay.datasources import DataSourceManager
+
+
+@pytest.fixture()
+def manager():
+    manager = DataSourceManager({"data_sources": {"sensor": {"type": "push", "fallback_for": "idelis"}}})
+    manager.initialize_data_sources()
+    return manager
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_push_updates_cache_and_marks_dirty_only_on_change(manager):
+    assert manager.fetch_cached("sensor") is None
+
+    assert manager.push("sensor", {"temperature": 21.5})
+    assert manager.dirty.is_set()
+    assert manager.fetch_cached("sensor")[:] == {"temperature": 21.5}
+
+    manager.dirty.clear()
+    assert not manager.push("sensor", {"temperature": 21.5})
+    assert not manager.dirty.is_set()
+    assert manager.get_data_source("sensor").pushes == 2
+
+
+def test_push_rejects_sources_that_are_not_pushed(manager):
+    with pytest.raises(KeyError):
+        manager.push("idelis", {})
+
+
+def test_push_rejects_sources_the_display_does_not_read():
+    manager = DataSourceManager({"push_sources": ["idelis", "reminders"]})
+    manager.initialize_data_sources()
+
+    assert manager.push("idelis", {"passages": []})
+    manager.dirty.clear()
+    with pytest.raises(KeyError, match="not shown on the display"):
+        manager.push("reminders", {"bins": "tomorrow"})
+    assert not manager.dirty.is_set()
+
+
+def test_socket_listener_round_trip(manager, tmp_path):
+    from minidisplay.datasources.push import PushSocketListener
+    from minidisplay.server import send_request
+
+    socket_path = tmp_path / "push.sock"
+    listener = PushSocketListener(manager, socket_path).start()
+    try:
+        mode = stat.S_IMODE(socket_path.stat().st_mode)
+        first = send_request({"source": "sensor", "data": {"door": "open"}}, socket_path, timeout=2)
+        again = send_request({"source": "sensor", "data": {"door": "open"}}, socket_path, timeout=2)
+        unknown = send_request({"source": "nope", "data": {}}, socket_path, timeout=2)
+    finally:
+        listener.stop()
+
+    assert mode == 0o600
+    assert first == {"ok": True, "changed": True}
+    assert again == {"ok": True, "changed": False}
+    assert unknown["ok"] is False
+    assert not socket_path.exists()
+
+
+def test_file_watcher_pushes_rewritten_files(manager, tmp_path):
+    from minidisplay.datasources.push import PushFileWatcher
+    from minidisplay.utils.paths import write_atomic
+
+    path = tmp_path / "reminders.json"
+    write_atomic(path, json.dumps({"reminders": ["bins"]}).encode())
+    watcher = PushFileWatcher(manager, "sensor", path, poll_interval=0.02, use_inotify=False).start()
+    try:
+        assert watcher.backend == "poll"
+        assert manager.fetch_cached("sensor")[:] == {"reminders": ["bins"]}
+        write_atomic(path, json.dumps({"reminders": ["bins", "plants"]}).encode())
+        assert _wait_for(lambda: manager.fetch_cached("sensor")[:] == {"reminders": ["bins", "plants"]})
+    finally:
+        watcher.stop()
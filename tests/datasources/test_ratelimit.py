@@ -0,0 +1,120 @@
+import json
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from minidisplay.datasources import ratelimit
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket_spends_burst_then_refills():
+    clock = FakeClock()
+    budget = ratelimit.RequestBudget(rate_per_minute=6, burst=2, clock=clock)
+
+    assert budget.acquire("a")
+    assert budget.acquire("a")
+    assert not budget.acquire("a")
+    assert budget.acquire("b")  # Buckets are independent
+    assert budget.retry_after("a") == pytest.approx(10.0)
+
+    clock.now += 10
+    assert budget.acquire("a")
+    assert budget.snapshot()["granted"] == 4
+    assert budget.snapshot()["deferred"] == 1
+
+
+def test_state_file_is_shared_between_budgets(tmp_path):
+    clock = FakeClock()
+    state = tmp_path / "budget.json"
+    first = ratelimit.RequestBudget(rate_per_minute=1, burst=1, state_path=state, clock=clock)
+    second = ratelimit.RequestBudget(rate_per_minute=1, burst=1, state_path=state, clock=clock)
+
+    assert first.acquire("host#abc")
+    first.flush()
+    assert not second.acquire("host#abc")
+    assert list(json.loads(state.read_text())["buckets"]) == ["host#abc"]
+
+    clock.now += 60
+    assert second.acquire("other")
+    second.flush()
+    # The refilled bucket is dropped from the file.
+    assert list(json.loads(state.read_text())["buckets"]) == ["other"]
+
+
+def test_state_file_is_written_on_a_timer_not_per_request(tmp_path):
+    clock = FakeClock()
+    state = tmp_path / "budget.json"
+    budget = ratelimit.RequestBudget(rate_per_minute=60, burst=10, state_path=state, clock=clock, sync_interval=5)
+
+    with patch.object(ratelimit, "write_atomic", wraps=ratelimit.write_atomic) as write:
+        for _ in range(4):
+            assert budget.acquire("a")
+        assert write.call_count == 0
+
+        clock.now += 5
+        assert budget.acquire("a")  # Syncs the four earlier grants first
+        assert write.call_count == 1
+        assert json.loads(state.read_text())["buckets"]["a"][0] == pytest.approx(10 - 4)
+
+        budget.flush()
+        assert write.call_count == 2
+        budget.flush()  # Nothing new to write
+        assert write.call_count == 2
+
+    other = ratelimit.RequestBudget(rate_per_minute=60, burst=10, state_path=state, clock=clock)
+    assert other.retry_after("a") == 0.0
+    for _ in range(5):
+        assert other.acquire("a")
+    assert not other.acquire("a")
+
+
+def test_budget_key_hides_the_token():
+    key = ratelimit.budget_key("api.example.com", "secret")
+    assert key.startswith("api.example.com#")
+    assert "secret" not in key
+    assert key == ratelimit.budget_key("api.example.com", "secret")
+    assert key != ratelimit.budget_key("api.example.com", "other")
+
+
+def test_manager_defers_over_budget_fetches_to_the_cache(tmp_path):
+    from minidisplay.datasources import DataSourceManager, IdelisTransportSource
+
+    config = {
+        "api_url": "https://api.example.com/GetStopMonitoring",
+        "api_code": "X",
+        "api_ligne": "1",
+        "request_budget_per_minute": 1,
+        "request_budget_state": str(tmp_path / "budget.json"),
+    }
+    managers = [DataSourceManager(config), DataSourceManager(config)]
+    for manager in managers:
+        manager.initialize_data_sources()
+
+    payload = {"passages": []}
+    with patch.dict(os.environ, {"IDELIS_API_TOKEN": "token"}), patch.object(
+        IdelisTransportSource, "fetch_data", return_value=payload
+    ) as fetch:
+        assert managers[0].fetch_cached("idelis", max_age=0) == payload
+        assert managers[0].fetch_cached("idelis", max_age=0) == payload  # Deferred, served from cache
+        assert managers[0].fetch_from_source("idelis") == payload  # Deferred, last payload
+        managers[0].budget.flush()
+        assert managers[1].fetch_from_source("idelis") is None  # Same host and token, other process
+        status = managers[0].get_status()
+
+    assert fetch.call_count == 1
+    assert status["budget"]["deferred"] == 2
+    assert status["sources"]["idelis"]["breaker"]["state"] == "closed"
@@ -0,0 +1,117 @@
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from minidisplay.datasources import DataSource, DataSourceManager, registry
+
+
+def _counting_source(built):
+    class CountingSource(DataSource):
+        def __init__(self, config):
+            super().__init__("Counting", config)
+            built.append(config)
+
+        def fetch_data(self):
+            return {"value": self.config["value"]}
+
+        def is_available(self):
+            return True
+
+        def get_refresh_interval(self):
+            return 60
+
+    return CountingSource
+
+
+def test_lazy_sources_build_on_first_access():
+    built = []
+    sources = registry.LazySources()
+    sources.defer("a", lambda: built.append("a") or "source-a")
+
+    assert "a" in sources and len(sources) == 1 and list(sources) == ["a"]
+    assert built == []
+    assert sources["a"] == "source-a"
+    assert sources.get("a") == "source-a"
+    assert built == ["a"] and sources.is_loaded("a")
+    assert sources.get("missing") is None
+
+
+def test_lazy_sources_build_once_and_retry_failed_builds():
+    attempts = []
+    release = threading.Event()
+
+    def factory():
+        attempts.append(threading.current_thread().name)
+        if len(attempts) == 1:
+            raise OSError("index not ready")
+        release.wait(5)
+        return object()
+
+    sources = registry.LazySources()
+    sources.defer("slow", factory)
+
+    with pytest.raises(OSError):
+        sources["slow"]
+    assert "slow" in sources and not sources.is_loaded("slow")
+    assert sources.loaded_items() == []
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(sources["slow"])) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(attempts) == 2
+    assert len(results) == 4 and all(result is results[0] for result in results)
+    assert list(sources) == ["slow"] and len(sources) == 1
+
+
+def test_registry_resolves_builtins_and_entry_points(monkeypatch):
+    from importlib import metadata
+
+    entry = metadata.EntryPoint(
+        name="counter", value="collections:Counter", group=registry.ENTRY_POINT_GROUP
+    )
+    monkeypatch.setattr(registry.metadata, "entry_points", lambda group: [entry] if group == entry.group else [])
+    sources = registry.SourceRegistry()
+
+    assert "counter" in sources
+    assert sources.types() == ["counter", "idelis", "push", "replay", "timetable"]
+    assert sources.resolve("counter").__name__ == "Counter"
+    assert sources.resolve("timetable").__name__ == "TimetableSource"
+    assert sources.resolve("timetable") is sources.resolve("timetable")
+    assert sources._targets["counter"] is sources.resolve("counter")  # Loaded once, then cached
+    with pytest.raises(KeyError):
+        sources.resolve("nope")
+
+
+def test_manager_builds_configured_sources_on_first_fetch(monkeypatch):
+    built = []
+    sources = registry.SourceRegistry()
+    sources.register("counting", _counting_source(built))
+    monkeypatch.setattr(registry, "_registry", sources)
+
+    manager = DataSourceManager({
+        "value": 1,
+        "data_sources": {"main": {"type": "counting"}, "backup": {"type": "counting", "value": 2, "fallback_for": "main"}},
+    })
+    manager.initialize_data_sources()
+    assert len(manager) == 2 and built == []
+
+    assert manager.fetch_from_source("backup") == {"value": 2}
+    assert [config["name"] for config in built] == ["backup"]
+    assert manager._fallbacks == {"main": "backup"}
+
+
+def test_manager_rejects_unknown_types():
+    manager = DataSourceManager({"data_sources": {"main": {"type": "does-not-exist"}}})
+    with pytest.raises(KeyError):
+        manager.initialize_data_sources()
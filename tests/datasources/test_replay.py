@@ -0,0 +1,180 @@
+import datetime as dt
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from minidisplay.datasources import replay
+
+
+START = dt.datetime(2026, 10, 19, 7, 0)
+
+
+def _passages(*times):
+    return {"passages": [{"arrivee": value} for value in times]}
+
+
+def _record(path):
+    clock = iter([START, START + dt.timedelta(minutes=1), START + dt.timedelta(minutes=2)])
+    recorder = replay.TrafficRecorder(path, clock=lambda: next(clock))
+    recorder.record("idelis", _passages("07:10"))
+    recorder.record("idelis", _passages("07:10"))
+    recorder.record("idelis", _passages("07:20"))
+
+
+def test_recording_round_trip_elides_repeated_payloads(tmp_path):
+    path = tmp_path / "morning.json"
+    _record(path)
+
+    header, *frames = [json.loads(line) for line in path.read_text().splitlines()]
+    assert header["started_at"] == "2026-10-19T07:00:00"
+    assert ["payload" in frame for frame in frames] == [True, False, True]
+
+    recording = replay.Recording.load(path)
+    assert recording.offsets == [0.0, 60.0, 120.0]
+    assert recording.payloads[1] == _passages("07:10")
+    assert recording.payload_at(START - dt.timedelta(minutes=5)) == _passages("07:10")
+    assert recording.payload_at(START + dt.timedelta(seconds=119)) == _passages("07:10")
+    assert recording.payload_at(START + dt.timedelta(hours=1)) == _passages("07:20")
+
+
+def test_recorder_appends_to_an_existing_file(tmp_path):
+    path = tmp_path / "morning.json"
+    _record(path)
+
+    before = path.read_bytes()
+
+    later = replay.TrafficRecorder(path, clock=lambda: START + dt.timedelta(minutes=5))
+    later.record("idelis", _passages("07:20"))
+    later.record("idelis", _passages("07:30"))
+
+    assert path.read_bytes().startswith(before)
+    assert path.read_bytes()[len(before):].count(b"\n") == 2
+    recording = replay.Recording.load(path)
+    assert recording.offsets[-1] == 300.0
+    assert recording.payloads[-2:] == [_passages("07:20"), _passages("07:30")]
+    assert "payload" not in json.loads(path.read_text().splitlines()[-2])
+
+
+def test_version_1_recordings_are_read_and_converted(tmp_path):
+    path = tmp_path / "morning.json"
+    path.write_text(
+        json.dumps(
+            {
+                "format": replay.RECORDING_FORMAT,
+                "version": 1,
+                "source": "idelis",
+                "started_at": START.isoformat(),
+                "frames": [{"t": 0.0, "payload": _passages("07:10")}, {"t": 60.0}],
+            }
+        )
+    )
+    assert replay.Recording.load(path).payloads == [_passages("07:10")] * 2
+
+    recorder = replay.TrafficRecorder(path, clock=lambda: START + dt.timedelta(minutes=2))
+    recorder.record("idelis", _passages("07:20"))
+
+    assert json.loads(path.read_text().splitlines()[0])["version"] == replay.RECORDING_VERSION
+    assert replay.Recording.load(path).offsets == [0.0, 60.0, 120.0]
+
+
+def test_truncated_last_frame_is_ignored_and_repaired(tmp_path):
+    path = tmp_path / "morning.json"
+    _record(path)
+    with path.open("a") as handle:
+        handle.write('{"t": 180.0, "payl')
+
+    assert replay.Recording.load(path).offsets == [0.0, 60.0, 120.0]
+
+    recorder = replay.TrafficRecorder(path, clock=lambda: START + dt.timedelta(minutes=4))
+    recorder.record("idelis", _passages("07:40"))
+    assert replay.Recording.load(path).offsets == [0.0, 60.0, 120.0, 240.0]
+
+
+def test_load_rejects_other_json(tmp_path):
+    path = tmp_path / "other.json"
+    path.write_text(json.dumps({"passages": []}))
+    with pytest.raises(ValueError):
+        replay.Recording.load(path)
+
+
+def test_virtual_clock_speed_and_advance():
+    ticks = iter([0.0, 2.0, 2.0])
+    clock = replay.VirtualClock(START, speed=1800.0, monotonic=lambda: next(ticks))
+    assert clock.now() == START + dt.timedelta(hours=1)
+    assert clock.advance(60) == START + dt.timedelta(hours=1, minutes=1)
+
+
+def test_iter_replay_steps_through_the_recording(tmp_path):
+    path = tmp_path / "morning.json"
+    _record(path)
+    frames = list(replay.iter_replay(replay.Recording.load(path), step=60))
+    assert [at for at, _ in frames] == [START + dt.timedelta(minutes=m) for m in range(3)]
+    assert frames[-1][1] == _passages("07:20")
+
+
+def test_manager_replays_and_records(tmp_path):
+    from minidisplay.datasources import DataSourceManager
+
+    source_path = tmp_path / "morning.json"
+    _record(source_path)
+
+    manager = DataSourceManager({"replay_file": str(source_path), "replay_speed": 0})
+    manager.initialize_data_sources()
+    source = manager.get_data_source("idelis")
+    assert isinstance(source, replay.ReplayDataSource)
+    assert source.get_refresh_interval() == 0
+    assert manager.fetch_primary_data()[:] == _passages("07:10")
+    assert manager.get_mock_data("idelis", dt.datetime(2000, 1, 1, 7, 2))[:] == _passages("07:20")
+
+    source.clock.advance(120)
+    assert manager.fetch_primary_data()[:] == _passages("07:20")
+
+
+def test_manager_does_not_record_replays(tmp_path):
+    from minidisplay.datasources import DataSourceManager
+
+    source_path = tmp_path / "morning.json"
+    _record(source_path)
+    record_path = tmp_path / "copy.json"
+
+    manager = DataSourceManager({"replay_file": str(source_path), "record_file": str(record_path)})
+    manager.initialize_data_sources()
+    assert manager.fetch_primary_data() is not None
+    assert not record_path.exists()
+
+
+def test_missing_recording_makes_source_unavailable(tmp_path):
+    source = replay.ReplayDataSource({"replay_file": str(tmp_path / "missing.json")})
+    assert not source.is_available()
+    assert "Could not load recording" in source.last_error
+    assert source.fetch_data() is None
+
+
+def test_load_reports_the_bad_line_of_a_jsonl_recording(tmp_path):
+    path = tmp_path / "morning.json"
+    _record(path)
+    lines = path.read_text().splitlines(keepends=True)
+    path.write_text(lines[0] + "not json\n" + "".join(lines[1:]))
+
+    with pytest.raises(ValueError, match="Invalid frame on line 2"):
+        replay.Recording.load(path)
+
+
+def test_recorder_reads_only_the_ends_of_an_existing_file(tmp_path, monkeypatch):
+    path = tmp_path / "morning.json"
+    _record(path)
+    with path.open("a") as handle:
+        handle.write('{"t": 150.0}\n')  # Repeats a payload the recorder does not read back
+    before = path.read_bytes()
+    monkeypatch.setattr(replay.Recording, "load", lambda *args: pytest.fail("read the whole recording"))
+
+    recorder = replay.TrafficRecorder(path, clock=lambda: START + dt.timedelta(minutes=3))
+    recorder.record("idelis", _passages("07:20"))
+
+    assert path.read_bytes() == before + b'{"t":180.0,"payload":{"passages":[{"arrivee":"07:20"}]}}\n'
@@ -0,0 +1,91 @@
+import datetime as dt
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from minidisplay.datasources import timetable
+
+
+MONDAY = dt.datetime(2026, 10, 19)
+
+
+def _write_gtfs(root):
+    tables = {
+        "stops.txt": "stop_id,stop_code,stop_name\nS1,1234,Gare\nS2,9999,Ailleurs\n",
+        "routes.txt": "route_id,route_short_name\nR1,A\n",
+        "calendar.txt": "service_id,monday,tuesday,wednesday,thursday,friday,saturday,sunday\nWK,1,1,1,1,1,0,0\n",
+        "trips.txt": "trip_id,route_id,service_id\nT1,R1,WK\nT2,R1,WK\nT3,R1,WK\n",
+        "stop_times.txt": (
+            "trip_id,arrival_time,departure_time,stop_id,stop_sequence\n"
+            "T1,07:05:00,07:05:00,S1,1\n"
+            "T2,07:35:00,07:35:00,S1,1\n"
+            "T2,07:40:00,07:40:00,S2,2\n"
+            "T3,24:20:00,24:20:00,S1,1\n"
+        ),
+    }
+    root.mkdir()
+    for name, content in tables.items():
+        (root / name).write_text(content)
+    return root
+
+
+def test_csv_import_and_lookup(tmp_path):
+    path = tmp_path / "stop.csv"
+    path.write_text("stop,line,days,time\n1234,A,mon-fri,07:05\n1234,A,mon-fri,07:35\n1234,A,sat sun,09:00\n")
+    index = timetable.TimetableIndex.from_csv(path)
+
+    assert len(index) == 12
+    assert ("1234", "A") in index
+    departures = index.next_departures("1234", "A", MONDAY.replace(hour=7, minute=5), count=3)
+    # Friday evening rolls over to the weekend service.
+    friday = index.next_departures("1234", "A", MONDAY + dt.timedelta(days=4, hours=20), count=1)
+
+    assert departures == [MONDAY.replace(hour=7, minute=5), MONDAY.replace(hour=7, minute=35), MONDAY.replace(hour=7, minute=5) + dt.timedelta(days=1)]
+    assert friday == [MONDAY + dt.timedelta(days=5, hours=9)]
+
+
+def test_gtfs_import_handles_trips_past_midnight(tmp_path):
+    index = timetable.TimetableIndex.from_gtfs(_write_gtfs(tmp_path / "gtfs"), stops=["1234"])
+    path = tmp_path / "index.json"
+    index.save(path)
+    index = timetable.TimetableIndex.load(path)
+
+    assert len(index.departures("1234", "A", 0)) == 3
+    assert ("9999", "A") not in index
+    # Monday's 24:20 trip leaves early on Tuesday, before Tuesday's own trips.
+    tuesday_night = MONDAY + dt.timedelta(days=1, minutes=10)
+    assert index.next_departures("1234", "A", tuesday_night, count=2) == [
+        MONDAY + dt.timedelta(days=1, minutes=20),
+        MONDAY + dt.timedelta(days=1, hours=7, minutes=5),
+    ]
+
+
+def test_manager_falls_back_to_the_timetable(tmp_path):
+    from minidisplay.datasources import DataSourceManager, IdelisTransportSource
+
+    path = tmp_path / "index.json"
+    timetable.TimetableIndex.from_gtfs(_write_gtfs(tmp_path / "gtfs")).save(path)
+    manager = DataSourceManager({
+        "api_url": "https://api.example.com",
+        "api_code": "1234",
+        "api_ligne": "A",
+        "api_next": 2,
+        "timetable_file": str(path),
+    })
+    manager.initialize_data_sources()
+
+    with patch.dict(os.environ, {"IDELIS_API_TOKEN": "token"}), patch.object(
+        IdelisTransportSource, "fetch_data", return_value=None
+    ):
+        data = manager.fetch_primary_data()
+    mock = manager.get_data_source("timetable").get_mock_data(MONDAY.replace(hour=7, minute=6))
+
+    assert data.scheduled[:] is True
+    assert [passage["arrivee"] for passage in mock.passages[:]] == ["07:35", "00:20"]
@@ -0,0 +1,122 @@
+import sys
+import types
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import pytest
+
+from minidisplay.display import detection
+
+
+class FakePanel:
+    def __init__(self, colour):
+        self.colour = colour
+        self.resolution = (250, 122)
+
+
+@pytest.fixture()
+def fake_inky(monkeypatch):
+    probes = []
+
+    def auto():
+        probes.append(True)
+        return FakePanel(colour="red")
+
+    inky = types.ModuleType("inky")
+    inky_auto = types.ModuleType("inky.auto")
+    inky_auto.auto = auto
+    panel_module = types.ModuleType("fake_inky_panel")
+    panel_module.FakePanel = FakePanel
+    FakePanel.__module__ = "fake_inky_panel"
+    monkeypatch.setitem(sys.modules, "inky", inky)
+    monkeypatch.setitem(sys.modules, "inky.auto", inky_auto)
+    monkeypatch.setitem(sys.modules, "fake_inky_panel", panel_module)
+    return probes
+
+
+def test_probe_result_is_cached(tmp_path, fake_inky):
+    state = tmp_path / "inky.json"
+
+    first, from_cache = detection.open_inky(state_path=state)
+    assert not from_cache
+    assert detection.load_panel_info(state) == detection.InkyPanelInfo(
+        module="fake_inky_panel", driver="FakePanel", colour="red", resolution=(250, 122)
+    )
+
+    second, from_cache = detection.open_inky(state_path=state)
+    assert from_cache
+    assert second.colour == "red"
+    assert len(fake_inky) == 1
+
+
+def test_reprobe_flag_bypasses_cache(tmp_path, fake_inky):
+    state = tmp_path / "inky.json"
+    detection.open_inky(state_path=state)
+
+    _, from_cache = detection.open_inky(reprobe=True, state_path=state)
+
+    assert not from_cache
+    assert len(fake_inky) == 2
+
+
+def test_failing_cached_driver_triggers_reprobe(tmp_path, fake_inky):
+    state = tmp_path / "inky.json"
+    detection.save_panel_info(
+        state, detection.InkyPanelInfo("fake_inky_panel", "MissingDriver", "black", (212, 104))
+    )
+
+    display, from_cache = detection.open_inky(state_path=state)
+
+    assert not from_cache
+    assert len(fake_inky) == 1
+    assert detection.load_panel_info(state).driver == "FakePanel"
+
+
+def test_state_path_honours_env(monkeypatch, tmp_path):
+    monkeypatch.setenv(detection.INKY_STATE_ENV, str(tmp_path / "state.json"))
+    assert detection.get_inky_state_path() == tmp_path / "state.json"
+
+
+def test_corrupt_state_is_ignored(tmp_path):
+    state = tmp_path / "inky.json"
+    state.write_text("{not json", encoding="utf-8")
+    assert detection.load_panel_info(state) is None
+
+
+def test_inky_display_reprobes_when_cached_driver_fails_first_show(tmp_path, fake_inky):
+    from minidisplay.display.devices import InkyDisplay
+
+    shown = []
+
+    class WorkingPanel(FakePanel):
+        BLACK = 1
+
+        def set_border(self, colour):
+            pass
+
+        def set_image(self, image):
+            self.image = image
+
+        def show(self):
+            shown.append(self.image)
+
+    class StalePanel(WorkingPanel):
+        def show(self):
+            raise RuntimeError("Timeout waiting for busy signal")
+
+    sys.modules["fake_inky_panel"].StalePanel = StalePanel
+    sys.modules["inky.auto"].auto = lambda: fake_inky.append(True) or WorkingPanel(colour="red")
+    state = tmp_path / "inky.json"
+    detection.save_panel_info(state, detection.InkyPanelInfo("fake_inky_panel", "StalePanel", "red", (250, 122)))
+
+    display = InkyDisplay(state_path=state)
+    assert not fake_inky  # The cached driver was trusted at start-up
+    display.set_image("frame")
+    display.show()
+
+    assert shown == ["frame"]
+    assert len(fake_inky) == 1
+    assert detection.load_panel_info(state).driver == "WorkingPanel"
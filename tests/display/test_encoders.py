@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import pytest
+from PIL import Image, ImageChops, ImageDraw
+
+from minidisplay.display.devices import VirtualDisplay
+from minidisplay.display.encoders import encode_frame
+
+
+def _frame():
+    image = Image.new("RGB", (40, 20), (255, 255, 255))
+    ImageDraw.Draw(image).rectangle((5, 5, 14, 14), fill=(0, 0, 0))
+    return image
+
+
+@pytest.mark.parametrize(
+    "frame_format, mode",
+    [("png", "RGB"), ("png1", "1"), ("pbm", "1"), ("pgm", "L")],
+)
+def test_encoded_frames_round_trip(tmp_path, frame_format, mode):
+    path = tmp_path / f"frame.{frame_format}"
+    path.write_bytes(encode_frame(_frame(), frame_format, compress_level=1))
+
+    with Image.open(path) as decoded:
+        assert decoded.mode == mode
+        assert ImageChops.difference(decoded.convert("RGB"), _frame()).getbbox() is None
+
+
+def test_raw_frame_is_the_pixel_buffer():
+    assert encode_frame(_frame(), "raw") == _frame().tobytes()
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError):
+        encode_frame(_frame(), "gif")
+    with pytest.raises(ValueError):
+        VirtualDisplay(frame_format="gif")
+
+
+def test_virtual_display_replaces_output_atomically(tmp_path):
+    output = tmp_path / "out" / "frame.pbm"
+    device = VirtualDisplay(filename=output, resolution=(40, 20), frame_format="pbm")
+    device.set_image(_frame())
+    device.show()
+    device.show()
+
+    assert output.read_bytes().startswith(b"P4")
+    assert [path.name for path in output.parent.iterdir()] == ["frame.pbm"]
@@ -0,0 +1,115 @@
+import sys
+import threading
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import pytest
+from PIL import Image, ImageChops
+
+from minidisplay.display.framebuffer import FramebufferDisplay, FramebufferReader
+
+
+def _solid(color, size=(16, 8)):
+    return Image.new("RGB", size, color)
+
+
+def test_reader_sees_published_frames(tmp_path):
+    path = tmp_path / "fb"
+    display = FramebufferDisplay(path, resolution=(16, 8))
+    reader = FramebufferReader(path)
+
+    assert reader.resolution == (16, 8)
+    assert reader.mode == "RGB"
+    assert reader.read() is None
+
+    display.set_image(_solid((255, 0, 0)))
+    display.show()
+    sequence, image = reader.read()
+
+    assert sequence == display.sequence == 2
+    assert ImageChops.difference(image, _solid((255, 0, 0))).getbbox() is None
+    assert bytes(reader.view()[:3]) == b"\xff\x00\x00"
+    reader.close()
+    display.close()
+
+
+def test_wait_returns_next_frame(tmp_path):
+    path = tmp_path / "fb"
+    display = FramebufferDisplay(path, resolution=(16, 8), mode="L")
+    reader = FramebufferReader(path)
+
+    assert reader.wait(after=0, timeout=0.05) is None
+
+    display.set_image(_solid((255, 255, 255)))
+    timer = threading.Timer(0.05, display.show)
+    timer.start()
+    sequence, image = reader.wait(after=0, timeout=2)
+    timer.join()
+
+    assert sequence == 2
+    assert image.mode == "L"
+    assert image.getextrema() == (255, 255)
+    reader.close()
+    display.close()
+
+
+def test_reopening_keeps_the_sequence(tmp_path):
+    path = tmp_path / "fb"
+    display = FramebufferDisplay(path, resolution=(16, 8), mode="1")
+    display.set_image(_solid((0, 0, 0)))
+    display.show()
+    display.close()
+
+    reopened = FramebufferDisplay(path, resolution=(16, 8), mode="1")
+    assert reopened.sequence == 2
+    reopened.close()
+
+
+def test_rejects_foreign_files_and_wrong_sizes(tmp_path):
+    foreign = tmp_path / "foreign"
+    foreign.write_bytes(b"\x00" * 64)
+    with pytest.raises(ValueError):
+        FramebufferReader(foreign)
+
+    display = FramebufferDisplay(tmp_path / "fb", resolution=(16, 8))
+    display.set_image(_solid((0, 0, 0), size=(8, 8)))
+    with pytest.raises(ValueError):
+        display.show()
+    display.close()
+
+
+def test_reopening_at_another_size_leaves_old_readers_intact(tmp_path):
+    path = tmp_path / "fb"
+    display = FramebufferDisplay(path, resolution=(16, 8))
+    display.set_image(_solid((255, 0, 0)))
+    display.show()
+    display.close()
+    reader = FramebufferReader(path)
+
+    smaller = FramebufferDisplay(path, resolution=(8, 4), mode="L")
+
+    # The old reader still maps the old file: reading it must not fault.
+    sequence, image = reader.read()
+    assert (sequence, image.size) == (2, (16, 8))
+    reader.close()
+    with FramebufferReader(path) as reopened:
+        assert (reopened.resolution, reopened.mode, reopened.read()) == ((8, 4), "L", None)
+    assert smaller.sequence == 0
+    assert [entry.name for entry in tmp_path.iterdir()] == ["fb"]
+    smaller.close()
+
+
+def test_new_framebuffers_get_the_mode_of_the_file_they_replace(tmp_path, monkeypatch):
+    from minidisplay.utils import paths
+
+    monkeypatch.setattr(paths, "_UMASK", 0o077)
+    path = tmp_path / "fb"
+    FramebufferDisplay(path, resolution=(16, 8)).close()
+    assert path.stat().st_mode & 0o777 == 0o600
+
+    path.chmod(0o640)
+    FramebufferDisplay(path, resolution=(8, 4)).close()
+    assert path.stat().st_mode & 0o777 == 0o640
@@ -0,0 +1,107 @@
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from PIL import Image
+
+from minidisplay.display.devices import Display
+from minidisplay.display.governor import RefreshGovernor
+from minidisplay.display.models import FrameInfo
+
+
+class _RecordingDisplay(Display):
+    def __init__(self):
+        self.shown = []
+        self._image = None
+        self._info = None
+
+    @property
+    def resolution(self):
+        return (4, 4)
+
+    def set_frame_info(self, info):
+        self._info = info
+
+    def set_image(self, image):
+        self._image = image
+
+    def show(self):
+        self.shown.append((self._info, self._image.getpixel((0, 0))))
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _show(governor, pixel, layout="Bus Arrival", arrival="07:40"):
+    governor.set_frame_info(FrameInfo(layout, {"arrival_time": arrival}))
+    governor.set_image(Image.new("L", (4, 4), pixel))
+    return governor.show()
+
+
+def _governor():
+    device = _RecordingDisplay()
+    clock = _FakeClock()
+    return device, clock, RefreshGovernor(device, min_interval=30, cosmetic_interval=300, clock=clock)
+
+
+def test_first_frame_is_pushed_and_duplicates_dropped():
+    device, _, governor = _governor()
+
+    assert _show(governor, 1) == "pushed"
+    assert _show(governor, 1) == "duplicate"
+    assert len(device.shown) == 1
+    assert governor.counters["duplicate"] == 1
+
+
+def test_major_changes_wait_for_min_interval_and_coalesce():
+    device, clock, governor = _governor()
+    _show(governor, 1)
+
+    clock.now = 10
+    assert _show(governor, 2, arrival="07:41") == "deferred"
+    assert _show(governor, 3, arrival="07:42") == "deferred"
+    assert governor.poll() is False
+
+    clock.now = 30
+    assert governor.poll() is True
+    assert [info.content["arrival_time"] for info, _ in device.shown] == ["07:40", "07:42"]
+    assert governor.counters["coalesced"] == 1
+    assert governor.counters["major"] == 2
+
+
+def test_cosmetic_changes_wait_longer_than_major_ones():
+    device, clock, governor = _governor()
+    _show(governor, 1)
+
+    clock.now = 60
+    assert _show(governor, 2) == "deferred"  # Same layout and content, other pixels
+    assert governor.next_due() == 300
+
+    assert _show(governor, 3, layout="Standby") == "pushed"  # Standby switch outranks it
+    assert governor.counters == {
+        "pushed": 2,
+        "major": 2,
+        "cosmetic": 0,
+        "duplicate": 0,
+        "deferred": 1,
+        "coalesced": 1,
+    }
+
+
+def test_flush_ignores_the_interval():
+    device, clock, governor = _governor()
+    _show(governor, 1)
+    clock.now = 1
+    _show(governor, 2, arrival="07:41")
+
+    assert governor.flush() is True
+    assert len(device.shown) == 2
+    assert not governor.has_pending
@@ -0,0 +1,90 @@
+import sys
+import threading
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import pytest
+from PIL import Image
+
+from minidisplay.display.devices import Display, VirtualDisplay
+from minidisplay.display.push import AsyncPushDisplay
+
+
+class _GatedDisplay(Display):
+    """Records pushed frames; each show() blocks until the gate opens."""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.started = threading.Event()
+        self.shown = []
+        self._image = None
+
+    @property
+    def resolution(self):
+        return (4, 4)
+
+    def set_image(self, image):
+        self._image = image
+
+    def show(self):
+        self.started.set()
+        self.gate.wait(5)
+        self.shown.append(self._image.getpixel((0, 0)))
+
+
+def _frame(value):
+    return Image.new("L", (4, 4), value)
+
+
+def test_only_newest_pending_frame_is_pushed():
+    device = _GatedDisplay()
+    push = AsyncPushDisplay(device)
+
+    push.set_image(_frame(1))
+    first = push.show()
+    assert device.started.wait(5)  # Frame 1 is now on the "panel"
+
+    push.set_image(_frame(2))
+    second = push.show()
+    push.set_image(_frame(3))
+    third = push.show()
+
+    device.gate.set()
+    assert third.result(timeout=5) is True
+    assert first.result(timeout=5) is True
+    assert second.cancelled()
+    assert device.shown == [1, 3]
+    assert push.pushed == 2
+    assert push.superseded == 1
+    push.close()
+
+
+def test_errors_are_reported_through_the_future():
+    class _Broken(_GatedDisplay):
+        def show(self):
+            raise RuntimeError("panel unplugged")
+
+    push = AsyncPushDisplay(_Broken())
+    push.set_image(_frame(0))
+
+    with pytest.raises(RuntimeError):
+        push.show().result(timeout=5)
+    assert push.failed == 1
+    push.close()
+
+
+def test_wraps_virtual_display(tmp_path):
+    output = tmp_path / "frame.png"
+    push = AsyncPushDisplay(VirtualDisplay(filename=output, resolution=(4, 4)))
+
+    assert push.resolution == (4, 4)
+    assert push.output_path == output
+
+    push.set_image(_frame(255).convert("RGB"))
+    push.show()
+    assert push.flush(timeout=5)
+    assert output.exists()
+    push.close()
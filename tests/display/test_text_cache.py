@@ -0,0 +1,146 @@
+import itertools
+import random
+import sys
+import threading
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import pytest
+from PIL import Image, ImageChops, ImageDraw
+from font_hanken_grotesk import HankenGroteskBold
+
+from minidisplay.display.atlas import GlyphAtlas
+from minidisplay.display.text import TextRasterCache, load_font, rasterize_text
+
+
+@pytest.mark.parametrize("text", ["07:42", "A l'arrêt", "Aucun passage"])
+def test_cached_text_matches_direct_drawing(text):
+    cache = TextRasterCache()
+    font = load_font(HankenGroteskBold, 32)
+
+    expected = Image.new("RGB", (212, 104), (255, 255, 255))
+    ImageDraw.Draw(expected).text((12, 30), text, fill="black", font=font)
+
+    actual = Image.new("RGB", (212, 104), (255, 255, 255))
+    cache.get(HankenGroteskBold, 32, "black", text).paste_into(actual, 12, 30)
+
+    assert ImageChops.difference(expected, actual).getbbox() is None
+
+
+def test_measure_matches_font_bbox():
+    cache = TextRasterCache()
+    _, _, right, bottom = load_font(HankenGroteskBold, 24).getbbox("En veille")
+
+    assert cache.measure(HankenGroteskBold, 24, "black", "En veille") == (right, bottom)
+
+
+def test_cache_hits_and_lru_eviction():
+    cache = TextRasterCache(max_entries=2)
+
+    cache.get(HankenGroteskBold, 24, "black", "A")
+    cache.get(HankenGroteskBold, 24, "black", "B")
+    cache.get(HankenGroteskBold, 24, "black", "A")
+    cache.get(HankenGroteskBold, 24, "black", "C")
+
+    assert cache.hits == 1
+    assert cache.misses == 3
+    assert len(cache) == 2
+    assert (HankenGroteskBold, 24, "black", "A") in cache
+    assert (HankenGroteskBold, 24, "black", "B") not in cache
+
+
+def test_concurrent_lookups_keep_the_cache_consistent():
+    cache = TextRasterCache(max_entries=4, atlas_alphabet=None)
+    texts = [f"{minute:02d}" for minute in range(12)]
+    errors = []
+
+    def render():
+        try:
+            for _ in range(20):
+                for text in texts:
+                    cache.get(HankenGroteskBold, 18, "black", text)
+        except Exception as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=render) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(cache) == 4
+    assert cache.hits + cache.misses == 8 * 20 * len(texts)
+
+
+def test_empty_text_is_a_noop():
+    cache = TextRasterCache()
+    image = Image.new("RGB", (10, 10), (255, 255, 255))
+
+    cache.get(HankenGroteskBold, 24, "black", "").paste_into(image, 0, 0)
+
+    assert image.getextrema() == ((255, 255), (255, 255), (255, 255))
+
+
+@pytest.mark.parametrize("font_size", [24, 32])
+@pytest.mark.parametrize("text", ["07:42", "12:59", "10 h 11", "5 min"])
+def test_atlas_matches_freetype(font_size, text):
+    atlas = GlyphAtlas(HankenGroteskBold, font_size)
+    expected = rasterize_text(load_font(HankenGroteskBold, font_size), text, "black")
+
+    composed = atlas.render(text, "black")
+
+    assert composed.size == expected.size
+    assert composed.offset == expected.offset
+    assert ImageChops.difference(composed.mask, expected.mask).getbbox() is None
+
+
+def _same_raster(composed, expected):
+    if composed.size != expected.size or composed.offset != expected.offset:
+        return False
+    if composed.mask is None or expected.mask is None:
+        return composed.mask is expected.mask
+    return ImageChops.difference(composed.mask, expected.mask).getbbox() is None
+
+
+@pytest.mark.parametrize("font_size", [18, 24, 32])
+def test_atlas_is_pixel_identical_whenever_it_is_used(font_size):
+    atlas = GlyphAtlas(HankenGroteskBold, font_size)
+    font = load_font(HankenGroteskBold, font_size)
+    rng = random.Random(font_size)
+    texts = {f"{hour:02d}:{minute:02d}" for hour in range(24) for minute in range(60)}
+    texts |= {f"{minute} min" for minute in range(100)}
+    texts |= {"".join(pair) for pair in itertools.product(atlas.alphabet, repeat=2)}
+    texts |= {"".join(rng.choice(atlas.alphabet) for _ in range(rng.randint(1, 8))) for _ in range(300)}
+
+    mismatches = [
+        text
+        for text in sorted(texts)
+        if atlas.composable(text) and not _same_raster(atlas.render(text, "black"), rasterize_text(font, text, "black"))
+    ]
+
+    assert mismatches == []
+
+
+def test_overlapping_glyphs_fall_back_to_freetype():
+    atlas = GlyphAtlas(HankenGroteskBold, 18)
+    assert atlas.covers("44") and not atlas.composable("44")
+
+    cache = TextRasterCache()
+    cache.get(HankenGroteskBold, 18, "black", "44")
+    assert cache.atlas_renders == 0
+
+
+def test_cache_uses_atlas_only_for_covered_text():
+    cache = TextRasterCache()
+
+    cache.get(HankenGroteskBold, 32, "black", "07:42")
+    cache.get(HankenGroteskBold, 32, "black", "Aucun passage")
+
+    assert cache.atlas_renders == 1
+
+    with pytest.raises(ValueError, match="not covered"):
+        GlyphAtlas(HankenGroteskBold, 32).render("Aucun", "black")
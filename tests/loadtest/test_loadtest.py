@@ -0,0 +1,81 @@
+import json
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import requests
+
+from minidisplay.loadtest import IdelisStubServer, StubBehaviour, run_load
+
+
+def _get(url, token="token"):
+    headers = {"X-Auth-Token": token} if token else {}
+    return requests.request("get", url, data=json.dumps({"next": 2}), headers=headers, timeout=5)
+
+
+def test_stub_answers_like_the_api():
+    with IdelisStubServer(behaviour=StubBehaviour(padding=100)) as stub:
+        response = _get(stub.url)
+        unauthorized = _get(stub.url, token=None)
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert len(payload["passages"]) == 2
+    assert len(payload["padding"]) == 100
+    assert unauthorized.status_code == 401
+    assert stub.stats()["ok"] == 1
+
+
+def test_stub_injects_errors():
+    with IdelisStubServer(behaviour=StubBehaviour(error_rate=1.0)) as stub:
+        assert _get(stub.url).status_code == 500
+        assert stub.stats()["errors"] == 1
+
+
+def test_load_run_counts_failures_and_retries():
+    with IdelisStubServer(behaviour=StubBehaviour(error_rate=0.5), seed=7) as stub:
+        report = run_load(stub.url, requests=40, concurrency=8, timeout=2, retries=1)
+        stats = stub.stats()
+
+    assert report.ok + report.failures == 40
+    assert report.ok == stats["ok"]
+    assert report.retries == stats["errors"] - report.failures
+    assert report.summary()["throughput_rps"] > 0
+
+
+def test_load_run_reports_timeouts():
+    with IdelisStubServer(behaviour=StubBehaviour(latency=0.5)) as stub:
+        report = run_load(stub.url, mode="manager", requests=4, concurrency=4, timeout=0.05)
+
+    assert report.failures == 4
+    assert report.timeouts == 4
+
+
+def test_load_run_uses_conditional_and_compressed_requests():
+    with IdelisStubServer(behaviour=StubBehaviour(gzip=True, etag=True, padding=2000)) as stub:
+        report = run_load(stub.url, requests=6, concurrency=1)
+        stats = stub.stats()
+
+    assert report.ok == 6
+    # Answers only change once a minute, so the first request may be the only full one.
+    assert stats["ok"] + stats["not_modified"] == 6
+    assert stats["not_modified"] >= 4
+    assert report.bytes_saved > 2000 * stats["not_modified"]
+
+
+def test_load_run_leaves_the_environment_and_logging_alone(monkeypatch, caplog):
+    import logging
+    import os
+
+    monkeypatch.delenv("IDELIS_API_TOKEN", raising=False)
+    with caplog.at_level(logging.INFO, logger="minidisplay"):
+        with IdelisStubServer(behaviour=StubBehaviour(error_rate=0.5), seed=7) as stub:
+            report = run_load(stub.url, requests=10, concurrency=2, timeout=2)
+        assert logging.getLogger("minidisplay").level == logging.INFO
+
+    assert report.ok > 0 and report.failures > 0  # The dummy token reached the sources
+    assert "IDELIS_API_TOKEN" not in os.environ
+    assert not [record for record in caplog.records if record.levelno >= logging.WARNING]
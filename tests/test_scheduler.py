@@ -0,0 +1,65 @@
+import datetime as dt
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from minidisplay.display.devices import VirtualDisplay
+from minidisplay.scheduler import FrameScheduler
+
+
+def _config(tmp_path):
+    return {
+        "lock_file": str(tmp_path / "lock"),
+        "api_url": "https://example.com",
+        "api_code": "X",
+        "api_ligne": "Y",
+        "api_next": 3,
+        "display_start_hour": 6,
+        "display_start_minute": 0,
+        "display_end_hour": 9,
+        "display_end_minute": 0,
+    }
+
+
+def test_scheduler_publishes_only_changed_frames(tmp_path):
+    now = [dt.datetime(2024, 1, 1, 7, 30)]
+    device = VirtualDisplay(filename=tmp_path / "panel.png")
+    scheduler = FrameScheduler(
+        _config(tmp_path), use_mock=True, display_device=device, clock=lambda: now[0]
+    )
+
+    first = scheduler.tick()
+    assert first is not None
+    assert first.result.arrival_text == "07:40"
+    assert (tmp_path / "panel.png").exists()
+
+    assert scheduler.tick() is None
+
+    now[0] = dt.datetime(2024, 1, 1, 7, 31)
+    second = scheduler.tick()
+    assert second is not None
+    assert second.sequence == first.sequence + 1
+    assert scheduler.latest is second
+
+
+def test_scheduler_wakes_up_when_pushed_data_changes(tmp_path):
+    config = dict(_config(tmp_path), push_sources=["idelis"])
+    scheduler = FrameScheduler(
+        config, interval=60, clock=lambda: dt.datetime(2024, 1, 1, 7, 30)
+    )
+    manager = scheduler.manager
+
+    assert manager.push("idelis", {"passages": [{"arrivee": "07:42"}]})
+    assert scheduler.wait_for_change(0)
+    assert scheduler.tick().result.arrival_text == "07:42"
+    assert not manager.push("idelis", {"passages": [{"arrivee": "07:42"}]})
+    assert not scheduler.wait_for_change(0.01)
+
+    manager.push("idelis", {"passages": [{"arrivee": "07:45"}]})
+    assert scheduler.wait_for_change(0)
+    assert scheduler.tick().result.arrival_text == "07:45"
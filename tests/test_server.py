@@ -0,0 +1,160 @@
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from minidisplay.server import RenderServer
+
+
+@pytest.fixture()
+def config_path(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(
+        json.dumps(
+            {
+                "lock_file": str(tmp_path / "lock"),
+                "api_url": "https://example.com",
+                "api_code": "X",
+                "api_ligne": "Y",
+                "api_next": 3,
+                "display_start_hour": 6,
+                "display_start_minute": 0,
+                "display_end_hour": 9,
+                "display_end_minute": 0,
+            }
+        ),
+        encoding="utf-8",
+    )
+    return path
+
+
+@pytest.fixture()
+def running_server(tmp_path, monkeypatch):
+    monkeypatch.setenv("INKY_DISPLAY_AVAILABLE", "false")
+    server = RenderServer(tmp_path / "render.sock")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    for _ in range(200):
+        if server.socket_path.exists():
+            break
+        threading.Event().wait(0.01)
+    yield server
+    server.shutdown()
+    thread.join(5)
+
+
+def test_cli_delegates_to_running_server(running_server, config_path, tmp_path, capsys):
+    from minidisplay import cli
+
+    output = tmp_path / "frame.png"
+    argv = [
+        "--use-mock",
+        "--mock-time", "07:30",
+        "--config", str(config_path),
+        "--output", str(output),
+        "--socket", str(running_server.socket_path),
+    ]
+
+    assert cli.main(argv) == 0
+    assert cli.main(argv) == 0
+
+    assert output.exists()
+    assert running_server.requests_served == 2
+    assert running_server.simulation_cache.hits == 1
+    captured = capsys.readouterr()
+    assert captured.out.count(f"Image saved as {output}") == 2
+    assert "Image saved" not in captured.err
+
+
+def test_cli_prints_the_same_output_in_process(config_path, tmp_path, monkeypatch, capsys):
+    from minidisplay import cli
+
+    monkeypatch.setenv("INKY_DISPLAY_AVAILABLE", "false")
+    output = tmp_path / "frame.png"
+    argv = ["--use-mock", "--mock-time", "07:30", "--config", str(config_path), "--output", str(output), "--no-server"]
+
+    assert cli.main(argv) == 0
+    assert capsys.readouterr().out == f"Image saved as {output}\n"
+
+
+def test_server_reports_errors(running_server):
+    from minidisplay.server import send_request
+
+    reply = send_request({"command": "bogus"}, running_server.socket_path)
+    assert reply == {"ok": False, "error": "Unknown command: 'bogus'"}
+    assert send_request({"command": "ping"}, running_server.socket_path)["ok"] is True
+
+
+def test_client_returns_none_without_server(tmp_path):
+    from minidisplay.server import send_request
+
+    assert send_request({"command": "ping"}, tmp_path / "missing.sock") is None
+
+
+def test_cli_frame_formats_mirror_encoders():
+    from minidisplay import cli
+    from minidisplay.display.encoders import DEFAULT_FRAME_FORMAT, FRAME_FORMATS
+    from minidisplay.display.governor import DEFAULT_MIN_REFRESH_INTERVAL
+    from minidisplay.scheduler import DEFAULT_SCHEDULE_INTERVAL
+
+    assert cli._FRAME_FORMATS == FRAME_FORMATS
+    assert cli._FRAME_FORMATS[0] == DEFAULT_FRAME_FORMAT
+    assert cli._DEFAULT_INTERVAL == DEFAULT_SCHEDULE_INTERVAL
+    assert cli._DEFAULT_MIN_REFRESH == DEFAULT_MIN_REFRESH_INTERVAL
+
+
+def test_server_reloads_a_modified_config(tmp_path, config_path, monkeypatch):
+    import os
+
+    monkeypatch.setenv("INKY_DISPLAY_AVAILABLE", "false")
+    server = RenderServer(tmp_path / "render.sock")
+    config, manager = server._manager(str(config_path))
+    assert server._manager(str(config_path))[1] is manager
+
+    config_path.write_text(json.dumps(dict(config, api_next=5)), encoding="utf-8")
+    stat = config_path.stat()
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    reloaded, reloaded_manager = server._manager(str(config_path))
+
+    assert reloaded["api_next"] == 5
+    assert reloaded_manager is not manager
+    assert len(server._managers) == 1
+
+
+def test_cli_does_not_render_twice_when_the_server_times_out(monkeypatch, capsys):
+    import socket
+
+    from minidisplay import cli
+
+    def timed_out(*args, **kwargs):
+        raise socket.timeout("timed out")
+
+    monkeypatch.setattr("minidisplay.server.send_request", timed_out)
+    monkeypatch.setattr(cli, "_select_display_device", lambda *args, **kwargs: pytest.fail("rendered in-process"))
+
+    assert cli.main(["--use-mock"]) == 1
+    assert "Render server did not answer: timed out" in capsys.readouterr().out
+
+
+def test_serve_refuses_a_socket_whose_server_is_busy(tmp_path, capsys):
+    import socket
+
+    from minidisplay import cli
+
+    path = tmp_path / "render.sock"
+    busy = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    busy.bind(str(path))
+    busy.listen(1)  # Accepts connections but never answers
+    try:
+        assert cli.main(["--serve", "--socket", str(path)]) == 1
+    finally:
+        busy.close()
+
+    assert f"A render server is already listening on {path}" in capsys.readouterr().out
+    assert path.exists()
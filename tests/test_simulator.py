@@ -1,4 +1,3 @@
-import importlib
 import sys
 from pathlib import Path
 
@@ -8,48 +7,23 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from minidisplay import simulator
 from minidisplay.display.devices import VirtualDisplay
 
 
-def load_simulator():
-    if "nob" in sys.modules and not hasattr(sys.modules["nob"], "__file__"):
-        sys.modules.pop("nob")
-    import nob  # noqa: F401
-
-    modules_to_reload = [
-        "minidisplay.datasources.idelis",
-        "minidisplay.datasources.manager",
-        "minidisplay.datasources.__init__",
-    ]
-
-    for module_name in modules_to_reload:
-        if module_name in sys.modules:
-            importlib.reload(sys.modules[module_name])
-        else:
-            importlib.import_module(module_name)
-
-    simulator_module = importlib.import_module("minidisplay.simulator")
-    return importlib.reload(simulator_module)
-
-
-@pytest.fixture()
-def simulator():
-    return load_simulator()
-
-
-def test_parse_mock_time_valid(simulator):
+def test_parse_mock_time_valid():
     parsed = simulator.parse_mock_time("07:45")
     assert parsed.hour == 7
     assert parsed.minute == 45
 
 
-def test_parse_mock_time_invalid(simulator):
+def test_parse_mock_time_invalid():
     with pytest.raises(ValueError):
         simulator.parse_mock_time("7-45")
 
 
-def test_run_simulation_generates_image(tmp_path, simulator):
-    config = {
+def _config(tmp_path):
+    return {
         "lock_file": str(tmp_path / "lock"),
         "api_url": "https://example.com",
         "api_code": "X",
@@ -61,6 +35,9 @@ def test_run_simulation_generates_image(tmp_path, simulator):
         "display_end_minute": 0,
     }
 
+
+def test_run_simulation_generates_image(tmp_path):
+    config = _config(tmp_path)
     output_path = tmp_path / "preview.png"
     device = VirtualDisplay(filename=output_path)
 
@@ -77,3 +54,93 @@ def test_run_simulation_generates_image(tmp_path, simulator):
     assert output_path.exists()
     assert result.mode == "active"
     assert result.arrival_text == "07:40"
+    assert "render.layout" in result.timings
+    assert "display.show" in result.timings
+
+
+def test_standby_lock_is_written_only_after_the_frame_is_shown(tmp_path):
+    class BrokenDisplay(VirtualDisplay):
+        def show(self):
+            raise OSError("panel busy")
+
+    config = _config(tmp_path)
+    standby = simulator.parse_mock_time("22:00")
+    lock_file = tmp_path / "lock"
+
+    with pytest.raises(OSError):
+        simulator.run_simulation(
+            config, use_mock=True, mock_time=standby, display_device=BrokenDisplay(filename=tmp_path / "a.png")
+        )
+    assert not lock_file.exists()
+
+    device = VirtualDisplay(filename=tmp_path / "b.png")
+    result = simulator.run_simulation(config, use_mock=True, mock_time=standby, display_device=device)
+    assert result.mode == "standby" and (tmp_path / "b.png").exists()
+    assert lock_file.exists()
+
+
+def test_run_simulation_reuses_cached_frame(tmp_path):
+    config = _config(tmp_path)
+    cache = simulator.SimulationCache(max_entries=4)
+
+    def simulate(mock_time, filename):
+        return simulator.run_simulation(
+            config,
+            use_mock=True,
+            mock_time=simulator.parse_mock_time(mock_time),
+            display_device=VirtualDisplay(filename=tmp_path / filename),
+            manage_lock_file=False,
+            render_standby_always=True,
+            cache=cache,
+        )
+
+    first = simulate("07:30", "first.png")
+    second = simulate("07:30", "second.png")
+
+    assert not first.from_cache
+    assert second.from_cache
+    assert second.frame is first.frame
+    assert second.image_path == tmp_path / "second.png"
+    assert (tmp_path / "second.png").read_bytes() == (tmp_path / "first.png").read_bytes()
+    assert "render.layout" not in second.timings
+    assert cache.hits == 1
+    assert cache.misses == 1
+    assert cache.hit_ratio == 0.5
+
+
+def test_simulation_cache_is_bounded(tmp_path):
+    config = _config(tmp_path)
+    cache = simulator.SimulationCache(max_entries=2)
+
+    for mock_time in ("07:30", "07:31", "07:32"):
+        simulator.run_simulation(
+            config,
+            use_mock=True,
+            mock_time=simulator.parse_mock_time(mock_time),
+            display_device=VirtualDisplay(filename=tmp_path / "preview.png"),
+            manage_lock_file=False,
+            render_standby_always=True,
+            cache=cache,
+        )
+
+    assert len(cache) == 2
+    assert cache.stats()["misses"] == 3
+
+
+def test_simulation_fingerprint_tracks_payload_and_minute():
+    now = simulator.parse_mock_time("07:30")
+    key = simulator.simulation_fingerprint(
+        {"display_start_hour": 6}, now, {"a": 1}, resolution=(250, 122), icon_path=Path("bus.png")
+    )
+
+    def other(**changes):
+        args = {"config": {"display_start_hour": 6}, "now": now, "payload": {"a": 1}}
+        args.update(changes)
+        return simulator.simulation_fingerprint(
+            args["config"], args["now"], args["payload"], resolution=(250, 122), icon_path=Path("bus.png")
+        )
+
+    assert other(now=now.replace(second=42)) == key
+    assert other(now=now.replace(minute=31)) != key
+    assert other(payload={"a": 2}) != key
+    assert other(config={"display_start_hour": 7}) != key
@@ -0,0 +1,147 @@
+import io
+import json
+import logging
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from minidisplay.utils.eventlog import EventLog, get_logger
+
+
+@pytest.fixture()
+def attach(request):
+    """Return a function routing a fresh logger to the given EventLog."""
+    def attach(event_log: EventLog) -> logging.Logger:
+        logger = logging.getLogger(f"eventlog-test.{request.node.name}")
+        logger.handlers = [event_log]
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        return logger
+
+    return attach
+
+
+def test_events_are_buffered_with_fields_and_bounded(attach):
+    event_log = EventLog(level=logging.DEBUG, capacity=2, stream=io.StringIO())
+    logger = attach(event_log)
+
+    logger.info("first")
+    logger.info("second %s", "frame", extra={"source": "idelis"})
+    logger.debug("third")
+
+    events = event_log.events()
+    assert [event["message"] for event in events] == ["second frame", "third"]
+    assert events[0]["fields"] == {"source": "idelis"}
+    assert [event["message"] for event in event_log.events(logging.INFO)] == ["second frame"]
+
+
+def test_repeated_warnings_are_sampled(attach):
+    now = [0.0]
+    event_log = EventLog(stream=io.StringIO(), sample_window=60.0, clock=lambda: now[0])
+    logger = attach(event_log)
+
+    for _ in range(5):
+        logger.warning("Data source '%s' is not available.", "idelis")
+    logger.warning("Data source '%s' is not available.", "timetable")
+    logger.info("Image saved")
+    logger.info("Image saved")
+    now[0] = 61.0
+    logger.warning("Data source '%s' is not available.", "idelis")
+
+    events = event_log.events()
+    assert [event["message"] for event in events] == [
+        "Data source 'idelis' is not available.",
+        "Data source 'timetable' is not available.",
+        "Image saved",
+        "Image saved",
+        "Data source 'idelis' is not available.",
+    ]
+    assert events[-1]["repeated"] == 4
+    assert event_log.suppressed == 4
+
+
+def test_writes_batches_to_the_stream_and_jsonl(attach, tmp_path):
+    stream = io.StringIO()
+    path = tmp_path / "events.jsonl"
+    event_log = EventLog(stream=stream, jsonl_path=path, flush_interval=0.01)
+    logger = attach(event_log)
+
+    try:
+        raise OSError("disk full")
+    except OSError:
+        logger.error("Could not write %s", "frame.png", exc_info=True)
+    logger.info("Image saved")
+    event_log.flush()
+
+    assert stream.getvalue().splitlines() == [
+        f"ERROR {logger.name}: Could not write frame.png (OSError: disk full)",
+        f"INFO {logger.name}: Image saved",
+    ]
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [record["message"] for record in records] == ["Could not write frame.png", "Image saved"]
+    event_log.set_jsonl_path(None)
+
+
+def test_full_queue_drops_instead_of_blocking(attach):
+    release = threading.Event()
+
+    class SlowStream(io.StringIO):
+        def write(self, text):
+            release.wait(5)
+            return super().write(text)
+
+    event_log = EventLog(stream=SlowStream(), queue_size=1, batch_size=1, flush_interval=0)
+    logger = attach(event_log)
+
+    logger.info("taken by the writer")
+    for _ in range(200):  # Wait until the writer holds the first event
+        if event_log._queue.empty():
+            break
+        threading.Event().wait(0.01)
+    logger.info("queued")
+    logger.info("dropped")
+    release.set()
+    event_log.flush()
+
+    assert event_log.dropped == 1
+    assert len(event_log.events()) == 3
+
+
+def test_capture_collects_this_threads_events(attach):
+    event_log = EventLog(stream=io.StringIO())
+    logger = attach(event_log)
+
+    with event_log.capture() as captured:
+        logger.info("mine")
+        worker = threading.Thread(target=logger.info, args=("other thread",))
+        worker.start()
+        worker.join()
+
+    assert [event["message"] for event in captured] == ["mine"]
+
+
+def test_configure_logging_keeps_the_jsonl_file_unless_given(tmp_path):
+    from minidisplay.utils import eventlog
+
+    event_log = eventlog.get_event_log()
+    level, original = event_log.level, event_log._jsonl_path
+    path = tmp_path / "events.jsonl"
+    try:
+        eventlog.configure_logging(jsonl_path=path)
+        eventlog.configure_logging(level="DEBUG")
+        assert event_log._jsonl_path == path
+        eventlog.configure_logging(jsonl_path=None)
+        assert event_log._jsonl_path is None
+    finally:
+        eventlog.configure_logging(level=level, jsonl_path=original)
+
+
+def test_get_logger_places_modules_under_minidisplay():
+    assert get_logger("minidisplay.display.devices").name == "minidisplay.display.devices"
+    assert get_logger("plugin").name == "minidisplay.plugin"
@@ -0,0 +1,75 @@
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import pytest
+
+from minidisplay.utils.metrics import MetricsRegistry
+
+
+def test_counter_exposition():
+    registry = MetricsRegistry()
+    fetches = registry.counter("fetch_total", "Fetches.", ("source", "outcome"))
+
+    fetches.inc(source="idelis", outcome="success")
+    fetches.inc(2, source="idelis", outcome="failure")
+
+    text = registry.render_prometheus()
+    assert "# TYPE fetch_total counter" in text
+    assert 'fetch_total{source="idelis",outcome="failure"} 2' in text
+    assert fetches.value(source="idelis", outcome="success") == 1
+
+
+def test_counter_rejects_unknown_labels():
+    registry = MetricsRegistry()
+    fetches = registry.counter("fetch_total", "Fetches.", ("source",))
+
+    with pytest.raises(ValueError, match="expects labels"):
+        fetches.inc(device="inky")
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    render = registry.histogram("render_seconds", "Render time.", ("layout",), buckets=(0.01, 0.1))
+
+    render.observe(0.005, layout="Standby")
+    render.observe(0.05, layout="Standby")
+    render.observe(3.0, layout="Standby")
+
+    text = registry.render_prometheus()
+    assert 'render_seconds_bucket{layout="Standby",le="0.01"} 1' in text
+    assert 'render_seconds_bucket{layout="Standby",le="0.1"} 2' in text
+    assert 'render_seconds_bucket{layout="Standby",le="+Inf"} 3' in text
+    assert 'render_seconds_count{layout="Standby"} 3' in text
+    assert render.count(layout="Standby") == 3
+
+
+def test_duplicate_registration_is_rejected():
+    registry = MetricsRegistry()
+    registry.counter("frames_total", "Frames.")
+
+    with pytest.raises(ValueError, match="already registered"):
+        registry.counter("frames_total", "Frames.")
+
+
+def test_diff_and_merge_carry_metrics_across_registries():
+    worker, server = MetricsRegistry(), MetricsRegistry()
+    for registry in (worker, server):
+        registry.counter("fetch_total", "Fetches.", ("source",))
+        registry.histogram("render_seconds", "Renders.", buckets=(0.1, 1.0))
+    worker.get("fetch_total").inc(source="idelis")
+
+    before = worker.snapshot()
+    worker.get("fetch_total").inc(2, source="idelis")
+    worker.get("render_seconds").observe(0.5)
+    delta = worker.diff(before, worker.snapshot())
+    server.merge(delta)
+    server.merge(delta)
+
+    assert delta == {"fetch_total": {("idelis",): 2}, "render_seconds": {(): [0, 1, 0, 0.5, 1]}}
+    assert server.get("fetch_total").value(source="idelis") == 4
+    assert server.get("render_seconds").count() == 2
+    assert "render_seconds_sum 1" in server.render_prometheus()
@@ -0,0 +1,37 @@
+import os
+import stat
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from minidisplay.utils import paths
+from minidisplay.utils.paths import write_atomic
+
+
+def _mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_new_files_follow_the_umask(tmp_path, monkeypatch):
+    monkeypatch.setattr(paths, "_UMASK", 0o022)
+    path = tmp_path / "frame.png"
+
+    write_atomic(path, b"frame")
+
+    assert path.read_bytes() == b"frame"
+    assert _mode(path) == 0o644
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_replaced_files_keep_their_mode(tmp_path):
+    path = tmp_path / "state.json"
+    path.write_bytes(b"{}")
+    path.chmod(0o640)
+
+    write_atomic(path, b'{"a": 1}')
+
+    assert path.read_bytes() == b'{"a": 1}'
+    assert _mode(path) == 0o640
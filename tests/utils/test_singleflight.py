@@ -0,0 +1,70 @@
+import asyncio
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import pytest
+
+from minidisplay.utils.singleflight import SingleFlight
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_concurrent_callers_share_one_call():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "frame"
+
+    async def scenario():
+        flight = SingleFlight(ttl=0)
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+        return flight, results
+
+    flight, results = asyncio.run(scenario())
+
+    assert results == ["frame"] * 5
+    assert len(calls) == 1
+    assert flight.shared == 4
+    assert flight.inflight == 0
+
+
+def test_results_are_memoized_until_ttl_expires():
+    clock = FakeClock()
+    flight = SingleFlight(ttl=5, clock=clock)
+    calls = []
+
+    async def work():
+        calls.append(1)
+        return len(calls)
+
+    assert asyncio.run(flight.do("key", work)) == 1
+    clock.now += 4
+    assert flight.has("key")
+    assert asyncio.run(flight.do("key", work)) == 1
+    clock.now += 2
+    assert not flight.has("key")
+    assert asyncio.run(flight.do("key", work)) == 2
+    assert flight.hits == 1
+
+
+def test_failures_are_not_memoized():
+    flight = SingleFlight(ttl=60)
+
+    async def broken():
+        raise RuntimeError("api down")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(flight.do("key", broken))
+    assert not flight.has("key")
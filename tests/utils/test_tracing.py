@@ -0,0 +1,60 @@
+import json
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from minidisplay.utils.tracing import Tracer
+
+
+def test_disabled_tracer_returns_shared_noop_span():
+    tracer = Tracer(enabled=False)
+
+    assert tracer.span("a") is tracer.span("b")
+    with tracer.span("a"):
+        pass
+    assert tracer.records() == []
+
+
+def test_enabled_tracer_fills_bounded_ring_buffer():
+    tracer = Tracer(enabled=True, capacity=2)
+
+    for name in ("fetch", "layout", "render"):
+        with tracer.span(name, layout="Bus Arrival"):
+            pass
+
+    records = tracer.records()
+    assert [record["name"] for record in records] == ["layout", "render"]
+    assert records[0]["attrs"] == {"layout": "Bus Arrival"}
+    assert records[0]["duration_ms"] >= 0
+
+
+def test_collect_measures_even_when_disabled():
+    tracer = Tracer(enabled=False)
+
+    with tracer.collect() as timings:
+        with tracer.span("render.layout"):
+            pass
+        with tracer.span("render.layout"):
+            pass
+
+    assert set(timings) == {"render.layout"}
+    assert tracer.records() == []
+
+
+def test_jsonl_sink(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    tracer = Tracer(enabled=True, jsonl_path=path)
+
+    try:
+        with tracer.span("display.show"):
+            raise RuntimeError("panel busy")
+    except RuntimeError:
+        pass
+    tracer.set_jsonl_path(None)
+
+    record = json.loads(path.read_text().strip())
+    assert record["name"] == "display.show"
+    assert record["error"] is True
@@ -0,0 +1,135 @@
+import asyncio
+import datetime as dt
+import sys
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import pytest
+
+from minidisplay.utils.metrics import FETCH_TOTAL
+from minidisplay.web.executor import (
+    RenderExecutor,
+    RenderQueueFull,
+    normalize_preview_params,
+    preview_key,
+)
+
+
+def _blocking_render(release: threading.Event, calls: list, value: str) -> str:
+    calls.append(value)
+    release.wait(5)
+    return value
+
+
+def _executor(max_pending: int = 4) -> RenderExecutor:
+    return RenderExecutor(max_workers=2, max_pending=max_pending, pool_factory=ThreadPoolExecutor)
+
+
+def test_identical_requests_share_one_render():
+    async def scenario():
+        executor = _executor()
+        release = threading.Event()
+        calls: list = []
+        kwargs = {"release": release, "calls": calls, "value": "frame"}
+
+        first = asyncio.ensure_future(executor.submit("key", _blocking_render, **kwargs))
+        second = asyncio.ensure_future(executor.submit("key", _blocking_render, **kwargs))
+        await asyncio.sleep(0.05)
+        release.set()
+
+        results = await asyncio.gather(first, second)
+        executor.shutdown()
+        return results, calls, executor
+
+    results, calls, executor = asyncio.run(scenario())
+
+    assert results == ["frame", "frame"]
+    assert calls == ["frame"]
+    assert executor.coalesced == 1
+    assert executor.pending == 0
+
+
+def test_full_queue_is_rejected():
+    async def scenario():
+        executor = _executor(max_pending=1)
+        release = threading.Event()
+        calls: list = []
+
+        running = asyncio.ensure_future(
+            executor.submit("a", _blocking_render, release=release, calls=calls, value="a")
+        )
+        await asyncio.sleep(0.05)
+        try:
+            with pytest.raises(RenderQueueFull):
+                await executor.submit("b", _blocking_render, release=release, calls=calls, value="b")
+        finally:
+            release.set()
+            await running
+            executor.shutdown()
+        return executor
+
+    assert asyncio.run(scenario()).rejected == 1
+
+
+def test_equivalent_parameters_normalize_to_the_same_key():
+    a = normalize_preview_params(
+        mock_time="7:05", use_mock="on", start_hour="6", start_minute=0, end_hour=9, end_minute="0"
+    )
+    b = normalize_preview_params(
+        mock_time="07:05", use_mock=True, start_hour=6, start_minute=0, end_hour=9, end_minute=0
+    )
+
+    assert a == b
+    assert preview_key(a) == preview_key(b)
+
+
+def test_live_time_key_includes_current_minute():
+    params = normalize_preview_params(
+        mock_time="", use_mock=True, start_hour=6, start_minute=0, end_hour=9, end_minute=0
+    )
+
+    first = preview_key(params, now=dt.datetime(2024, 1, 1, 7, 30, 5))
+    same_minute = preview_key(params, now=dt.datetime(2024, 1, 1, 7, 30, 55))
+    next_minute = preview_key(params, now=dt.datetime(2024, 1, 1, 7, 31, 0))
+
+    assert first == same_minute
+    assert first != next_minute
+
+
+def _counting_render(source: str) -> str:
+    FETCH_TOTAL.inc(source=source, outcome="success")
+    return source
+
+
+def test_worker_process_metrics_are_merged():
+    def spawn_pool(max_workers):
+        return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+    async def scenario():
+        executor = RenderExecutor(max_workers=1, pool_factory=spawn_pool)
+        try:
+            return await executor.submit("key", _counting_render, source="worker-test")
+        finally:
+            executor.shutdown()
+
+    before = FETCH_TOTAL.value(source="worker-test", outcome="success")
+    assert asyncio.run(scenario()) == "worker-test"
+    assert FETCH_TOTAL.value(source="worker-test", outcome="success") == before + 1
+
+
+def test_thread_pool_metrics_are_not_counted_twice():
+    async def scenario():
+        executor = _executor()
+        try:
+            return await executor.submit("key", _counting_render, source="thread-test")
+        finally:
+            executor.shutdown()
+
+    asyncio.run(scenario())
+    assert FETCH_TOTAL.value(source="thread-test", outcome="success") == 1
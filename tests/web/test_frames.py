@@ -0,0 +1,109 @@
+import importlib
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import pytest
+from PIL import Image
+
+from minidisplay.display.devices import MemoryDisplay
+from minidisplay.web.frames import FrameStore
+
+
+def test_identical_frames_share_one_entry():
+    store = FrameStore()
+
+    first = store.put(b"frame")
+    second = store.put(b"frame")
+
+    assert first == second
+    assert len(store) == 1
+    assert store.get(first) == b"frame"
+    assert store.hits == 1
+
+
+def test_eviction_respects_byte_budget():
+    store = FrameStore(max_bytes=10)
+
+    old = store.put(b"aaaaaa")
+    new = store.put(b"bbbbbb")
+
+    assert old not in store
+    assert store.get(new) == b"bbbbbb"
+    assert store.size_bytes == 6
+    assert store.get(old) is None
+    assert store.misses == 1
+
+
+def test_oversized_frame_is_still_served():
+    store = FrameStore(max_bytes=4)
+
+    store.put(b"ab")
+    key = store.put(b"much too large")
+
+    assert len(store) == 1
+    assert store.get(key) == b"much too large"
+
+
+@pytest.fixture()
+def client():
+    # Imported lazily so the rest of this file runs without FastAPI's test client.
+    from fastapi.testclient import TestClient
+
+    web_app = importlib.import_module("minidisplay.web.app")  # The package re-exports `app`
+
+    return TestClient(web_app.app), web_app
+
+
+def test_frame_route_serves_immutable_frames_with_etag(client):
+    client, web_app = client
+    digest = web_app.frame_store.put(b"\x89PNG frame")
+
+    response = client.get(f"/frames/{digest}.png")
+
+    assert response.status_code == 200
+    assert response.content == b"\x89PNG frame"
+    assert response.headers["content-type"] == "image/png"
+    assert response.headers["etag"] == f'"{digest}"'
+    assert response.headers["cache-control"] == web_app.FRAME_CACHE_CONTROL
+
+
+def test_frame_route_answers_304_to_matching_if_none_match(client):
+    client, web_app = client
+    digest = web_app.frame_store.put(b"\x89PNG other frame")
+
+    response = client.get(f"/frames/{digest}.png", headers={"If-None-Match": f'"stale", "{digest}"'})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == f'"{digest}"'
+    assert response.headers["cache-control"] == web_app.FRAME_CACHE_CONTROL
+
+
+def test_frame_route_404s_unknown_frames(client):
+    client, _ = client
+    assert client.get(f"/frames/{'0' * 32}.png").status_code == 404
+
+
+def test_memory_display_encodes_png():
+    device = MemoryDisplay(resolution=(10, 5))
+    device.set_image(Image.new("RGB", (10, 5), (255, 255, 255)))
+
+    device.show()
+
+    assert device.frame.startswith(b"\x89PNG")
+
+
+def test_pages_render_their_templates(client):
+    test_client, _ = client
+
+    assert test_client.get("/").status_code == 200
+    response = test_client.post(
+        "/simulate",
+        data={"mock_time": "07:30", "use_mock": "on", "start_hour": 6, "start_minute": 0, "end_hour": 9, "end_minute": 0},
+    )
+    assert response.status_code == 200
+    assert "/frames/" in response.text
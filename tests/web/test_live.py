@@ -0,0 +1,62 @@
+import asyncio
+import datetime as dt
+import importlib
+import sys
+import threading
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from minidisplay.scheduler import FrameScheduler
+from minidisplay.web.frames import FrameStore
+from minidisplay.web.live import LivePreview
+
+
+def _scheduler(tmp_path):
+    config = {
+        "lock_file": str(tmp_path / "lock"),
+        "push_sources": ["idelis"],
+        "api_next": 3,
+        "display_start_hour": 6,
+        "display_start_minute": 0,
+        "display_end_hour": 9,
+        "display_end_minute": 0,
+    }
+    return FrameScheduler(config, interval=60, clock=lambda: dt.datetime(2024, 1, 1, 7, 30))
+
+
+def test_pushes_wake_the_preview_and_leaving_stops_it(tmp_path):
+    scheduler = _scheduler(tmp_path)
+    preview = LivePreview(lambda: scheduler, FrameStore())
+
+    async def scenario():
+        queue = preview.subscribe()
+        await asyncio.wait_for(queue.get(), 5)  # The first tick, with nothing pushed yet
+
+        threading.Thread(target=scheduler.manager.push, args=("idelis", {"passages": [{"arrivee": "07:42"}]})).start()
+        frame = await asyncio.wait_for(queue.get(), 5)  # Long before the 60 s interval
+        assert frame.result.arrival_text == "07:42"
+
+        task = preview._task
+        preview.unsubscribe(queue)
+        await asyncio.wait_for(asyncio.gather(task, return_exceptions=True), 1)
+        assert task.cancelled()
+        assert scheduler.manager._change_listeners == []
+
+    asyncio.run(scenario())
+
+
+def test_push_route_requires_a_configured_token(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    web_app = importlib.import_module("minidisplay.web.app")  # The package re-exports `app`
+    client = TestClient(web_app.app)
+
+    monkeypatch.delenv(web_app.PUSH_TOKEN_ENV, raising=False)
+    assert client.post("/push/sensor", json={}).status_code == 403
+
+    monkeypatch.setenv(web_app.PUSH_TOKEN_ENV, "secret")
+    assert client.post("/push/sensor", json={}, headers={"X-Push-Token": "wrong"}).status_code == 401
+    assert client.post("/push/sensor", json={}, headers={"X-Push-Token": "secret"}).status_code == 404